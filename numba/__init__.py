@@ -87,11 +87,25 @@ from numba.core.types import *
 from numba.core.decorators import (cfunc, jit, njit, stencil,
                                    jit_module)
 
+# Re-export background compilation helper
+from numba.core.dispatcher import precompile_all
+
+# Record a warmup manifest if requested
+if config.WARMUP_RECORD:
+    import numba.core.warmup
+
+# Publish the JIT compiled functions to perf if requested
+if config.PERF_MAP:
+    import numba.misc.perfmap
+
+# Re-export the compilation profile
+from numba.core.compile_profile import compile_profile
+
 # Re-export vectorize decorators and the thread layer querying function
 from numba.np.ufunc import (vectorize, guvectorize, threading_layer,
                             get_num_threads, set_num_threads,
                             set_parallel_chunksize, get_parallel_chunksize,
-                            get_thread_id)
+                            get_thread_id, set_thread_affinity, reduction)
 
 # Re-export Numpy helpers
 from numba.np.numpy_support import carray, farray, from_dtype
@@ -126,6 +140,8 @@ __all__ = [
     "njit",
     "stencil",
     "jit_module",
+    "precompile_all",
+    "compile_profile",
     "typeof",
     "prange",
     "gdb",
@@ -139,6 +155,8 @@ __all__ = [
     "set_parallel_chunksize",
     "get_parallel_chunksize",
     "parallel_chunksize",
+    "set_thread_affinity",
+    "reduction",
 ]
 __all__ += types.__all__
 __all__ += errors.__all__
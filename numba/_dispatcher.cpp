@@ -403,6 +403,24 @@ typedef std::vector<PyObject*> Functions;
    appropriate overload needs to be fast) and ease of implementation (calling
    directly into a compiled function using a function pointer is easier within
    the C++ code where the overload has been resolved). */
+/* The number of argument type combinations remembered by the inline cache of
+   a dispatcher, and the maximum number of arguments of a call for it to use
+   the inline cache. */
+#define INLINE_CACHE_SIZE 4
+#define INLINE_CACHE_MAX_ARGS 8
+
+/* An entry of the inline cache: the overload resolved for the given argument
+   keys (see typeof_inline_cache_key()). */
+struct InlineCacheEntry {
+    /* Borrowed reference, NULL if the entry is unused */
+    PyObject *cfunc;
+    int argct;
+    /* The resolution depends on whether compilation is permitted */
+    char can_compile;
+    PyTypeObject *key_types[INLINE_CACHE_MAX_ARGS];
+    int key_auxs[INLINE_CACHE_MAX_ARGS];
+};
+
 class Dispatcher {
 public:
     PyObject_HEAD
@@ -436,6 +454,13 @@ public:
     /* A flattened array of argument types to all overloads
      * (invariant: sizeof(overloads) == argct * sizeof(functions)) */
     TypeTable overloads;
+    /* The overloads resolved for the last few argument type combinations,
+       allowing to bypass typeof and resolve() on a hit */
+    InlineCacheEntry inline_cache[INLINE_CACHE_SIZE];
+    /* The next inline cache entry to replace */
+    int inline_cache_next;
+    /* The vectorcall entry point, see Dispatcher_vectorcall() */
+    vectorcallfunc vectorcall;
 
     /* Add a new overload. Parameters:
 
@@ -447,6 +472,70 @@ public:
             overloads.push_back(args[i]);
         }
         functions.push_back(callable);
+        /* The new overload may change how arguments are resolved */
+        clearInlineCache();
+    }
+
+    /* Replace an overload's implementation. Parameters:
+
+       - old: The callable currently implementing the overload
+       - callable: The callable replacing it.
+
+       Returns whether the overload was found. */
+    bool replaceDefinition(PyObject *old, PyObject *callable) {
+        bool found = false;
+        for (size_t i = 0; i < functions.size(); ++i) {
+            if (functions[i] == old) {
+                functions[i] = callable;
+                found = true;
+            }
+        }
+        if (fallbackdef == old) {
+            fallbackdef = callable;
+        }
+        /* The inline cache may still refer to the old callable */
+        clearInlineCache();
+        return found;
+    }
+
+    /* Return the overload cached for the given argument keys, or NULL. */
+    PyObject* lookupInlineCache(PyTypeObject *key_types[], int key_auxs[],
+                                int nargs) const {
+        for (int i = 0; i < INLINE_CACHE_SIZE; ++i) {
+            const InlineCacheEntry &entry = inline_cache[i];
+            if (entry.cfunc == NULL || entry.argct != nargs ||
+                entry.can_compile != can_compile)
+                continue;
+            int j = 0;
+            while (j < nargs && entry.key_types[j] == key_types[j] &&
+                   entry.key_auxs[j] == key_auxs[j])
+                ++j;
+            if (j == nargs)
+                return entry.cfunc;
+        }
+        return NULL;
+    }
+
+    /* Remember the overload resolved for the given argument keys, replacing
+       the oldest entry. */
+    void addToInlineCache(PyTypeObject *key_types[], int key_auxs[],
+                          int nargs, PyObject *cfunc) {
+        InlineCacheEntry &entry = inline_cache[inline_cache_next];
+        inline_cache_next = (inline_cache_next + 1) % INLINE_CACHE_SIZE;
+        for (int j = 0; j < nargs; ++j) {
+            entry.key_types[j] = key_types[j];
+            entry.key_auxs[j] = key_auxs[j];
+        }
+        entry.argct = nargs;
+        entry.can_compile = can_compile;
+        entry.cfunc = cfunc;
+    }
+
+    void clearInlineCache() {
+        for (int i = 0; i < INLINE_CACHE_SIZE; ++i) {
+            inline_cache[i].cfunc = NULL;
+        }
+        inline_cache_next = 0;
     }
 
     /* Given a list of types, find the overloads that have a matching signature.
@@ -491,6 +580,7 @@ public:
     void clear() {
         functions.clear();
         overloads.clear();
+        clearInlineCache();
     }
 
 };
@@ -513,6 +603,13 @@ Dispatcher_dealloc(Dispatcher *self)
 }
 
 
+/* forward declarations */
+static PyObject*
+Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws);
+static PyObject*
+Dispatcher_vectorcall(PyObject *callable, PyObject *const *args,
+                      size_t nargsf, PyObject *kwnames);
+
 static int
 Dispatcher_init(Dispatcher *self, PyObject *args, PyObject *kwds)
 {
@@ -544,6 +641,15 @@ Dispatcher_init(Dispatcher *self, PyObject *args, PyObject *kwds)
     self->fallbackdef = NULL;
     self->has_stararg = has_stararg;
     self->exact_match_required = exact_match_required;
+    self->clearInlineCache();
+    self->vectorcall = (vectorcallfunc) Dispatcher_vectorcall;
+    /* Before Python 3.12, subclasses defined in Python don't inherit
+       Py_TPFLAGS_HAVE_VECTORCALL.  Enable it on them as long as they don't
+       override __call__, as Python 3.12+ does. */
+    if (Py_TYPE(self)->tp_call == (ternaryfunc) Dispatcher_call &&
+        !PyType_HasFeature(Py_TYPE(self), Py_TPFLAGS_HAVE_VECTORCALL)) {
+        Py_TYPE(self)->tp_flags |= Py_TPFLAGS_HAVE_VECTORCALL;
+    }
     return 0;
 }
 
@@ -606,6 +712,25 @@ Dispatcher_Insert(Dispatcher *self, PyObject *args, PyObject *kwds)
     Py_RETURN_NONE;
 }
 
+static
+PyObject*
+Dispatcher_Replace(Dispatcher *self, PyObject *args)
+{
+    PyObject *old, *cfunc;
+
+    if (!PyArg_ParseTuple(args, "OO", &old, &cfunc)) {
+        return NULL;
+    }
+
+    if (!PyObject_TypeCheck(cfunc, &PyCFunction_Type) ) {
+        PyErr_SetString(PyExc_TypeError, "must be builtin_function_or_method");
+        return NULL;
+    }
+
+    /* As in Dispatcher_Insert(), the reference to cfunc is borrowed. */
+    return PyBool_FromLong(self->replaceDefinition(old, cfunc));
+}
+
 static
 void explain_issue(PyObject *dispatcher, PyObject *args, PyObject *kws,
                    const char *method_name, const char *default_msg)
@@ -667,18 +792,25 @@ int search_new_conversions(PyObject *dispatcher, PyObject *args, PyObject *kws)
 }
 
 
+/* The signature of compiled functions, which use the
+   METH_FASTCALL | METH_KEYWORDS calling convention (see callwrapper.py) */
+typedef PyObject *(*fastcall_cfunc)(PyObject *, PyObject *const *,
+                                    Py_ssize_t, PyObject *);
+
 #if (PY_MAJOR_VERSION >= 3) && ((PY_MINOR_VERSION == 10) || (PY_MINOR_VERSION == 11))
 
-/* A custom, fast, inlinable version of PyCFunction_Call() */
+/* A custom, fast, inlinable version of PyCFunction_Call(), taking the
+   positional arguments as an array */
 static PyObject *
-call_cfunc(Dispatcher *self, PyObject *cfunc, PyObject *args, PyObject *kws, PyObject *locals)
+call_cfunc(Dispatcher *self, PyObject *cfunc, PyObject *const *args,
+           Py_ssize_t nargs, PyObject *locals)
 {
-    PyCFunctionWithKeywords fn;
+    fastcall_cfunc fn;
     PyThreadState *tstate;
 
     assert(PyCFunction_Check(cfunc));
-    assert(PyCFunction_GET_FLAGS(cfunc) == (METH_VARARGS | METH_KEYWORDS));
-    fn = (PyCFunctionWithKeywords) PyCFunction_GET_FUNCTION(cfunc);
+    assert(PyCFunction_GET_FLAGS(cfunc) == (METH_FASTCALL | METH_KEYWORDS));
+    fn = (fastcall_cfunc) PyCFunction_GET_FUNCTION(cfunc);
     tstate = PyThreadState_GET();
 
 #if (PY_MAJOR_VERSION >= 3) && (PY_MINOR_VERSION == 11)
@@ -756,14 +888,14 @@ call_cfunc(Dispatcher *self, PyObject *cfunc, PyObject *args, PyObject *kws, PyO
         // Python 3.11 improved the frame infrastructure such that frames are
         // updated by the virtual machine, no need to do PyFrame_LocalsToFast
         // and PyFrame_FastToLocals to ensure `frame->f_locals` is consistent.
-        C_TRACE(result, fn(PyCFunction_GET_SELF(cfunc), args, kws), frame);
+        C_TRACE(result, fn(PyCFunction_GET_SELF(cfunc), args, nargs, NULL), frame);
 #else
         // Populate the 'fast locals' in `frame`
         PyFrame_LocalsToFast(frame, 0);
         tstate->frame = frame;
 
         // make the call
-        C_TRACE(result, fn(PyCFunction_GET_SELF(cfunc), args, kws));
+        C_TRACE(result, fn(PyCFunction_GET_SELF(cfunc), args, nargs, NULL));
 
         // write changes back to locals?
         // PyFrame_FastToLocals can clear the exception indicator, therefore
@@ -787,7 +919,7 @@ call_cfunc(Dispatcher *self, PyObject *cfunc, PyObject *args, PyObject *kws, PyO
     }
     else
     {
-        return fn(PyCFunction_GET_SELF(cfunc), args, kws);
+        return fn(PyCFunction_GET_SELF(cfunc), args, nargs, NULL);
     }
 }
 
@@ -1095,26 +1227,28 @@ int static inline invoke_monitoring_PY_UNWIND(PyThreadState * tstate, Dispatcher
 /* forward declaration */
 bool static is_sysmon_enabled(Dispatcher *self);
 
-/* A custom, fast, inlinable version of PyCFunction_Call() */
+/* A custom, fast, inlinable version of PyCFunction_Call(), taking the
+   positional arguments as an array */
 static PyObject *
-call_cfunc(Dispatcher *self, PyObject *cfunc, PyObject *args, PyObject *kws, PyObject *locals)
+call_cfunc(Dispatcher *self, PyObject *cfunc, PyObject *const *args,
+           Py_ssize_t nargs, PyObject *locals)
 {
-    PyCFunctionWithKeywords fn = NULL;
+    fastcall_cfunc fn = NULL;
     PyThreadState *tstate = NULL;
     PyObject * pyresult = NULL;
     PyObject * pyexception = NULL;
     const bool enabled_sysmon = is_sysmon_enabled(self);
 
     assert(PyCFunction_Check(cfunc));
-    assert(PyCFunction_GET_FLAGS(cfunc) == (METH_VARARGS | METH_KEYWORDS));
-    fn = (PyCFunctionWithKeywords) PyCFunction_GET_FUNCTION(cfunc);
+    assert(PyCFunction_GET_FLAGS(cfunc) == (METH_FASTCALL | METH_KEYWORDS));
+    fn = (fastcall_cfunc) PyCFunction_GET_FUNCTION(cfunc);
     tstate = PyThreadState_GET();
     // issue PY_START if event is set
     if(enabled_sysmon && invoke_monitoring_PY_START(tstate, self) != 0){
         return NULL;
     }
     // make call
-    pyresult = fn(PyCFunction_GET_SELF(cfunc), args, kws);
+    pyresult = fn(PyCFunction_GET_SELF(cfunc), args, nargs, NULL);
     if (enabled_sysmon && pyresult == NULL) {
         // pyresult == NULL, which means the Numba function raised an exception
         // which is now pending.
@@ -1190,7 +1324,8 @@ compile_and_invoke(Dispatcher *self, PyObject *args, PyObject *kws, PyObject *lo
         return NULL;
 
     if (PyObject_TypeCheck(cfunc, &PyCFunction_Type)) {
-        retval = call_cfunc(self, cfunc, args, kws, locals);
+        retval = call_cfunc(self, cfunc, PySequence_Fast_ITEMS(args),
+                            PyTuple_GET_SIZE(args), locals);
     } else {
         /* Re-enter interpreter */
         retval = PyObject_Call(cfunc, args, kws);
@@ -1334,42 +1469,55 @@ find_named_args(Dispatcher *self, PyObject **pargs, PyObject **pkws)
     return 0;
 }
 
+/* Create a tuple of the positional arguments *items* */
 static PyObject*
-Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
+args_as_tuple(PyObject *const *items, Py_ssize_t argct)
+{
+    Py_ssize_t i;
+    PyObject *args = PyTuple_New(argct);
+    if (args == NULL)
+        return NULL;
+    for (i = 0; i < argct; ++i) {
+        Py_INCREF(items[i]);
+        PyTuple_SET_ITEM(args, i, items[i]);
+    }
+    return args;
+}
+
+/* Resolve the overload for the (folded) positional arguments *items* and
+   call it.  *args* is a tuple of the same arguments, or NULL in which case
+   it is only created if one of the slow paths (compilation, conversions,
+   error reporting) needs it. */
+static PyObject*
+dispatch_call(Dispatcher *self, PyObject *const *items, Py_ssize_t argct,
+              PyObject *args, PyObject *kws, PyObject *locals)
 {
     PyObject *tmptype, *retval = NULL;
+    PyObject *owned_args = NULL;
     int *tys = NULL;
-    int argct;
     int i;
     int prealloc[24];
     int matches;
     PyObject *cfunc;
-    PyThreadState *ts = PyThreadState_Get();
-    PyObject *locals = NULL;
+    bool use_inline_cache;
+    PyTypeObject *key_types[INLINE_CACHE_MAX_ARGS];
+    int key_auxs[INLINE_CACHE_MAX_ARGS];
 
     /* If compilation is enabled, ensure that an exact match is found and if
      * not compile one */
     int exact_match_required = self->can_compile ? 1 : self->exact_match_required;
 
-#if (PY_MAJOR_VERSION >= 3) && (PY_MINOR_VERSION >= 10)
-    if (ts->tracing && ts->c_profilefunc) {
-#else
-    if (ts->use_tracing && ts->c_profilefunc) {
-#endif
-        locals = PyEval_GetLocals();
-        if (locals == NULL) {
-            goto CLEANUP;
-        }
+    /* Try the inline cache first, if all the arguments have a key */
+    use_inline_cache = argct <= INLINE_CACHE_MAX_ARGS;
+    for (i = 0; use_inline_cache && i < argct; ++i) {
+        if (typeof_inline_cache_key(items[i], &key_types[i], &key_auxs[i]))
+            use_inline_cache = false;
     }
-    if (self->fold_args) {
-        if (find_named_args(self, &args, &kws))
-            return NULL;
+    if (use_inline_cache) {
+        cfunc = self->lookupInlineCache(key_types, key_auxs, argct);
+        if (cfunc != NULL)
+            return call_cfunc(self, cfunc, items, argct, locals);
     }
-    else
-        Py_INCREF(args);
-    /* Now we own a reference to args */
-
-    argct = PySequence_Fast_GET_SIZE(args);
 
     if (argct < (Py_ssize_t) (sizeof(prealloc) / sizeof(int)))
         tys = prealloc;
@@ -1377,7 +1525,7 @@ Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
         tys = new int[argct];
 
     for (i = 0; i < argct; ++i) {
-        tmptype = PySequence_Fast_GET_ITEM(args, i);
+        tmptype = items[i];
         tys[i] = typeof_typecode((PyObject *) self, tmptype);
         if (tys[i] == -1) {
             if (self->can_fallback){
@@ -1397,6 +1545,12 @@ Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
     cfunc = self->resolve(tys, matches, !self->can_compile,
                           exact_match_required);
 
+    if (matches != 1 && args == NULL) {
+        /* The slow paths below call back into Python */
+        args = owned_args = args_as_tuple(items, argct);
+        if (args == NULL)
+            goto CLEANUP;
+    }
     if (matches == 0 && !self->can_compile) {
         /*
          * If we can't compile a new specialization, look for
@@ -1416,14 +1570,16 @@ Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
     }
     if (matches == 1) {
         /* Definition is found */
-        retval = call_cfunc(self, cfunc, args, kws, locals);
+        if (use_inline_cache)
+            self->addToInlineCache(key_types, key_auxs, argct, cfunc);
+        retval = call_cfunc(self, cfunc, items, argct, locals);
     } else if (matches == 0) {
         /* No matching definition */
         if (self->can_compile) {
             retval = compile_and_invoke(self, args, kws, locals);
         } else if (self->fallbackdef) {
             /* Have object fallback */
-            retval = call_cfunc(self, self->fallbackdef, args, kws, locals);
+            retval = call_cfunc(self, self->fallbackdef, items, argct, locals);
         } else {
             /* Raise TypeError */
             explain_matching_error((PyObject *) self, args, kws);
@@ -1441,11 +1597,152 @@ Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
 CLEANUP:
     if (tys != prealloc)
         delete[] tys;
+    Py_XDECREF(owned_args);
+
+    return retval;
+}
+
+/* Get the locals of the calling frame if a profiler is active, as
+   call_cfunc() reports them in the frame it synthesizes.  Returns -1 on
+   error. */
+static int
+get_profiled_locals(PyObject **plocals)
+{
+    PyThreadState *ts = PyThreadState_Get();
+
+    *plocals = NULL;
+#if (PY_MAJOR_VERSION >= 3) && (PY_MINOR_VERSION >= 10)
+    if (ts->tracing && ts->c_profilefunc) {
+#else
+    if (ts->use_tracing && ts->c_profilefunc) {
+#endif
+        *plocals = PyEval_GetLocals();
+        if (*plocals == NULL) {
+            return -1;
+        }
+    }
+    return 0;
+}
+
+static PyObject*
+Dispatcher_call(Dispatcher *self, PyObject *args, PyObject *kws)
+{
+    PyObject *retval;
+    PyObject *locals;
+
+    if (get_profiled_locals(&locals))
+        return NULL;
+    if (self->fold_args) {
+        if (find_named_args(self, &args, &kws))
+            return NULL;
+    }
+    else
+        Py_INCREF(args);
+    /* Now we own a reference to args */
+
+    retval = dispatch_call(self, PySequence_Fast_ITEMS(args),
+                           PyTuple_GET_SIZE(args), args, kws, locals);
     Py_DECREF(args);
+    return retval;
+}
+
+/* The vectorcall entry point of dispatchers.  Positional calls that don't
+   need folding (named arguments, default values or star arguments) are
+   dispatched straight from the argument array, without creating a tuple;
+   other calls go through Dispatcher_call(). */
+static PyObject*
+Dispatcher_vectorcall(PyObject *callable, PyObject *const *args,
+                      size_t nargsf, PyObject *kwnames)
+{
+    Dispatcher *self = (Dispatcher *) callable;
+    Py_ssize_t nargs = PyVectorcall_NARGS(nargsf);
+    Py_ssize_t nkws = kwnames == NULL ? 0 : PyTuple_GET_SIZE(kwnames);
+    PyObject *locals;
+    PyObject *argstup, *kws = NULL, *retval;
+    Py_ssize_t i;
+
+    if (nkws == 0 &&
+        (!self->fold_args || (nargs == self->argct && !self->has_stararg))) {
+        if (get_profiled_locals(&locals))
+            return NULL;
+        return dispatch_call(self, args, nargs, NULL, NULL, locals);
+    }
 
+    argstup = args_as_tuple(args, nargs);
+    if (argstup == NULL)
+        return NULL;
+    if (nkws > 0) {
+        kws = PyDict_New();
+        if (kws == NULL) {
+            Py_DECREF(argstup);
+            return NULL;
+        }
+        for (i = 0; i < nkws; ++i) {
+            if (PyDict_SetItem(kws, PyTuple_GET_ITEM(kwnames, i),
+                               args[nargs + i])) {
+                Py_DECREF(argstup);
+                Py_DECREF(kws);
+                return NULL;
+            }
+        }
+    }
+    retval = Dispatcher_call(self, argstup, kws);
+    Py_DECREF(argstup);
+    Py_XDECREF(kws);
     return retval;
 }
 
+/* Call the dispatcher on each tuple of positional arguments in the sequence
+   *arglist* and return the list of results.  This saves the interpreter
+   overhead of a Python loop; the overload of each call is resolved as in
+   Dispatcher_call(), consecutive calls with the same argument types hitting
+   the inline cache. */
+static PyObject*
+Dispatcher_call_batch(Dispatcher *self, PyObject *arglist)
+{
+    PyObject *seq, *results, *locals;
+    Py_ssize_t i, n;
+
+    seq = PySequence_Fast(arglist, "argument sets must be a sequence");
+    if (seq == NULL)
+        return NULL;
+    n = PySequence_Fast_GET_SIZE(seq);
+    results = PyList_New(n);
+    if (results == NULL)
+        goto FAIL;
+    for (i = 0; i < n; ++i) {
+        PyObject *args = PySequence_Fast_GET_ITEM(seq, i);
+        PyObject *res;
+        Py_ssize_t nargs;
+        if (!PyTuple_Check(args)) {
+            PyErr_Format(PyExc_TypeError,
+                         "argument sets must be tuples, got %.200s",
+                         Py_TYPE(args)->tp_name);
+            goto FAIL;
+        }
+        nargs = PyTuple_GET_SIZE(args);
+        if (!self->fold_args || (nargs == self->argct && !self->has_stararg)) {
+            if (get_profiled_locals(&locals))
+                goto FAIL;
+            res = dispatch_call(self, PySequence_Fast_ITEMS(args), nargs,
+                                args, NULL, locals);
+        }
+        else {
+            res = Dispatcher_call(self, args, NULL);
+        }
+        if (res == NULL)
+            goto FAIL;
+        PyList_SET_ITEM(results, i, res);
+    }
+    Py_DECREF(seq);
+    return results;
+
+FAIL:
+    Py_DECREF(seq);
+    Py_XDECREF(results);
+    return NULL;
+}
+
 /* Based on Dispatcher_call above, with the following differences:
    1. It does not invoke the definition of the function.
    2. It returns the definition, instead of a value returned by the function.
@@ -1540,7 +1837,9 @@ Dispatcher_cuda_call(Dispatcher *self, PyObject *args, PyObject *kws)
             retval = cuda_compile_only(self, args, kws, locals);
         } else if (self->fallbackdef) {
             /* Have object fallback */
-            retval = call_cfunc(self, self->fallbackdef, args, kws, locals);
+            retval = call_cfunc(self, self->fallbackdef,
+                                PySequence_Fast_ITEMS(args),
+                                PyTuple_GET_SIZE(args), locals);
         } else {
             /* Raise TypeError */
             explain_matching_error((PyObject *) self, args, kws);
@@ -1582,8 +1881,12 @@ import_devicearray(void)
 
 static PyMethodDef Dispatcher_methods[] = {
     { "_clear", (PyCFunction)Dispatcher_clear, METH_NOARGS, NULL },
+    { "_call_batch", (PyCFunction)Dispatcher_call_batch, METH_O,
+      "Call the dispatcher on each tuple of arguments of a sequence" },
     { "_insert", (PyCFunction)Dispatcher_Insert, METH_VARARGS | METH_KEYWORDS,
       "insert new definition"},
+    { "_replace", (PyCFunction)Dispatcher_Replace, METH_VARARGS,
+      "replace the implementation of a definition"},
     { "_cuda_call", (PyCFunction)Dispatcher_cuda_call,
       METH_VARARGS | METH_KEYWORDS, "CUDA call resolution" },
     { NULL },
@@ -1602,7 +1905,7 @@ static PyTypeObject DispatcherType = {
     sizeof(Dispatcher),                          /* tp_basicsize */
     0,                                           /* tp_itemsize */
     (destructor)Dispatcher_dealloc,              /* tp_dealloc */
-    0,                                           /* tp_vectorcall_offset */
+    offsetof(Dispatcher, vectorcall),            /* tp_vectorcall_offset */
     0,                                           /* tp_getattr */
     0,                                           /* tp_setattr */
     0,                                           /* tp_as_async */
@@ -1616,7 +1919,8 @@ static PyTypeObject DispatcherType = {
     0,                                           /* tp_getattro*/
     0,                                           /* tp_setattro*/
     0,                                           /* tp_as_buffer*/
-    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /* tp_flags*/
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC |
+        Py_TPFLAGS_HAVE_VECTORCALL,              /* tp_flags*/
     "Dispatcher object",                         /* tp_doc */
     (traverseproc) Dispatcher_traverse,          /* tp_traverse */
     0,                                           /* tp_clear */
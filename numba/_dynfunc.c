@@ -329,7 +329,9 @@ closure_new(PyObject *name, PyObject *doc, PyCFunction fnaddr,
         return NULL;
     }
     clo->def.ml_meth = fnaddr;
-    clo->def.ml_flags = METH_VARARGS | METH_KEYWORDS;
+    /* Compiled wrappers use the vectorcall-compatible calling convention
+       (see callwrapper.py) */
+    clo->def.ml_flags = METH_FASTCALL | METH_KEYWORDS;
     clo->def.ml_doc = dup_string(doc);
     if (!clo->def.ml_doc) {
         Py_DECREF(clo);
@@ -378,9 +380,13 @@ FAIL:
 
 typedef void (*gen_finalizer_t)(void *);
 
+/* The METH_FASTCALL | METH_KEYWORDS signature of compiled wrappers */
+typedef PyObject *(*gen_nextfunc_t)(PyObject *, PyObject *const *,
+                                    Py_ssize_t, PyObject *);
+
 typedef struct {
     CLOSURE_HEAD
-    PyCFunctionWithKeywords nextfunc;
+    gen_nextfunc_t nextfunc;
     gen_finalizer_t finalizer;
     PyObject *weakreflist;
     union {
@@ -428,18 +434,13 @@ generator_dealloc(GeneratorObject *gen)
 static PyObject *
 generator_iternext(GeneratorObject *gen)
 {
-    PyObject *res, *args;
+    PyObject *self = (PyObject *) gen;
     if (gen->nextfunc == NULL) {
         PyErr_SetString(PyExc_RuntimeError,
                         "cannot call next() on finalized generator");
         return NULL;
     }
-    args = PyTuple_Pack(1, (PyObject *) gen);
-    if (args == NULL)
-        return NULL;
-    res = (*gen->nextfunc)((PyObject *) gen, args, NULL);
-    Py_DECREF(args);
-    return res;
+    return (*gen->nextfunc)(self, &self, 1, NULL);
 }
 
 static PyTypeObject GeneratorType = {
@@ -522,7 +523,7 @@ static PyTypeObject GeneratorType = {
 static PyObject *
 Numba_make_generator(Py_ssize_t gen_state_size,
                      void *initial_state,
-                     PyCFunctionWithKeywords nextfunc,
+                     gen_nextfunc_t nextfunc,
                      gen_finalizer_t finalizer,
                      EnvironmentObject *env)
 {
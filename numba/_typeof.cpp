@@ -855,6 +855,92 @@ int typecode_arrayscalar(PyObject *dispatcher, PyObject* aryscalar) {
     return BASIC_TYPECODES[typecode];
 }
 
+/*
+ * Keys for the inline caches of dispatchers (see Dispatcher_call()).
+ *
+ * A key is made of the Python type of a value and an auxiliary integer,
+ * such that all the values having the same key have the same typecode.
+ * Only values whose key is cheaper to compute than the typecode itself
+ * are eligible, i.e. plain scalars, NumPy scalars, "behaved" arrays of
+ * basic dtypes and small tuples of plain scalars.
+ */
+
+#define INLINE_KEY_MAX_TUPLE 6
+
+/* Return a small non-zero number identifying the typecode of a plain
+   Python scalar, or 0 if *val* isn't one. */
+static int
+inline_key_scalar_kind(PyObject *val)
+{
+    PyTypeObject *tyobj = Py_TYPE(val);
+#if SIZEOF_VOID_P >= 8
+    /* On 32-bit platforms the typecode of an int depends on its value */
+    if (tyobj == &PyLong_Type)
+        return 1;
+#endif
+    if (tyobj == &PyFloat_Type)
+        return 2;
+    if (tyobj == &PyComplex_Type)
+        return 3;
+    if (tyobj == &PyBool_Type)
+        return 4;
+    if (val == Py_None)
+        return 5;
+    return 0;
+}
+
+extern "C" int
+typeof_inline_cache_key(PyObject *val, PyTypeObject **key_type, int *key_aux)
+{
+    PyTypeObject *tyobj = Py_TYPE(val);
+
+    *key_type = tyobj;
+    *key_aux = 0;
+    if (inline_key_scalar_kind(val))
+        return 0;
+    if (tyobj == &PyArray_Type) {
+        /* Same conditions as the fast path of typecode_ndarray() */
+        PyArrayObject *ary = (PyArrayObject *) val;
+        int ndim = PyArray_NDIM(ary);
+        int layout = 0;
+        int dtype;
+
+        if (!PyArray_ISBEHAVED(ary) || ndim <= 0 || ndim > N_NDIM)
+            return -1;
+        dtype = dtype_num_to_typecode(PyArray_TYPE(ary));
+        if (dtype == -1)
+            return -1;
+        if (PyArray_IS_C_CONTIGUOUS(ary))
+            layout = 1;
+        else if (PyArray_IS_F_CONTIGUOUS(ary))
+            layout = 2;
+        *key_aux = dtype + N_DTYPES * (layout + N_LAYOUT * (ndim - 1));
+        return 0;
+    }
+    if (tyobj == &PyTuple_Type) {
+        /* Three bits for the size, then three bits per item kind */
+        Py_ssize_t i, n = PyTuple_GET_SIZE(val);
+        int aux = (int) n;
+
+        if (n > INLINE_KEY_MAX_TUPLE)
+            return -1;
+        for (i = 0; i < n; i++) {
+            int kind = inline_key_scalar_kind(PyTuple_GET_ITEM(val, i));
+            if (!kind)
+                return -1;
+            aux |= kind << (3 * (i + 1));
+        }
+        *key_aux = aux;
+        return 0;
+    }
+    /* NumPy scalars of a fixed dtype, unlike e.g. datetimes whose unit is
+       part of the type */
+    if ((PyArray_IsScalar(val, Number) || PyArray_IsScalar(val, Bool)) &&
+        !PyArray_IsScalar(val, Timedelta))
+        return 0;
+    return -1;
+}
+
 static
 int typecode_devicendarray(PyObject *dispatcher, PyObject *ary)
 {
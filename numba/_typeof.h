@@ -8,6 +8,8 @@
 extern PyObject *typeof_init(PyObject *self, PyObject *args);
 extern int typeof_typecode(PyObject *dispatcher, PyObject *val);
 extern PyObject *typeof_compute_fingerprint(PyObject *val);
+extern int typeof_inline_cache_key(PyObject *val, PyTypeObject **key_type,
+                                   int *key_aux);
 
 #ifdef __cplusplus
     }
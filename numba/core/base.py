@@ -185,6 +185,8 @@ class BaseContext(object):
 
     # Emit Debug info
     enable_debuginfo = False
+    # Only emit the line tables
+    dbg_directives_only = False
     DIBuilder = debuginfo.DIBuilder
 
     # Bound checking
@@ -83,6 +83,12 @@ class Flow(object):
         self._bytecode = bytecode
         self.block_infos = UniqueDict()
 
+    def detach(self):
+        """Drop the reference to the bytecode once the analysis has run, the
+        results don't depend on it.
+        """
+        self._bytecode = None
+
     def run(self):
         """Run a trace over the bytecode over all reachable path.
 
@@ -4,19 +4,25 @@ Caching mechanism for compiled functions.
 
 
 from abc import ABCMeta, abstractmethod
+from collections import namedtuple
 import contextlib
 import errno
 import hashlib
 import importlib
+import importlib.util
 import inspect
+import io
 import itertools
 from math import floor
 import os
 import pickle
 import sys
 import tempfile
+import threading
+import time
 import uuid
 import warnings
+import weakref
 
 from numba.misc.appdirs import AppDirs
 import zipfile
@@ -27,9 +33,15 @@ from numba.core.errors import NumbaWarning
 from numba.core.base import BaseContext
 from numba.core.codegen import CodeLibrary
 from numba.core.compiler import CompileResult
-from numba.core import config, compiler
+from numba.core import config, compiler, types
 from numba.core.serialize import dumps
 
+try:
+    import sqlite3
+except ImportError:
+    # Python may be built without SQLite, only the "sqlite" backend needs it
+    sqlite3 = None
+
 
 def _cache_log(msg, *args):
     if config.DEBUG_CACHE:
@@ -78,12 +90,22 @@ class _Cache(metaclass=ABCMeta):
         Flush the cache.
         """
 
+    def explain(self, sig):
+        """
+        Return a description of what the cache did for the given signature:
+        whether it was loaded from or saved to the cache and, if not, why.
+        """
+        return "no information available"
+
 
 class NullCache(_Cache):
     @property
     def cache_path(self):
         return None
 
+    def explain(self, sig):
+        return "caching is not enabled for this function"
+
     def load_overload(self, sig, target_context):
         pass
 
@@ -140,7 +162,7 @@ class _CacheLocator(metaclass=ABCMeta):
         raise NotImplementedError
 
     @classmethod
-    def get_suitable_cache_subpath(cls, py_file):
+    def get_suitable_cache_subpath(cls, py_file, py_func=None):
         """Given the Python file path, compute a suitable path inside the
         cache directory.
 
@@ -149,6 +171,13 @@ class _CacheLocator(metaclass=ABCMeta):
         """
         path = os.path.abspath(py_file)
         subpath = os.path.dirname(path)
+        if config.CACHE_CONTENT_HASH and py_func is not None:
+            # Make the cache relocatable: use the package of the module,
+            # so that moving a checkout or installing it at another prefix
+            # keeps the same cache subpath.
+            package_subpath = _get_package_subpath(py_func, path)
+            if package_subpath is not None:
+                subpath = package_subpath
         parentdir = os.path.split(subpath)[-1]
         # Use SHA1 to reduce path length.
         # Note: windows doesn't like long path.
@@ -157,6 +186,64 @@ class _CacheLocator(metaclass=ABCMeta):
         return '_'.join([parentdir, hashed])
 
 
+def _get_package_subpath(py_func, py_file):
+    """
+    Return the path of the package of the module defining *py_func*, e.g.
+    ``'pkg/sub'`` for the module ``pkg.sub.mod``, or None if the module is
+    ``__main__`` or wasn't imported from *py_file*.
+    """
+    modname = getattr(py_func, '__module__', None)
+    if modname is None or modname == '__main__':
+        return None
+    spec = getattr(sys.modules.get(modname), '__spec__', None)
+    if spec is None or not spec.has_location:
+        return None
+    try:
+        if not os.path.samefile(spec.origin, py_file):
+            return None
+    except OSError:
+        return None
+    if spec.submodule_search_locations is not None:
+        # The __init__ module of a package
+        package = spec.name
+    else:
+        package = spec.parent
+    return package.replace('.', '/')
+
+
+# Memoized content hashes of source files, keyed by
+# (path, mtime in ns, size), so that a file is hashed only once for all
+# the cached functions it defines.
+_source_hashes = {}
+
+
+def _get_source_content_hash(path):
+    st = os.stat(path)
+    key = path, st.st_mtime_ns, st.st_size
+    try:
+        return _source_hashes[key]
+    except KeyError:
+        pass
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    _source_hashes[key] = digest
+    return digest
+
+
+def _get_source_file_stamp(path):
+    """
+    Get a stamp representing the freshness of the source file at *path*.
+    """
+    if config.CACHE_CONTENT_HASH:
+        # Only depend on the contents of the source, not on the file
+        # metadata that changes when it is checked out or copied.
+        return 'sha256', _get_source_content_hash(path)
+    st = os.stat(path)
+    # We use both timestamp and size as some filesystems only have second
+    # granularity.
+    return st.st_mtime, st.st_size
+
+
 class _SourceFileBackedLocatorMixin(object):
     """
     A cache locator mixin for functions which are backed by a well-known
@@ -166,11 +253,8 @@ class _SourceFileBackedLocatorMixin(object):
     def get_source_stamp(self):
         if getattr(sys, 'frozen', False):
             st = os.stat(sys.executable)
-        else:
-            st = os.stat(self._py_file)
-        # We use both timestamp and size as some filesystems only have second
-        # granularity.
-        return st.st_mtime, st.st_size
+            return st.st_mtime, st.st_size
+        return _get_source_file_stamp(self._py_file)
 
     def get_disambiguator(self):
         return str(self._lineno)
@@ -197,7 +281,7 @@ class UserProvidedCacheLocator(_SourceFileBackedLocatorMixin, _CacheLocator):
     def __init__(self, py_func, py_file):
         self._py_file = py_file
         self._lineno = py_func.__code__.co_firstlineno
-        cache_subpath = self.get_suitable_cache_subpath(py_file)
+        cache_subpath = self.get_suitable_cache_subpath(py_file, py_func)
         self._cache_path = os.path.join(config.CACHE_DIR, cache_subpath)
 
     def get_cache_path(self):
@@ -235,6 +319,9 @@ class InTreeCacheLocatorFsAgnostic(InTreeCacheLocator):
 
     def get_source_stamp(self):
         st = super().get_source_stamp()
+        if config.CACHE_CONTENT_HASH:
+            # Content hashes don't depend on the timestamp precision
+            return st
         return floor(st[0]), st[1]
 
 
@@ -249,7 +336,7 @@ class UserWideCacheLocator(_SourceFileBackedLocatorMixin, _CacheLocator):
         self._lineno = py_func.__code__.co_firstlineno
         appdirs = AppDirs(appname="numba", appauthor=False)
         cache_dir = appdirs.user_cache_dir
-        cache_subpath = self.get_suitable_cache_subpath(py_file)
+        cache_subpath = self.get_suitable_cache_subpath(py_file, py_func)
         self._cache_path = os.path.join(cache_dir, cache_subpath)
 
     def get_cache_path(self):
@@ -339,7 +426,7 @@ class ZipCacheLocator(_SourceFileBackedLocatorMixin, _CacheLocator):
         # type) number of cache classes.
         appdirs = AppDirs(appname="numba", appauthor=False)
         cache_dir = appdirs.user_cache_dir
-        cache_subpath = self.get_suitable_cache_subpath(py_file)
+        cache_subpath = self.get_suitable_cache_subpath(py_file, py_func)
         self._cache_path = os.path.join(cache_dir, cache_subpath)
 
     @staticmethod
@@ -462,6 +549,122 @@ class CacheImpl(metaclass=ABCMeta):
         "Returns True if the given data is cachable; otherwise, returns False."
         pass
 
+    def get_uncachable_reason(self, data):
+        """
+        Returns a description of why the given data is not cachable, or None
+        if it is cachable.
+        """
+        return None
+
+
+def _is_picklable(obj):
+    """
+    Whether *obj* can be serialized to the cache.  Lifted loops keep the
+    IR of their host function, whose globals (e.g. ctypes functions) may
+    not be picklable; this must be found out before anything is written.
+    """
+    try:
+        dumps(obj)
+    except (pickle.PicklingError, TypeError, ValueError):
+        return False
+    return True
+
+
+# The source dependencies of the compiled libraries, see
+# get_cache_dependencies()
+_library_dependencies = weakref.WeakKeyDictionary()
+
+
+def _get_module_stamp(modname):
+    """
+    Return the freshness stamp of the source file of module *modname*, or
+    None if it cannot be found.
+    """
+    mod = sys.modules.get(modname)
+    path = getattr(mod, '__file__', None)
+    if path is None:
+        try:
+            spec = importlib.util.find_spec(modname)
+        except (ImportError, ValueError):
+            return None
+        path = getattr(spec, 'origin', None)
+    if not path or not os.path.isfile(path):
+        return None
+    return _get_source_file_stamp(path)
+
+
+def get_cache_dependencies(cres):
+    """
+    Return a ``{module name: source stamp}`` dictionary of the modules
+    defining the jitted functions and the overload implementations the
+    given compile result depends on, transitively.
+
+    Numba's own modules are excluded as the cache is already invalidated
+    when Numba's version changes.
+    """
+    try:
+        return _library_dependencies[cres.library]
+    except (KeyError, TypeError):
+        pass
+    modules = set()
+    _collect_dependencies(cres, modules, set())
+    deps = {}
+    for modname in sorted(modules):
+        if modname.split('.')[0] == 'numba':
+            continue
+        stamp = _get_module_stamp(modname)
+        if stamp is not None:
+            deps[modname] = stamp
+    return deps
+
+
+def _collect_dependencies(cres, modules, seen):
+    deps = _library_dependencies.get(cres.library)
+    if deps is not None:
+        modules.update(deps)
+        return
+    # The type annotation is only a string if the result was loaded from
+    # the cache, its dependencies are then recorded already.
+    typemap = getattr(cres.type_annotation, 'typemap', None)
+    if typemap is None:
+        return
+
+    def visit_dispatcher(disp):
+        if disp in seen:
+            return
+        seen.add(disp)
+        py_func = getattr(disp, 'py_func', None)
+        modname = getattr(py_func, '__module__', None)
+        if modname is not None:
+            modules.add(modname)
+        for callee in list(getattr(disp, 'overloads', {}).values()):
+            _collect_dependencies(callee, modules, seen)
+
+    def visit_type(ty):
+        if isinstance(ty, types.Dispatcher):
+            visit_dispatcher(ty.dispatcher)
+        elif isinstance(ty, types.Function):
+            for template in ty.templates:
+                if template in seen:
+                    continue
+                seen.add(template)
+                for attr in ('_overload_func', '_definition_func'):
+                    func = getattr(template, attr, None)
+                    modname = getattr(func, '__module__', None)
+                    if modname is not None:
+                        modules.add(modname)
+                # The jitted implementations of @overload
+                impls = getattr(template, '_impl_cache', {})
+                for impl in list(impls.values()):
+                    if isinstance(impl, tuple) and impl[0] is not None:
+                        visit_dispatcher(impl[0])
+        elif isinstance(ty, types.BaseTuple):
+            for item in ty:
+                visit_type(item)
+
+    for ty in typemap.values():
+        visit_type(ty)
+
 
 class CompileResultCacheImpl(CacheImpl):
     """
@@ -470,26 +673,51 @@ class CompileResultCacheImpl(CacheImpl):
 
     def reduce(self, cres):
         """
-        Returns a serialized CompileResult
+        Returns a serialized CompileResult, along with the stamps of the
+        modules it depends on.
         """
-        return cres._reduce()
+        deps = get_cache_dependencies(cres)
+        return cres._reduce(), deps
 
     def rebuild(self, target_context, payload):
         """
-        Returns the unserialized CompileResult
+        Returns the unserialized CompileResult, or None if any of the
+        modules it depends on has changed.
+        """
+        payload, deps = payload
+        for modname, stamp in deps.items():
+            if _get_module_stamp(modname) != stamp:
+                _cache_log("[cache] dependency %r of %r has changed",
+                           modname, self._filename_base)
+                self.miss_reason = ("module %r it depends on has changed"
+                                    % (modname,))
+                return None
+        cres = compiler.CompileResult._rebuild(target_context, *payload)
+        _library_dependencies[cres.library] = deps
+        return cres
+
+    def get_uncachable_reason(self, cres):
         """
-        return compiler.CompileResult._rebuild(target_context, *payload)
+        Returns a description of why the given compile result is not
+        cachable, or None if it is cachable.
+        """
+        if any(not x.can_cache for x in cres.lifted):
+            return "as it uses lifted code"
+        elif cres.lifted and not _is_picklable(cres.lifted):
+            return "as its lifted code is not picklable"
+        elif cres.library.has_dynamic_globals:
+            return ("as it uses dynamic globals "
+                    "(such as ctypes pointers and large global arrays)")
+        elif cres.library.has_symbol_links:
+            return ("as it calls other functions by symbol "
+                    "(NUMBA_LINK_BY_SYMBOL is set)")
+        return None
 
     def check_cachable(self, cres):
         """
         Check cachability of the given compile result.
         """
-        cannot_cache = None
-        if any(not x.can_cache for x in cres.lifted):
-            cannot_cache = "as it uses lifted code"
-        elif cres.library.has_dynamic_globals:
-            cannot_cache = ("as it uses dynamic globals "
-                            "(such as ctypes pointers and large global arrays)")
+        cannot_cache = self.get_uncachable_reason(cres)
         if cannot_cache:
             msg = ('Cannot cache compiled function "%s" %s'
                    % (cres.fndesc.qualname.split('.')[-1], cannot_cache))
@@ -518,11 +746,22 @@ class CodeLibraryCacheImpl(CacheImpl):
         """
         return target_context.codegen().unserialize_library(payload)
 
+    def get_uncachable_reason(self, codelib):
+        """
+        Returns a description of why the given CodeLibrary is not cachable,
+        or None if it is cachable.
+        """
+        if codelib.has_dynamic_globals:
+            return "as it uses dynamic globals"
+        elif codelib.has_symbol_links:
+            return "as it calls other functions by symbol"
+        return None
+
     def check_cachable(self, codelib):
         """
         Check cachability of the given CodeLibrary.
         """
-        return not codelib.has_dynamic_globals
+        return not (codelib.has_dynamic_globals or codelib.has_symbol_links)
 
     def get_filename_base(self, fullname, abiflags):
         parent = super(CodeLibraryCacheImpl, self)
@@ -530,7 +769,167 @@ class CodeLibraryCacheImpl(CacheImpl):
         return '-'.join([self._filename_prefix, res])
 
 
-class IndexDataCacheFile(object):
+class CacheBackend(metaclass=ABCMeta):
+    """
+    The storage used by a cache for one function: an index of the cached
+    overloads and their data.
+    """
+
+    # A description of why the last load() returned None, if known
+    miss_reason = None
+
+    @abstractmethod
+    def __init__(self, cache_path, filename_base, source_stamp):
+        """
+        Create the storage for the function identified by *filename_base*
+        inside the cache directory *cache_path*.  Entries saved with a
+        different *source_stamp* are considered stale.
+        """
+
+    @abstractmethod
+    def flush(self):
+        """
+        Remove all the entries for the function.
+        """
+
+    @abstractmethod
+    def save(self, key, data):
+        """
+        Save a new cache entry with *key* and *data*.
+        """
+
+    @abstractmethod
+    def load(self, key):
+        """
+        Load a cache entry with *key*.  Return None if the entry is not
+        available.
+        """
+
+    @classmethod
+    def scan_directory(cls, cache_path):
+        """
+        Return a list of ``CacheEntry`` describing everything stored by this
+        backend in the cache directory *cache_path*.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def remove_entries(cls, cache_path, entries):
+        """
+        Remove the given entries, as returned by ``scan_directory()``, from
+        the cache directory *cache_path*.
+        """
+        raise NotImplementedError
+
+
+# Describes an item stored in a cache directory:
+# - backend: the CacheBackend class that stored it
+# - kind: "index", "data" or "temp" (a leftover temporary file)
+# - name: the name of the item, unique for the backend in the directory
+# - path: the file the item is stored in
+# - size: the size of the item in bytes
+# - last_used: the time the item was last written or, when cache eviction
+#   is enabled, loaded
+# - status: "valid", "orphan" (data no longer referenced by an index, or
+#   temporary file left by an interrupted write), "obsolete" (index
+#   written by another Numba version), "corrupt" (unreadable index) or
+#   "missing" (data referenced by an index but not found)
+CacheEntry = namedtuple('CacheEntry', ['backend', 'kind', 'name', 'path',
+                                       'size', 'last_used', 'status'])
+
+
+class _Placeholder(object):
+    """
+    Stand-in for objects of classes from modules not yet imported, when
+    reading a cache index for inspection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __setstate__(self, state):
+        pass
+
+
+class _IndexUnpickler(pickle.Unpickler):
+    """
+    Unpickler for inspecting cache indices without importing the modules
+    defining the types in the index keys, which could have side effects.
+    Unless *placeholders* is true, the indices needing such modules can't
+    be loaded.
+    """
+
+    def __init__(self, file, placeholders=True):
+        super(_IndexUnpickler, self).__init__(file)
+        self._placeholders = placeholders
+
+    def find_class(self, module, name):
+        if module in sys.modules or module.split('.')[0] == 'numba':
+            return super(_IndexUnpickler, self).find_class(module, name)
+        if self._placeholders:
+            return _Placeholder
+        raise pickle.UnpicklingError("module %r is not imported" % (module,))
+
+
+def _load_index_overloads(data):
+    """
+    Return the overloads mapping of the pickled (stamp, overloads) index
+    *data* for inspection.
+    """
+    stamp, overloads = _IndexUnpickler(io.BytesIO(data)).load()
+    return overloads
+
+
+def _drop_index_overloads(data, names):
+    """
+    Return the pickled (stamp, overloads) index *data* without the
+    overloads whose data is in *names*, or None if the index can't be
+    loaded.
+    """
+    try:
+        stamp, overloads = _IndexUnpickler(io.BytesIO(data),
+                                           placeholders=False).load()
+    except Exception:
+        return None
+    overloads = {k: v for k, v in overloads.items() if v not in names}
+    return dumps((stamp, overloads))
+
+
+def _get_index_name(data_name):
+    """
+    Return the name of the index referring to the data *data_name*.
+    """
+    return '%s.nbi' % (data_name.rsplit('.', 2)[0],)
+
+
+def _evicted_by_index(entries):
+    """
+    Return a dict mapping the names of the indices that are not among the
+    given entries to the names of the data among the entries that they
+    refer to.
+    """
+    removed = {e.name for e in entries if e.kind == 'index'}
+    evicted = {}
+    for entry in entries:
+        if entry.kind == 'data' and entry.status == 'valid':
+            index_name = _get_index_name(entry.name)
+            if index_name not in removed:
+                evicted.setdefault(index_name, set()).add(entry.name)
+    return evicted
+
+
+_stale_miss_reason = "the source file has changed since it was cached"
+
+
+def _version_miss_reason(version):
+    return "it was cached by Numba %s" % (version,)
+
+
+def _eviction_enabled():
+    return bool(config.CACHE_MAX_BYTES or config.CACHE_MAX_AGE)
+
+
+class IndexDataCacheFile(CacheBackend):
     """
     Implements the logic for the index file and data file used by a cache.
     """
@@ -573,10 +972,15 @@ class IndexDataCacheFile(object):
         if data_name is None:
             return
         try:
-            return self._load_data(data_name)
+            data = self._load_data(data_name)
         except OSError:
             # File could have been removed while the index still refers it.
+            self.miss_reason = "the cached data is missing"
             return
+        if _eviction_enabled():
+            # Record the use for least-recently-used eviction
+            self._touch_data(data_name)
+        return data
 
     def _load_index(self):
         """
@@ -589,18 +993,22 @@ class IndexDataCacheFile(object):
                 data = f.read()
         except FileNotFoundError:
             # Index doesn't exist yet?
+            self.miss_reason = "the function has not been cached yet"
             return {}
         if version != self._version:
             # This is another version.  Avoid trying to unpickling the
             # rest of the stream, as that may fail.
+            self.miss_reason = _version_miss_reason(version)
             return {}
         stamp, overloads = pickle.loads(data)
         _cache_log("[cache] index loaded from %r", self._index_path)
         if stamp != self._source_stamp:
             # Cache is not fresh.  Stale data files will be eventually
             # overwritten, since they are numbered in incrementing order.
+            self.miss_reason = _stale_miss_reason
             return {}
         else:
+            self.miss_reason = "no entry for this signature and target"
             return overloads
 
     def _save_index(self, overloads):
@@ -626,6 +1034,12 @@ class IndexDataCacheFile(object):
             f.write(data)
         _cache_log("[cache] data saved to %r", path)
 
+    def _touch_data(self, name):
+        try:
+            os.utime(self._data_path(name))
+        except OSError:
+            pass
+
     def _data_name(self, number):
         return self._data_name_pattern.format(number=number)
 
@@ -635,8 +1049,95 @@ class IndexDataCacheFile(object):
     def _dump(self, obj):
         return dumps(obj)
 
+    # Temporary files younger than this (in seconds) may belong to a write
+    # in progress
+    _temp_grace_period = 3600
+
+    @classmethod
+    def scan_directory(cls, cache_path):
+        try:
+            filenames = sorted(os.listdir(cache_path))
+        except FileNotFoundError:
+            return []
+        version = numba.__version__
+        now = time.time()
+        entries = []
+        referenced = set()
+        data_files = {}
+        for fn in filenames:
+            path = os.path.join(cache_path, fn)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if fn.endswith('.nbi'):
+                status = 'valid'
+                try:
+                    with open(path, "rb") as f:
+                        if pickle.load(f) != version:
+                            status = 'obsolete'
+                        else:
+                            overloads = _load_index_overloads(f.read())
+                            referenced.update(overloads.values())
+                except FileNotFoundError:
+                    continue
+                except Exception:
+                    status = 'corrupt'
+                entries.append(CacheEntry(cls, 'index', fn, path, st.st_size,
+                                          st.st_mtime, status))
+            elif fn.endswith('.nbc'):
+                data_files[fn] = path, st
+            elif '.tmp.' in fn and fn.split('.tmp.')[0].endswith(('.nbi',
+                                                                   '.nbc')):
+                if now - st.st_mtime > cls._temp_grace_period:
+                    status = 'orphan'
+                else:
+                    status = 'valid'
+                entries.append(CacheEntry(cls, 'temp', fn, path, st.st_size,
+                                          st.st_mtime, status))
+        for fn, (path, st) in data_files.items():
+            status = 'valid' if fn in referenced else 'orphan'
+            entries.append(CacheEntry(cls, 'data', fn, path, st.st_size,
+                                      st.st_mtime, status))
+        for fn in sorted(referenced - set(data_files)):
+            entries.append(CacheEntry(cls, 'data', fn,
+                                      os.path.join(cache_path, fn), 0, None,
+                                      'missing'))
+        return entries
+
+    @classmethod
+    def remove_entries(cls, cache_path, entries):
+        paths = [e.path for e in entries if e.status != 'missing']
+        # Remove the references to the evicted data from the indices first
+        for index_name, names in _evicted_by_index(entries).items():
+            path = os.path.join(cache_path, index_name)
+            try:
+                with open(path, "rb") as f:
+                    version = pickle.load(f)
+                    data = f.read()
+            except OSError:
+                continue
+            new_data = _drop_index_overloads(data, names)
+            if new_data is None:
+                # Remove the function's entries altogether
+                paths.append(path)
+                paths.extend(os.path.join(cache_path, name) for name
+                             in _load_index_overloads(data).values())
+                continue
+            with cls._open_for_write(path) as f:
+                pickle.dump(version, f, protocol=-1)
+                f.write(new_data)
+            _cache_log("[cache] index saved to %r", path)
+        for path in sorted(set(paths)):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            _cache_log("[cache] removed %r", path)
+
+    @staticmethod
     @contextlib.contextmanager
-    def _open_for_write(self, filepath):
+    def _open_for_write(filepath):
         """
         Open *filepath* for writing in a race condition-free way (hopefully).
         uuid4 is used to try and avoid name collisions on a shared filesystem.
@@ -656,10 +1157,465 @@ class IndexDataCacheFile(object):
             raise
 
 
+class _SQLiteStore(object):
+    """
+    A single-file SQLite database holding the indices and data of all the
+    functions cached in a given cache directory.
+
+    The indices are bulk-loaded the first time the store is opened in a
+    process, so they may be outdated by the time they are used: the data
+    are stored along with what they are the data of, to be checked when
+    loaded.  Writes are done in transactions, so that concurrent readers and
+    writers (possibly in other processes) only ever see complete entries.
+    """
+
+    # Seconds to wait for a lock held by another connection
+    _timeout = 30
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = threading.RLock()
+        self._conn = None
+        self._pid = None
+        self._indices = {}
+        # Whether a write transaction is in progress
+        self._in_transaction = False
+
+    def _connect(self):
+        # A connection must not be shared with a forked child
+        if self._conn is None or self._pid != os.getpid():
+            # Transactions are started explicitly, see transaction()
+            conn = sqlite3.connect(self._path, timeout=self._timeout,
+                                   check_same_thread=False,
+                                   isolation_level=None)
+            # Let the file shrink when entries are evicted (only effective
+            # when the database is created)
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS numba_index "
+                         "(name TEXT PRIMARY KEY, version TEXT, "
+                         "payload BLOB)")
+            conn.execute("CREATE TABLE IF NOT EXISTS numba_data "
+                         "(name TEXT PRIMARY KEY, payload BLOB, "
+                         "mtime REAL)")
+            rows = conn.execute("SELECT name, version, payload "
+                                "FROM numba_index")
+            self._indices = {name: (version, payload)
+                             for name, version, payload in rows}
+            _cache_log("[cache] %d indices loaded from %r",
+                       len(self._indices), self._path)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Run the reads and writes of the block in a single transaction, which
+        locks the database for writing against other connections.  Reads
+        of indices within the transaction return their current contents.
+        """
+        with self._lock:
+            conn = self._connect()
+            if self._in_transaction:
+                # Nested in a transaction of this thread
+                yield
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            self._in_transaction = True
+            try:
+                yield
+            except BaseException:
+                conn.execute("ROLLBACK")
+                # The indices written in the transaction were rolled back
+                self._indices.clear()
+                raise
+            else:
+                conn.execute("COMMIT")
+            finally:
+                self._in_transaction = False
+
+    def get_index(self, name, refresh=False):
+        """
+        Return the (version, payload) of the index *name*, or None.  If
+        *refresh* is false and no transaction is in progress, the index
+        loaded in bulk may be returned.
+        """
+        with self._lock:
+            conn = self._connect()
+            refresh = refresh or self._in_transaction
+            if not refresh and name in self._indices:
+                return self._indices[name]
+            row = conn.execute("SELECT version, payload FROM numba_index "
+                               "WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                self._indices.pop(name, None)
+            else:
+                self._indices[name] = row
+            return row
+
+    def set_index(self, name, version, payload):
+        with self.transaction():
+            self._conn.execute("INSERT OR REPLACE INTO numba_index "
+                               "VALUES (?, ?, ?)", (name, version, payload))
+            self._indices[name] = version, payload
+
+    def get_data(self, name):
+        with self._lock:
+            row = self._connect().execute("SELECT payload FROM numba_data "
+                                          "WHERE name = ?", (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_data(self, name, payload):
+        with self.transaction():
+            self._conn.execute("INSERT OR REPLACE INTO numba_data "
+                               "VALUES (?, ?, ?)",
+                               (name, payload, time.time()))
+
+    def touch_data(self, name):
+        with self.transaction():
+            self._conn.execute("UPDATE numba_data SET mtime = ? "
+                               "WHERE name = ?", (time.time(), name))
+
+    def list_indices(self):
+        """
+        Return a list of (name, version, payload, size) for all indices.
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT name, version, payload, length(payload) "
+                "FROM numba_index")
+            return rows.fetchall()
+
+    def list_data(self):
+        """
+        Return a list of (name, size, mtime) for all data.
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT name, length(payload), mtime FROM numba_data")
+            return rows.fetchall()
+
+    def delete(self, index_names, data_names):
+        with self._lock:
+            with self.transaction():
+                self._conn.executemany("DELETE FROM numba_index "
+                                       "WHERE name = ?",
+                                       [(name,) for name in index_names])
+                self._conn.executemany("DELETE FROM numba_data "
+                                       "WHERE name = ?",
+                                       [(name,) for name in data_names])
+                for name in index_names:
+                    self._indices.pop(name, None)
+            self._conn.execute("PRAGMA incremental_vacuum")
+
+
+_sqlite_stores = {}
+_sqlite_stores_lock = threading.Lock()
+
+
+def _get_sqlite_store(path):
+    """
+    Return the process-wide store for the database at *path*.
+    """
+    path = os.path.abspath(path)
+    with _sqlite_stores_lock:
+        try:
+            return _sqlite_stores[path]
+        except KeyError:
+            store = _sqlite_stores[path] = _SQLiteStore(path)
+            return store
+
+
+class SQLiteCacheFile(IndexDataCacheFile):
+    """
+    A cache backend keeping the index and data of all the functions cached
+    in a directory in a single SQLite database file, instead of one index
+    file per function and one data file per overload.
+    """
+
+    _db_name = 'numba_cache.sqlite3'
+
+    def __init__(self, cache_path, filename_base, source_stamp):
+        super(SQLiteCacheFile, self).__init__(cache_path, filename_base,
+                                              source_stamp)
+        self._index_path = os.path.join(self._cache_path, self._db_name)
+
+    @property
+    def _store(self):
+        return _get_sqlite_store(self._index_path)
+
+    def save(self, key, data):
+        try:
+            # Read the latest index, write the data and the index in a
+            # single transaction, against concurrent writers.  The data is
+            # saved with its source stamp and key, checked by load().
+            with self._store.transaction():
+                super(SQLiteCacheFile, self).save(
+                    key, (self._source_stamp, key, data))
+        except sqlite3.Error as e:
+            _cache_log("[cache] failed to save to %r: %s", self._index_path, e)
+
+    def load(self, key):
+        try:
+            entry = super(SQLiteCacheFile, self).load(key)
+        except sqlite3.Error as e:
+            _cache_log("[cache] failed to load from %r: %s",
+                       self._index_path, e)
+            self.miss_reason = "the cache database failed: %s" % (e,)
+            return
+        if entry is None:
+            return
+        stamp, entry_key, data = entry
+        if stamp != self._source_stamp or entry_key != key:
+            # The index loaded in bulk is outdated, another process reused
+            # the data entry for another overload or version of the source
+            self._store.get_index(self._index_name, refresh=True)
+            self.miss_reason = ("the cached data was replaced by another "
+                                "process")
+            return
+        return data
+
+    def _load_index(self):
+        row = self._store.get_index(self._index_name)
+        if row is None:
+            self.miss_reason = "the function has not been cached yet"
+            return {}
+        version, data = row
+        if version != self._version:
+            self.miss_reason = _version_miss_reason(version)
+            return {}
+        stamp, overloads = pickle.loads(data)
+        _cache_log("[cache] index %r loaded from %r", self._index_name,
+                   self._index_path)
+        if stamp != self._source_stamp:
+            self.miss_reason = _stale_miss_reason
+            return {}
+        else:
+            self.miss_reason = "no entry for this signature and target"
+            return overloads
+
+    def _save_index(self, overloads):
+        data = self._dump((self._source_stamp, overloads))
+        self._store.set_index(self._index_name, self._version, data)
+        _cache_log("[cache] index %r saved to %r", self._index_name,
+                   self._index_path)
+
+    def _load_data(self, name):
+        data = self._store.get_data(name)
+        if data is None:
+            # Consistent with a data file lost by the file backend
+            raise FileNotFoundError(name)
+        tup = pickle.loads(data)
+        _cache_log("[cache] data %r loaded from %r", name, self._index_path)
+        return tup
+
+    def _save_data(self, name, data):
+        self._store.set_data(name, self._dump(data))
+        _cache_log("[cache] data %r saved to %r", name, self._index_path)
+
+    def _touch_data(self, name):
+        self._store.touch_data(name)
+
+    @classmethod
+    def scan_directory(cls, cache_path):
+        path = os.path.join(cache_path, cls._db_name)
+        if not os.path.exists(path):
+            return []
+        store = _get_sqlite_store(path)
+        version = numba.__version__
+        entries = []
+        referenced = set()
+        for name, idx_version, payload, size in store.list_indices():
+            status = 'valid'
+            if idx_version != version:
+                status = 'obsolete'
+            else:
+                try:
+                    referenced.update(_load_index_overloads(payload).values())
+                except Exception:
+                    status = 'corrupt'
+            entries.append(CacheEntry(cls, 'index', name, path, size, None,
+                                      status))
+        stored = set()
+        for name, size, mtime in store.list_data():
+            stored.add(name)
+            status = 'valid' if name in referenced else 'orphan'
+            entries.append(CacheEntry(cls, 'data', name, path, size, mtime,
+                                      status))
+        for name in sorted(referenced - stored):
+            entries.append(CacheEntry(cls, 'data', name, path, 0, None,
+                                      'missing'))
+        return entries
+
+    @classmethod
+    def remove_entries(cls, cache_path, entries):
+        path = os.path.join(cache_path, cls._db_name)
+        index_names = [e.name for e in entries if e.kind == 'index']
+        data_names = [e.name for e in entries
+                      if e.kind == 'data' and e.status != 'missing']
+        if not (index_names or data_names):
+            return
+        store = _get_sqlite_store(path)
+        with store.transaction():
+            # Remove the references to the evicted data from the indices
+            for index_name, names in _evicted_by_index(entries).items():
+                row = store.get_index(index_name)
+                if row is None:
+                    continue
+                version, data = row
+                new_data = _drop_index_overloads(data, names)
+                if new_data is None:
+                    # Remove the function's entries altogether
+                    index_names.append(index_name)
+                    data_names.extend(_load_index_overloads(data).values())
+                else:
+                    store.set_index(index_name, version, new_data)
+            store.delete(index_names, data_names)
+        _cache_log("[cache] removed %d entries from %r",
+                   len(index_names) + len(data_names), path)
+
+
+# Available cache backends, selected with NUMBA_CACHE_BACKEND
+_cache_backends = {
+    'files': IndexDataCacheFile,
+    'sqlite': SQLiteCacheFile,
+}
+
+
+def _get_cache_backend_class():
+    """
+    Return the CacheBackend subclass selected by the NUMBA_CACHE_BACKEND
+    environment variable, either a name from ``_cache_backends`` or the full
+    path of a class (``package.module.Klass``).
+    """
+    backend = config.CACHE_BACKEND.strip()
+    if backend == 'sqlite' and sqlite3 is None:
+        raise RuntimeError("The 'sqlite' cache backend specified via "
+                           "NUMBA_CACHE_BACKEND env variable requires the "
+                           "sqlite3 module")
+    try:
+        return _cache_backends[backend]
+    except KeyError:
+        pass
+    if "." in backend:
+        module_path, class_name = backend.rsplit(".", 1)
+        try:
+            module = importlib.import_module(module_path)
+            return getattr(module, class_name)
+        except (ImportError, AttributeError) as e:
+            raise RuntimeError(f"Failed to import '{backend}' specified via "
+                               "NUMBA_CACHE_BACKEND env variable") from e
+    raise RuntimeError(f"Unknown cache backend: '{backend}' specified via "
+                       "NUMBA_CACHE_BACKEND env variable")
+
+
+def scan_cache_dir(cache_path):
+    """
+    Return a list of ``CacheEntry`` for everything stored in the cache
+    directory *cache_path* by the known cache backends.
+    """
+    entries = []
+    for backend in _cache_backends.values():
+        entries.extend(backend.scan_directory(cache_path))
+    return entries
+
+
+def find_cache_dirs(paths):
+    """
+    Yield the directories under the given *paths* (recursively) that
+    contain Numba cache files.
+    """
+    db_names = {b._db_name for b in _cache_backends.values()
+                if hasattr(b, '_db_name')}
+    for top in paths:
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames.sort()
+            if any(fn.endswith(('.nbi', '.nbc')) or fn in db_names
+                   for fn in filenames):
+                yield dirpath
+
+
+def _remove_cache_entries(cache_path, entries):
+    by_backend = {}
+    for entry in entries:
+        by_backend.setdefault(entry.backend, []).append(entry)
+    for backend, backend_entries in by_backend.items():
+        backend.remove_entries(cache_path, backend_entries)
+
+
+def prune_cache_dir(cache_path, max_bytes=None, max_age=None, dry_run=False):
+    """
+    Evict entries from the cache directory *cache_path* and return the list
+    of evicted ``CacheEntry``.
+
+    Stale entries (orphan data, indices from other Numba versions and
+    corrupt indices) are always evicted.  If *max_age* (in seconds) is
+    given, data not used for longer than that are evicted.  If *max_bytes*
+    is given, the least recently used data are evicted until the total size
+    of the directory's entries fits within that size.
+    """
+    entries = [e for e in scan_cache_dir(cache_path)
+               if e.status != 'missing']
+    evicted = [e for e in entries if e.status in ('orphan', 'obsolete',
+                                                  'corrupt')]
+    live = [e for e in entries if e.status == 'valid' and e.kind == 'data']
+    if max_age:
+        now = time.time()
+        expired = [e for e in live if now - e.last_used > max_age]
+        evicted.extend(expired)
+        live = [e for e in live if e not in expired]
+    if max_bytes:
+        total = sum(e.size for e in entries) - sum(e.size for e in evicted)
+        for entry in sorted(live, key=lambda e: e.last_used):
+            if total <= max_bytes:
+                break
+            evicted.append(entry)
+            total -= entry.size
+    if not dry_run:
+        _remove_cache_entries(cache_path, evicted)
+    return evicted
+
+
+# Minimum interval in seconds between the prunings of a cache directory
+# when saving, as pruning scans all of its entries
+_prune_interval = 60.
+_last_pruned = {}
+_last_pruned_lock = threading.Lock()
+
+
+def _maybe_prune_cache_dir(cache_path):
+    """
+    Prune the cache directory *cache_path* to the configured limits, unless
+    it was already pruned by this process in the last ``_prune_interval``
+    seconds.
+    """
+    now = time.monotonic()
+    with _last_pruned_lock:
+        last = _last_pruned.get(cache_path)
+        if last is not None and now - last < _prune_interval:
+            return
+        _last_pruned[cache_path] = now
+    prune_cache_dir(cache_path, max_bytes=config.CACHE_MAX_BYTES,
+                    max_age=config.CACHE_MAX_AGE)
+
+
+def clear_cache_dir(cache_path, dry_run=False):
+    """
+    Remove all the entries from the cache directory *cache_path* and return
+    the list of removed ``CacheEntry``.
+    """
+    entries = [e for e in scan_cache_dir(cache_path)
+               if e.status != 'missing']
+    if not dry_run:
+        _remove_cache_entries(cache_path, entries)
+    return entries
+
+
 class Cache(_Cache):
     """
-    A per-function compilation cache.  The cache saves data in separate
-    data files and maintains information in an index file.
+    A per-function compilation cache.  By default, the cache saves data in
+    separate data files and maintains information in an index file (see
+    ``CacheBackend`` for alternative storages).
 
     There is one index file per function and Python version
     ("function_name-<lineno>.pyXY.nbi") which contains a mapping of
@@ -688,12 +1644,18 @@ class Cache(_Cache):
         self._cache_path = self._impl.locator.get_cache_path()
         # This may be a bit strict but avoids us maintaining a magic number
         source_stamp = self._impl.locator.get_source_stamp()
-        filename_base = self._impl.filename_base
-        self._cache_file = IndexDataCacheFile(cache_path=self._cache_path,
-                                              filename_base=filename_base,
-                                              source_stamp=source_stamp)
+        filename_base = self._get_filename_base()
+        cache_file_class = _get_cache_backend_class()
+        self._cache_file = cache_file_class(cache_path=self._cache_path,
+                                            filename_base=filename_base,
+                                            source_stamp=source_stamp)
+        # What happened to each signature, see explain()
+        self._outcomes = {}
         self.enable()
 
+    def _get_filename_base(self):
+        return self._impl.filename_base
+
     def __repr__(self):
         return "<%s py_func=%r>" % (self.__class__.__name__, self._name)
 
@@ -723,11 +1685,20 @@ class Cache(_Cache):
 
     def _load_overload(self, sig, target_context):
         if not self._enabled:
+            self._outcomes[sig] = ["the cache is disabled"]
             return
         key = self._index_key(sig, target_context.codegen())
         data = self._cache_file.load(key)
-        if data is not None:
+        if data is None:
+            reason = self._cache_file.miss_reason
+        else:
             data = self._impl.rebuild(target_context, data)
+            reason = getattr(self._impl, 'miss_reason', None)
+        if data is None:
+            self._outcomes[sig] = ["not loaded from the cache as %s"
+                                   % (reason or "it was not found")]
+        else:
+            self._outcomes[sig] = ["loaded from the cache"]
         return data
 
     def save_overload(self, sig, data):
@@ -740,12 +1711,29 @@ class Cache(_Cache):
     def _save_overload(self, sig, data):
         if not self._enabled:
             return
+        outcomes = self._outcomes.setdefault(sig, [])
         if not self._impl.check_cachable(data):
+            reason = self._impl.get_uncachable_reason(data)
+            outcomes.append("not saved to the cache %s"
+                            % (reason or "as it is not cachable"))
             return
         self._impl.locator.ensure_cache_path()
         key = self._index_key(sig, data.codegen)
         data = self._impl.reduce(data)
         self._cache_file.save(key, data)
+        outcomes.append("saved to the cache")
+        if _eviction_enabled():
+            _maybe_prune_cache_dir(self._cache_path)
+
+    def explain(self, sig):
+        """
+        Return a description of what the cache did for the given signature:
+        whether it was loaded from or saved to the cache and, if not, why.
+        """
+        outcomes = self._outcomes.get(sig)
+        if not outcomes:
+            return "the cache was not used for this signature"
+        return "; ".join(outcomes)
 
     @contextlib.contextmanager
     def _guard_against_spurious_io_errors(self):
@@ -789,6 +1777,22 @@ class FunctionCache(Cache):
     _impl_class = CompileResultCacheImpl
 
 
+class LiftedLoopCache(FunctionCache):
+    """
+    Implements Cache that saves and loads the CompileResult objects of a
+    loop lifted from a function, alongside those of the function itself.
+    The loop is identified by its first line number.
+    """
+
+    def __init__(self, py_func, loop_lineno):
+        self._loop_lineno = loop_lineno
+        super(LiftedLoopCache, self).__init__(py_func)
+
+    def _get_filename_base(self):
+        base = super(LiftedLoopCache, self)._get_filename_base()
+        return '%s-loop%d' % (base, self._loop_lineno)
+
+
 # Remember used cache filename prefixes.
 _lib_cache_prefixes = set([''])
 
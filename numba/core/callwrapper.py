@@ -101,42 +101,51 @@ class PyCallWrapper(object):
     def build(self):
         wrapname = self.fndesc.llvm_cpython_wrapper_name
 
-        # This is the signature of PyCFunctionWithKeywords
-        # (see CPython's methodobject.h)
+        # This is the signature of the METH_FASTCALL | METH_KEYWORDS calling
+        # convention (_PyCFunctionFastWithKeywords in CPython's
+        # methodobject.h), which is compatible with vectorcall: positional
+        # arguments are passed as an array and no tuple is created.
         pyobj = self.context.get_argument_type(types.pyobject)
-        wrapty = llvmlite.ir.FunctionType(pyobj, [pyobj, pyobj, pyobj])
+        py_ssize_t = self.context.get_value_type(types.intp)
+        wrapty = llvmlite.ir.FunctionType(pyobj, [pyobj, pyobj.as_pointer(),
+                                                  py_ssize_t, pyobj])
         wrapper = llvmlite.ir.Function(self.module, wrapty, name=wrapname)
 
         builder = IRBuilder(wrapper.append_basic_block('entry'))
 
         # - `closure` will receive the `self` pointer stored in the
         #   PyCFunction object (see _dynfunc.c)
-        # - `args` and `kws` will receive the tuple and dict objects
-        #   of positional and keyword arguments, respectively.
-        closure, args, kws = wrapper.args
+        # - `args` and `nargs` will receive the array and number of
+        #   positional arguments
+        # - `kwnames` will receive the tuple of keyword argument names, if
+        #   any (they are folded by the dispatcher and ignored here)
+        closure, args, nargs, kwnames = wrapper.args
         closure.name = 'py_closure'
         args.name = 'py_args'
-        kws.name = 'py_kws'
+        nargs.name = 'py_nargs'
+        kwnames.name = 'py_kwnames'
 
         api = self.context.get_python_api(builder)
-        self.build_wrapper(api, builder, closure, args, kws)
+        self.build_wrapper(api, builder, closure, args, nargs, kwnames)
 
         return wrapper, api
 
-    def build_wrapper(self, api, builder, closure, args, kws):
-        nargs = len(self.fndesc.argtypes)
+    def build_wrapper(self, api, builder, closure, args, nargs, kwnames):
+        argct = len(self.fndesc.argtypes)
 
-        objs = [api.alloca_obj() for _ in range(nargs)]
-        parseok = api.unpack_tuple(args, self.fndesc.qualname,
-                                   nargs, nargs, *objs)
-
-        pred = builder.icmp_unsigned(
-            '==',
-            parseok,
-            Constant(parseok.type, None))
+        # Check the number of positional arguments, with the same error as
+        # PyArg_UnpackTuple()
+        pred = builder.icmp_signed('!=', nargs, Constant(nargs.type, argct))
         with cgutils.if_unlikely(builder, pred):
+            msg = "%s expected %d argument%s, got %%zd" % (
+                self.fndesc.qualname.replace("%", "%%"), argct,
+                "" if argct == 1 else "s")
+            api.err_format("PyExc_TypeError", msg, nargs)
             builder.ret(api.get_null_object())
 
+        objs = [builder.load(builder.gep(args, [Constant(nargs.type, i)]))
+                for i in range(argct)]
+
         # Block that returns after erroneous argument unboxing/cleanup
         endblk = builder.append_basic_block("arg.end")
         with builder.goto_block(endblk):
@@ -146,7 +155,7 @@ class PyCallWrapper(object):
         env_manager = self.get_env(api, builder)
 
         cleanup_manager = _ArgManager(self.context, builder, api,
-                                      env_manager, endblk, nargs)
+                                      env_manager, endblk, argct)
 
         # Compute the arguments to the compiled Numba function.
         innerargs = []
@@ -155,7 +164,7 @@ class PyCallWrapper(object):
                 # It's an omitted value => ignore dummy Python object
                 innerargs.append(None)
             else:
-                val = cleanup_manager.add_arg(builder.load(obj), ty)
+                val = cleanup_manager.add_arg(obj, ty)
                 innerargs.append(val)
 
         if self.release_gil:
@@ -11,6 +11,7 @@ import llvmlite.ir as llvmir
 
 from abc import abstractmethod, ABCMeta
 from numba.core import utils, config, cgutils
+from numba.core import event as ev
 from numba.core.llvm_bindings import create_pass_builder
 from numba.core.runtime.nrtopt import remove_redundant_nrt_refct
 from numba.core.runtime import rtsys
@@ -18,6 +19,7 @@ from numba.core.compiler_lock import require_global_compiler_lock
 from numba.core.errors import NumbaInvalidConfigWarning
 from numba.misc.inspection import disassemble_elf_to_cfg
 from numba.misc.llvm_pass_timings import PassTimingsCollection
+from numba.misc import codemap
 
 
 _x86arch = frozenset(['x86', 'i386', 'i486', 'i586', 'i686', 'i786',
@@ -525,6 +527,7 @@ class CodeLibrary(metaclass=ABCMeta):
     _finalized = False
     _object_caching_enabled = False
     _disable_inspection = False
+    _symbol_linked = ()
 
     def __init__(self, codegen: "CPUCodegen", name: str):
         self._codegen = codegen
@@ -541,6 +544,15 @@ class CodeLibrary(metaclass=ABCMeta):
         self._ensure_finalized()
         return len(self._dynamic_globals) > 0
 
+    @property
+    def has_symbol_links(self):
+        """
+        Whether some of the linked libraries are only referenced by symbol,
+        in which case the code of this library is not self-contained.
+        """
+        self._ensure_finalized()
+        return len(self._symbol_linked) > 0
+
     @property
     def recorded_timings(self):
         return self._recorded_timings
@@ -642,13 +654,38 @@ class CodeLibrary(metaclass=ABCMeta):
 
 class CPUCodeLibrary(CodeLibrary):
 
-    def __init__(self, codegen, name):
+    def __init__(self, codegen, name, opt_level=None):
         super().__init__(codegen, name)
         self._linking_libraries = []   # maintain insertion order
         self._final_module = ll.parse_assembly(
             str(self._codegen._create_empty_module(self.name)))
         self._final_module.name = cgutils.normalize_ir_text(self.name)
         self._shared_module = None
+        # The optimization level overriding NUMBA_OPT for this library, if any
+        self._opt_level = opt_level
+        # The object code loaded by the JIT engine, kept until it is added
+        # to the code map
+        self._loaded_object = None
+
+    def _pass_options(self):
+        """
+        Internal: the options for the pass managers optimizing this library.
+        """
+        if self._opt_level is None:
+            return {}
+        # A library compiled at a given level, typically a quick first
+        # version of a function, also skips the costly vectorizers.
+        return dict(opt=self._opt_level, loop_vectorize=False,
+                    slp_vectorize=False)
+
+    def _llvm_pass_event(self, phase):
+        """
+        Internal: return a context manager broadcasting a "numba:llvm_pass"
+        event while *phase* runs on this library.
+        """
+        data = dict(name=f"{phase} [{self.name}]", pass_name=phase,
+                    library=self.name)
+        return ev.trigger_event("numba:llvm_pass", data=data)
 
     def _optimize_functions(self, ll_module):
         """
@@ -656,13 +693,15 @@ class CPUCodeLibrary(CodeLibrary):
         """
         # Enforce data layout to enable layout-specific optimizations
         ll_module.data_layout = self._codegen._data_layout
-        for func in ll_module.functions:
-            # Run function-level optimizations to reduce memory usage and improve
-            # module-level optimization.
-            fpm, pb = self._codegen._function_pass_manager()
-            k = f"Function passes on {func.name!r}"
-            with self._recorded_timings.record(k, pb):
-                fpm.run(func, pb)
+        with self._llvm_pass_event("Function passes"):
+            for func in ll_module.functions:
+                # Run function-level optimizations to reduce memory usage and
+                # improve module-level optimization.
+                fpm, pb = self._codegen._function_pass_manager(
+                    **self._pass_options())
+                k = f"Function passes on {func.name!r}"
+                with self._recorded_timings.record(k, pb):
+                    fpm.run(func, pb)
 
     def _optimize_final_module(self):
 
@@ -676,9 +715,11 @@ class CPUCodeLibrary(CodeLibrary):
                                            opt=self._codegen._opt_level,
                                            cost="cheap")
 
-        mpm_full, mpb_full = self._codegen._module_pass_manager()
+        mpm_full, mpb_full = self._codegen._module_pass_manager(
+            **self._pass_options())
         cheap_name = "Module passes (cheap optimization for refprune)"
-        with self._recorded_timings.record(cheap_name, mpb_cheap):
+        with self._llvm_pass_event(cheap_name), \
+                self._recorded_timings.record(cheap_name, mpb_cheap):
             # A cheaper optimisation pass is run first to try and get as many
             # refops into the same function as possible via inlining
             mpm_cheap.run(self._final_module, mpb_cheap)
@@ -686,7 +727,8 @@ class CPUCodeLibrary(CodeLibrary):
         if not config.LLVM_REFPRUNE_PASS:
             self._final_module = remove_redundant_nrt_refct(self._final_module)
         full_name = "Module passes (full optimization)"
-        with self._recorded_timings.record(full_name, mpb_full):
+        with self._llvm_pass_event(full_name), \
+                self._recorded_timings.record(full_name, mpb_full):
             # The full optimisation suite is then run on the refop pruned IR
             mpm_full.run(self._final_module, mpb_full)
 
@@ -759,14 +801,19 @@ class CPUCodeLibrary(CodeLibrary):
 
         # Link libraries for shared code
         seen = set()
+        symbol_linked = []
         for library in self._linking_libraries:
             if library not in seen:
                 # Parent inherits reload_init
                 self._reload_init.update(library._reload_init)
                 seen.add(library)
+                if self._can_link_by_symbol(library):
+                    symbol_linked.append(library)
+                    continue
                 self._final_module.link_in(
                     library._get_module_for_linking(), preserve=True,
                 )
+        self._symbol_linked = tuple(symbol_linked)
 
         # Optimize the module after all dependences are linked in above,
         # to allow for inlining.
@@ -775,6 +822,13 @@ class CPUCodeLibrary(CodeLibrary):
         self._final_module.verify()
         self._finalize_final_module()
 
+    def _can_link_by_symbol(self, library):
+        """
+        Whether calls into *library* can be resolved by symbol when this
+        library is loaded, instead of linking in a copy of *library*.
+        """
+        return False
+
     def _finalize_dynamic_globals(self):
         # Scan for dynamic globals
         for gv in self._final_module.global_variables:
@@ -786,6 +840,8 @@ class CPUCodeLibrary(CodeLibrary):
         for fn in self._final_module.functions:
             # We will only check for symbol name starting with '_ZN5numba'
             if fn.is_declaration and fn.name.startswith('_ZN5numba'):
+                if self._symbol_linked and self._is_symbol_loaded(fn.name):
+                    continue
                 msg = 'Symbol {} not linked properly'
                 raise AssertionError(msg.format(fn.name))
 
@@ -900,6 +956,8 @@ class CPUCodeLibrary(CodeLibrary):
         if self._object_caching_enabled:
             self._compiled = True
             self._compiled_object = buf
+        if codemap.get_code_map() is not None:
+            self._loaded_object = buf
 
     @classmethod
     def _object_getbuffer_hook(cls, ll_module):
@@ -913,6 +971,8 @@ class CPUCodeLibrary(CodeLibrary):
         if self._object_caching_enabled and self._compiled_object:
             buf = self._compiled_object
             self._compiled_object = None
+            if codemap.get_code_map() is not None:
+                self._loaded_object = buf
             return buf
 
     def serialize_using_bitcode(self):
@@ -998,16 +1058,36 @@ class JITCodeLibrary(CPUCodeLibrary):
             - non-zero if the symbol is defined.
         """
         self._ensure_finalized()
-        ee = self._codegen._engine
-        if not ee.is_symbol_defined(name):
-            return 0
-        else:
-            return self._codegen._engine.get_function_address(name)
+        return self._get_loaded_address(name)
 
     def _finalize_specific(self):
         self._codegen._scan_and_fix_unresolved_refs(self._final_module)
-        with self._recorded_timings.record_legacy("Finalize object"):
+        with self._llvm_pass_event("Finalize object"), \
+                self._recorded_timings.record_legacy("Finalize object"):
             self._codegen._engine.finalize_object()
+        code_map = codemap.get_code_map()
+        if code_map is not None and self._loaded_object is not None:
+            code_map.add_object(self, self._loaded_object,
+                                self._get_loaded_address)
+            self._loaded_object = None
+
+    def _can_link_by_symbol(self, library):
+        # Finalized libraries of the same codegen are loaded in its execution
+        # engine, which resolves references to their functions.  Callees are
+        # then optimized and compiled to machine code once rather than once
+        # per caller, at the expense of cross-library inlining.
+        return (config.LINK_BY_SYMBOL and
+                isinstance(library, JITCodeLibrary) and
+                library.codegen is self.codegen)
+
+    def _is_symbol_loaded(self, name):
+        return self._codegen._engine.is_symbol_defined(name)
+
+    def _get_loaded_address(self, name):
+        ee = self._codegen._engine
+        if not ee.is_symbol_defined(name):
+            return 0
+        return ee.get_function_address(name)
 
 
 class RuntimeLinker(object):
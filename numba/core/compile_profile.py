@@ -0,0 +1,357 @@
+"""
+A process-wide profile of compilation: the time spent in each compiler pass
+and LLVM optimization phase, for each compiled function, and the growth of
+the process' peak memory use.  This is meant to find out which functions make
+the start-up of an application slow, without attaching a profiler.
+
+Profiling is enabled by setting :envvar:`NUMBA_COMPILE_PROFILE`, or by calling
+``enable()``.  ``numba.compile_profile()`` then returns a ``CompileProfile``
+of all the compilations recorded so far, which can be summarized or exported
+to JSON or to the Chrome trace format.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from timeit import default_timer as timer
+
+from numba.core import config, utils
+import numba.core.event as ev
+
+try:
+    import resource
+except ImportError:
+    # e.g. on Windows
+    resource = None
+
+
+# The events recorded by the profiler
+_event_kinds = ("numba:compile", "numba:cache_load", "numba:run_pass",
+                "numba:llvm_pass")
+
+# The record kind of each event kind
+_record_kinds = {
+    "numba:compile": "compile",
+    "numba:cache_load": "cache_load",
+    "numba:run_pass": "pass",
+    "numba:llvm_pass": "llvm",
+}
+
+
+ProfileRecord = namedtuple("ProfileRecord", [
+    # The "module.qualname" of the function compiled
+    "function",
+    # The pass or LLVM phase, or "compile" or "cache_load" for the whole
+    # compilation or cache load of a signature
+    "name",
+    # One of "compile", "cache_load", "pass" and "llvm"
+    "kind",
+    # The argument types, as a string
+    "args",
+    # The native id of the compiling thread
+    "thread",
+    # The start time, as returned by time.time()
+    "start",
+    # The duration in seconds, and the same excluding the nested records
+    # (e.g. the LLVM phases of a lowering pass, or compiling a callee)
+    "duration",
+    "self_duration",
+    # The peak resident memory of the process at the end, and its increase
+    # during the record excluding the nested records, in bytes (None where
+    # this isn't available)
+    "peak_rss",
+    "rss_growth",
+])
+
+
+def _get_peak_rss():
+    """
+    Return the peak resident memory of the process in bytes, or None.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # In kilobytes, except on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _get_function_name(module, qualname):
+    return "%s.%s" % (module, qualname) if module else qualname
+
+
+class _Frame(object):
+    """
+    An event being recorded.
+    """
+    __slots__ = ("event", "start", "ts", "peak_rss", "nested",
+                 "nested_growth")
+
+    def __init__(self, event):
+        self.event = event
+        self.start = time.time()
+        self.ts = timer()
+        self.peak_rss = _get_peak_rss()
+        # The total duration and peak memory growth of the nested records
+        self.nested = 0.0
+        self.nested_growth = 0
+
+
+class ProfileListener(ev.Listener):
+    """
+    A listener recording the compilation events of all threads as
+    ``ProfileRecord`` instances, in the ``records`` list.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._local = threading.local()
+
+    def _get_stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+            return stack
+
+    def on_start(self, event):
+        self._get_stack().append(_Frame(event))
+
+    def on_end(self, event):
+        stack = self._get_stack()
+        if not stack or stack[-1].event.data is not event.data:
+            # Started before the listener was registered
+            return
+        frame = stack.pop()
+        duration = timer() - frame.ts
+        peak_rss = _get_peak_rss()
+        growth = 0 if peak_rss is None else peak_rss - frame.peak_rss
+        if stack:
+            stack[-1].nested += duration
+            stack[-1].nested_growth += growth
+        function, name, args = self._describe(event, stack)
+        self.records.append(ProfileRecord(
+            function=function, name=name, kind=_record_kinds[event.kind],
+            args=args, thread=threading.get_native_id(), start=frame.start,
+            duration=duration, self_duration=duration - frame.nested,
+            peak_rss=peak_rss,
+            rss_growth=(None if peak_rss is None
+                        else growth - frame.nested_growth),
+        ))
+
+    def _describe(self, event, stack):
+        """
+        Return the function, name and argument types of the record for
+        *event*, given the *stack* of enclosing events.
+        """
+        data = event.data
+        if event.kind == "numba:run_pass":
+            qualname = data["qualname"]
+            # The name is "<pass name> [<qualname>]"
+            name = data["name"][:-len(qualname) - 3]
+            return (_get_function_name(data["module"], qualname), name,
+                    data["args"])
+        elif event.kind == "numba:llvm_pass":
+            # Attribute it to the function whose pass is running, if any
+            for frame in reversed(stack):
+                if frame.event.kind == "numba:run_pass":
+                    function, _, args = self._describe(frame.event, ())
+                    return function, data["pass_name"], args
+            return data["library"], data["pass_name"], ""
+        else:
+            py_func = data["dispatcher"].py_func
+            module = getattr(py_func, "__module__", None)
+            function = _get_function_name(module, py_func.__qualname__)
+            return (function, _record_kinds[event.kind],
+                    str(tuple(data["args"])))
+
+
+def _sorted_by_time(summary):
+    return dict(sorted(summary.items(), key=lambda item: -item[1]["time"]))
+
+
+def _summarize(records):
+    """
+    Summarize *records* per name, see ``CompileProfile.passes()``.
+    """
+    passes = {}
+    for rec in records:
+        stats = passes.setdefault(rec.name,
+                                  dict(count=0, time=0.0, rss_growth=None))
+        stats["count"] += 1
+        stats["time"] += rec.self_duration
+        if rec.rss_growth is not None:
+            stats["rss_growth"] = (stats["rss_growth"] or 0) + rec.rss_growth
+    return _sorted_by_time(passes)
+
+
+class CompileProfile(object):
+    """
+    The records of a compilation profile, see ``numba.compile_profile()``.
+    """
+
+    def __init__(self, records):
+        self.records = tuple(records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def functions(self):
+        """
+        Summarize the records per function.  Returns a dict mapping each
+        function name to a dict with the keys:
+
+        - ``"time"``: the total time in seconds spent compiling the function
+          itself, excluding the functions compiled for it.
+        - ``"compilations"`` and ``"cache_loads"``: the number of signatures
+          compiled or loaded from the on-disk cache.
+        - ``"peak_rss"``: the highest peak resident memory of the process
+          while compiling the function, and ``"rss_growth"``, the total
+          increase of the peak attributed to the function, in bytes.
+        - ``"passes"``: the summary of the function's records per pass, as
+          returned by ``passes()``.
+
+        The functions are ordered by decreasing time.
+        """
+        per_function = {}
+        for rec in self.records:
+            per_function.setdefault(rec.function, []).append(rec)
+        functions = {}
+        for name, records in per_function.items():
+            passes = _summarize(records)
+            kinds = [rec.kind for rec in records]
+            peaks = [rec.peak_rss for rec in records
+                     if rec.peak_rss is not None]
+            growth = [stats["rss_growth"] for stats in passes.values()
+                      if stats["rss_growth"] is not None]
+            functions[name] = dict(
+                time=sum(stats["time"] for stats in passes.values()),
+                compilations=kinds.count("compile"),
+                cache_loads=kinds.count("cache_load"),
+                peak_rss=max(peaks) if peaks else None,
+                rss_growth=sum(growth) if growth else None,
+                passes=passes,
+            )
+        return _sorted_by_time(functions)
+
+    def passes(self):
+        """
+        Summarize the records per pass or LLVM phase, across all functions.
+        Returns a dict mapping each name to a dict of its ``"count"``, total
+        ``"time"`` and total ``"rss_growth"`` (both excluding the nested
+        passes), ordered by decreasing time.
+        """
+        return _summarize(self.records)
+
+    def report(self, limit=10):
+        """
+        Return a printable report of the *limit* functions that took the
+        longest to compile, with their most expensive passes.
+        """
+        lines = []
+        functions = list(self.functions().items())
+        total = sum(func["time"] for _, func in functions)
+        lines.append("Compilation profile: %d functions, %.3f s"
+                     % (len(functions), total))
+        for name, func in functions[:limit]:
+            lines.append("%10.3f s  %s (%d compiled, %d loaded from cache)"
+                         % (func["time"], name, func["compilations"],
+                            func["cache_loads"]))
+            for pass_name, stats in list(func["passes"].items())[:5]:
+                lines.append("%10.3f s      %s" % (stats["time"], pass_name))
+        return "\n".join(lines)
+
+    def to_json(self, path=None):
+        """
+        Export the per-function summary and the records to JSON.  Writes to
+        *path* if given, else returns the JSON string.
+        """
+        doc = dict(
+            pid=os.getpid(),
+            functions=self.functions(),
+            records=[rec._asdict() for rec in self.records],
+        )
+        return self._dump(doc, path)
+
+    def to_chrome_trace(self, path=None):
+        """
+        Export the records in the Chrome trace event format (as with
+        :envvar:`NUMBA_CHROME_TRACE`), for viewing in e.g. ``chrome://tracing``
+        or Perfetto.  Writes to *path* if given, else returns the JSON string.
+        """
+        pid = os.getpid()
+        evs = []
+        for rec in self.records:
+            evs.append(dict(
+                cat=rec.kind, pid=pid, tid=rec.thread, ph="X",
+                ts=rec.start * 1_000_000, dur=rec.duration * 1_000_000,
+                name="%s [%s]" % (rec.name, rec.function),
+                args=dict(function=rec.function, args=rec.args,
+                          peak_rss=rec.peak_rss, rss_growth=rec.rss_growth),
+            ))
+        return self._dump(evs, path)
+
+    def _dump(self, obj, path):
+        if path is None:
+            return json.dumps(obj, cls=utils._LazyJSONEncoder)
+        with open(path, "w") as out:
+            json.dump(obj, out, cls=utils._LazyJSONEncoder)
+
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def enable():
+    """
+    Start recording the compilations of all threads, if not already done.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = ProfileListener()
+            for kind in _event_kinds:
+                ev.register(kind, _listener)
+
+
+def disable():
+    """
+    Stop recording compilations and discard the recorded profile.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            for kind in _event_kinds:
+                ev.unregister(kind, _listener)
+            _listener = None
+
+
+def is_enabled():
+    """
+    Whether compilations are being recorded.
+    """
+    return _listener is not None
+
+
+def compile_profile(reset=False):
+    """
+    Return a ``CompileProfile`` of all the compilations recorded since
+    profiling was enabled (by setting :envvar:`NUMBA_COMPILE_PROFILE`, or by
+    calling ``numba.core.compile_profile.enable()``), or since the last
+    reset.  If *reset* is true, the recorded compilations are discarded.
+    """
+    listener = _listener
+    if listener is None:
+        raise RuntimeError("compilation profiling is not enabled, set "
+                           "NUMBA_COMPILE_PROFILE=1 or call "
+                           "numba.core.compile_profile.enable()")
+    records = listener.records
+    if reset:
+        listener.records = []
+    return CompileProfile(records)
+
+
+if config.COMPILE_PROFILE:
+    enable()
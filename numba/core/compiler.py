@@ -140,6 +140,19 @@ detail""",
         doc="TODO",
     )
 
+    tiered = Option(
+        type=bool,
+        default=False,
+        doc=("Compile a quick first version of each overload, recompiled "
+             "at full optimization in the background."),
+    )
+    opt_level = Option(
+        type=int,
+        default=None,
+        doc=("Override the optimization level (NUMBA_OPT) of the function's "
+             "own code library."),
+    )
+
     dbg_extend_lifetimes = Option(
         type=bool,
         default=False,
@@ -369,6 +382,8 @@ def _make_subtarget(targetctx, flags):
     subtargetoptions = {}
     if flags.debuginfo:
         subtargetoptions['enable_debuginfo'] = True
+        if flags.dbg_directives_only:
+            subtargetoptions['dbg_directives_only'] = True
     if flags.boundscheck:
         subtargetoptions['enable_boundscheck'] = True
     if flags.nrt:
@@ -6,14 +6,6 @@ import shutil
 import warnings
 import traceback
 
-# YAML needed to use file based Numba config
-try:
-    import yaml
-    _HAVE_YAML = True
-except ImportError:
-    _HAVE_YAML = False
-
-
 import llvmlite.binding as ll
 
 
@@ -127,7 +119,13 @@ class _EnvReloader(object):
 
         # first check if there's a .numba_config.yaml and use values from that
         if os.path.exists(_config_fname) and os.path.isfile(_config_fname):
-            if not _HAVE_YAML:
+            # YAML needed to use file based Numba config, only imported
+            # when there is such a file as it is slow to import
+            try:
+                import yaml
+            except ImportError:
+                yaml = None
+            if yaml is None:
                 msg = ("A Numba config file is found but YAML parsing "
                        "capabilities appear to be missing. "
                        "To use this feature please install `pyyaml`. e.g. "
@@ -286,12 +284,36 @@ class _EnvReloader(object):
         # see _locator_classes in caching submodule
         CACHE_LOCATOR_CLASSES = _readenv("NUMBA_CACHE_LOCATOR_CLASSES", str, "")
 
+        # Storage used for the cache index and data: "files" (one index file
+        # per function and one data file per overload), "sqlite" (a single
+        # database file per cache directory) or the full path of a class
+        CACHE_BACKEND = _readenv("NUMBA_CACHE_BACKEND", str, "files")
+
+        # Validate cache entries with a hash of the source file contents
+        # instead of its modification time and size, and locate user-wide
+        # caches relative to the import root, so that caches survive moving
+        # or copying the source tree.
+        CACHE_CONTENT_HASH = _readenv("NUMBA_CACHE_CONTENT_HASH", int, 0)
+
+        # Cache eviction: maximum total size in bytes of a cache directory
+        # and maximum time in seconds since a cache entry was last used.
+        # 0 means unlimited.
+        CACHE_MAX_BYTES = _readenv("NUMBA_CACHE_MAX_BYTES", int, 0)
+        CACHE_MAX_AGE = _readenv("NUMBA_CACHE_MAX_AGE", int, 0)
+
         # Enable tracing support
         TRACE = _readenv("NUMBA_TRACE", int, 0)
 
         # Enable chrome tracing support
         CHROME_TRACE = _readenv("NUMBA_CHROME_TRACE", str, "")
 
+        # Record a profile of the compilations, see numba.compile_profile()
+        COMPILE_PROFILE = _readenv("NUMBA_COMPILE_PROFILE", int, 0)
+
+        # Record the signatures compiled by the process in a warmup manifest
+        # written to this file at exit
+        WARMUP_RECORD = _readenv("NUMBA_WARMUP_RECORD", str, "")
+
         # Enable debugging of type inference
         DEBUG_TYPEINFER = _readenv("NUMBA_DEBUG_TYPEINFER", int, 0)
 
@@ -310,6 +332,10 @@ class _EnvReloader(object):
         # Optimization level
         OPT = _readenv("NUMBA_OPT", _process_opt_level, _OptLevel(3))
 
+        # Optimization level of the first, quickly compiled version of each
+        # overload of a dispatcher with tiered compilation (``tiered=True``)
+        TIERED_OPT = _readenv("NUMBA_TIERED_OPT", int, 1)
+
         # Force dump of Python bytecode
         DUMP_BYTECODE = _readenv("NUMBA_DUMP_BYTECODE", int, DEBUG_FRONTEND)
 
@@ -412,6 +438,18 @@ class _EnvReloader(object):
         )
         THREADING_LAYER = _readenv("NUMBA_THREADING_LAYER", str, 'default')
 
+        # pinning of the threads of the threading layer to CPUs
+        THREAD_AFFINITY = _readenv("NUMBA_THREAD_AFFINITY", str, '')
+
+        # allocate large blocks with fresh pages, for them to be placed on the
+        # NUMA node of the thread writing them first
+        PARALLEL_FIRST_TOUCH = _readenv("NUMBA_PARALLEL_FIRST_TOUCH", int, 0)
+
+        # run the parallel loops serially below this estimated cost, in IR
+        # statements executed, 0 disables it
+        PARALLEL_SERIAL_THRESHOLD = _readenv(
+            "NUMBA_PARALLEL_SERIAL_THRESHOLD", int, 0)
+
         # CUDA Configs
 
         # Whether to warn about kernel launches where a host array
@@ -535,6 +573,14 @@ class _EnvReloader(object):
         ENABLE_PROFILING = _readenv(
             "NUMBA_ENABLE_PROFILING", int, int(RUNNING_UNDER_PROFILER))
 
+        # Emit line tables and keep a map of the JIT compiled machine code,
+        # for the sampling profiler
+        SAMPLING_PROFILER = _readenv("NUMBA_SAMPLING_PROFILER", int, 0)
+
+        # Publish the JIT compiled functions to perf: 1 writes a perf map
+        # file, 2 also writes a jitdump file
+        PERF_MAP = _readenv("NUMBA_PERF_MAP", int, 0)
+
         # Debug Info
 
         # The default value for the `debug` flag
@@ -569,6 +615,10 @@ class _EnvReloader(object):
             "NUMBA_USE_LLVMLITE_MEMORY_MANAGER", int, None
         )
 
+        # Resolve calls to other JIT compiled functions through the execution
+        # engine instead of linking a copy of the callees into each caller
+        LINK_BY_SYMBOL = _readenv("NUMBA_LINK_BY_SYMBOL", int, 0)
+
         # Timing support.
 
         # LLVM_PASS_TIMINGS enables LLVM recording of pass timings.
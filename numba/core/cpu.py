@@ -117,8 +117,10 @@ class CPUContext(BaseContext):
         from numba.typed import typedlist, listobject # noqa F401
         from numba.typed import typedset, setobject # noqa F401
         from numba.experimental import jitclass, function_type # noqa F401
+        from numba.experimental.jitclass import overloads # noqa F401
         from numba.np.types import datetime_registry # noqa F401
         from numba.np import npdatetime # noqa F401
+        from numba.np.ufunc import reductionimpl # noqa F401
 
         # Add target specific implementations
         from numba.np import npyimpl
@@ -321,6 +323,7 @@ _options_mixin = include_default_options(
     "error_model",
     "inline",
     "forceinline",
+    "tiered",
     "_dbg_extend_lifetimes",
     "_dbg_optnone",
 )
@@ -338,9 +341,16 @@ class CPUTargetOptions(_options_mixin, TargetOptions):
 
         if not flags.is_set("debuginfo"):
             flags.debuginfo = config.DEBUGINFO_DEFAULT
+            if not flags.debuginfo and config.SAMPLING_PROFILER:
+                # The sampling profiler only needs the line tables, which
+                # don't change the generated code
+                flags.debuginfo = True
+                flags.dbg_directives_only = True
+
+        full_debuginfo = flags.debuginfo and not flags.dbg_directives_only
 
         if not flags.is_set("dbg_extend_lifetimes"):
-            if flags.debuginfo:
+            if full_debuginfo:
                 # auto turn on extend-lifetimes if debuginfo is on and
                 # dbg_extend_lifetimes is not set
                 flags.dbg_extend_lifetimes = True
@@ -349,7 +359,7 @@ class CPUTargetOptions(_options_mixin, TargetOptions):
                 flags.dbg_extend_lifetimes = config.EXTEND_VARIABLE_LIFETIMES
 
         if not flags.is_set("boundscheck"):
-            flags.boundscheck = flags.debuginfo
+            flags.boundscheck = full_debuginfo
 
         flags.enable_pyobject_looplift = True
 
@@ -62,12 +62,17 @@ class FastMathOptions(AbstractOptionValue):
         return NotImplemented
 
 
+# The schedules of parallel loops, see ParallelOptions.schedule
+PARALLEL_SCHEDULES = ("static", "dynamic", "guided")
+
+
 class ParallelOptions(AbstractOptionValue):
     """
     Options for controlling auto parallelization.
     """
     __slots__ = ("enabled", "comprehension", "reduction", "inplace_binop",
-                 "setitem", "numpy", "stencil", "fusion", "prange")
+                 "setitem", "numpy", "stencil", "fusion", "prange",
+                 "schedule")
 
     def __init__(self, value):
         if isinstance(value, bool):
@@ -80,6 +85,7 @@ class ParallelOptions(AbstractOptionValue):
             self.stencil = value
             self.fusion = value
             self.prange = value
+            self.schedule = "static"
         elif isinstance(value, dict):
             self.enabled = True
             self.comprehension = value.pop('comprehension', True)
@@ -90,6 +96,10 @@ class ParallelOptions(AbstractOptionValue):
             self.stencil = value.pop('stencil', True)
             self.fusion = value.pop('fusion', True)
             self.prange = value.pop('prange', True)
+            self.schedule = value.pop('schedule', "static")
+            if self.schedule not in PARALLEL_SCHEDULES:
+                msg = "Unknown parallel schedule %r, expected one of %s"
+                raise ValueError(msg % (self.schedule, PARALLEL_SCHEDULES))
             if value:
                 msg = "Unrecognized parallel options: %s" % value.keys()
                 raise NameError(msg)
@@ -103,6 +113,7 @@ class ParallelOptions(AbstractOptionValue):
             self.stencil = value.stencil
             self.fusion = value.fusion
             self.prange = value.prange
+            self.schedule = value.schedule
         else:
             msg = "Expect parallel option to be either a bool or a dict"
             raise ValueError(msg)
@@ -92,6 +92,7 @@ class DIBuilder(AbstractDIBuilder):
     def __init__(self, module, filepath, cgctx, directives_only):
         self.module = module
         self.filepath = os.path.abspath(filepath)
+        self.directives_only = directives_only
         self.difile = self._di_file()
         self.subprograms = []
         self.cgctx = cgctx
@@ -385,6 +386,13 @@ class DIBuilder(AbstractDIBuilder):
     #
 
     def _di_file(self):
+        if self.directives_only:
+            # Without debug info entries, the line table has no compilation
+            # directory to resolve a relative file name against.
+            return self.module.add_debug_info('DIFile', {
+                'directory': '',
+                'filename': self.filepath,
+            })
         return self.module.add_debug_info('DIFile', {
             'directory': os.path.dirname(self.filepath),
             'filename': os.path.basename(self.filepath),
@@ -1,9 +1,17 @@
 # -*- coding: utf-8 -*-
 
 
+import builtins
 import collections
+import collections.abc
+import concurrent.futures
+import copy
 import functools
+import importlib
+import logging
+import multiprocessing
 import sys
+import threading
 import types as pytypes
 import uuid
 import weakref
@@ -12,18 +20,23 @@ from abc import abstractmethod
 
 from numba import _dispatcher
 from numba.core import (
-    utils, types, errors, typing, serialize, config, compiler, sigutils
+    utils, types, errors, typing, serialize, config, compiler, sigutils,
+    bytecode, interpreter, ir,
 )
 from numba.core.compiler_lock import global_compiler_lock
 from numba.core.typeconv.rules import default_type_manager
 from numba.core.typing.templates import fold_arguments
 from numba.core.typing.typeof import Purpose, typeof
 from numba.core.bytecode import get_code_object
-from numba.core.caching import NullCache, FunctionCache
+from numba.core.ir_utils import build_definitions
+from numba.core.caching import NullCache, FunctionCache, LiftedLoopCache
 from numba.core import entrypoints
 import numba.core.event as ev
 
 
+_logger = logging.getLogger(__name__)
+
+
 class OmittedArg(object):
     """
     A placeholder for omitted arguments with a default value.
@@ -53,6 +66,11 @@ class _FunctionCompiler(object):
         # compilation to avoid compilation attempt on them.  The values are
         # the exceptions.
         self._failed_cache = {}
+        # The Numba IR translated from the function's bytecode, reused for
+        # each new signature (see _get_untyped_ir()), and the global and
+        # free variable values captured in it.
+        self._untyped_ir = None
+        self._untyped_ir_values = ()
 
     def fold_argument_types(self, args, kws):
         """
@@ -76,14 +94,14 @@ class _FunctionCompiler(object):
                               stararg_handler)
         return self.pysig, args
 
-    def compile(self, args, return_type):
-        status, retval = self._compile_cached(args, return_type)
+    def compile(self, args, return_type, opt_level=None):
+        status, retval = self._compile_cached(args, return_type, opt_level)
         if status:
             return retval
         else:
             raise retval
 
-    def _compile_cached(self, args, return_type):
+    def _compile_cached(self, args, return_type, opt_level=None):
         key = tuple(args), return_type
         try:
             return False, self._failed_cache[key]
@@ -91,30 +109,106 @@ class _FunctionCompiler(object):
             pass
 
         try:
-            retval = self._compile_core(args, return_type)
+            retval = self._compile_core(args, return_type, opt_level)
         except errors.TypingError as e:
             self._failed_cache[key] = e
             return False, e
         else:
             return True, retval
 
-    def _compile_core(self, args, return_type):
+    def _compile_core(self, args, return_type, opt_level=None):
         flags = compiler.Flags()
         self.targetdescr.options.parse_as_flags(flags, self.targetoptions)
         flags = self._customize_flags(flags)
+        if opt_level is not None:
+            flags.opt_level = opt_level
 
         impl = self._get_implementation(args, {})
-        cres = compiler.compile_extra(self.targetdescr.typing_context,
-                                      self.targetdescr.target_context,
-                                      impl,
-                                      args=args, return_type=return_type,
-                                      flags=flags, locals=self.locals,
-                                      pipeline_class=self.pipeline_class)
+        if self._can_reuse_untyped_ir(impl, flags):
+            cres = compiler.compile_ir(self.targetdescr.typing_context,
+                                       self.targetdescr.target_context,
+                                       self._get_untyped_ir(),
+                                       args=args, return_type=return_type,
+                                       flags=flags, locals=self.locals,
+                                       pipeline_class=self.pipeline_class)
+        else:
+            cres = compiler.compile_extra(self.targetdescr.typing_context,
+                                          self.targetdescr.target_context,
+                                          impl,
+                                          args=args, return_type=return_type,
+                                          flags=flags, locals=self.locals,
+                                          pipeline_class=self.pipeline_class)
         # Check typing error if object mode is used
         if cres.typing_error is not None and not flags.enable_pyobject:
             raise cres.typing_error
         return cres
 
+    def _can_reuse_untyped_ir(self, impl, flags):
+        """
+        Whether the function can be compiled from a copy of its translated
+        IR instead of from its bytecode.  Only the default nopython
+        pipeline is known to be fine with that; object mode needs the
+        bytecode for its fallback pipeline.
+        """
+        return (impl is self.py_func and
+                self.pipeline_class is compiler.Compiler and
+                not flags.enable_pyobject)
+
+    def _get_untyped_ir(self):
+        """
+        Return a fresh copy of the Numba IR of the function, as translated
+        from its bytecode.  The translation is only done again if a global
+        or free variable referenced by the function has been rebound.
+        """
+        if self._untyped_ir is None or not self._untyped_ir_is_current():
+            func_id = bytecode.FunctionIdentity.from_function(self.py_func)
+            bc = bytecode.ByteCode(func_id)
+            if config.DUMP_BYTECODE:
+                print(bc.dump())
+            func_ir = interpreter.Interpreter(func_id).interpret(bc)
+            self._untyped_ir = func_ir
+            self._untyped_ir_values = self._get_captured_values(func_ir)
+        func_ir = self._untyped_ir
+        new_ir = func_ir.derive(copy.deepcopy(func_ir.blocks),
+                                loc=func_ir.loc)
+        new_ir._definitions = build_definitions(new_ir.blocks)
+        return new_ir
+
+    def _get_captured_values(self, func_ir):
+        # The values of globals and free variables are frozen into the IR
+        # when it is translated, remember those that came from the function's
+        # namespace so that rebinding them can be detected.
+        values = []
+        for blk in func_ir.blocks.values():
+            for inst in blk.find_insts(ir.Assign):
+                val = inst.value
+                if isinstance(val, ir.Global):
+                    key = ir.Global, val.name
+                elif isinstance(val, ir.FreeVar):
+                    key = ir.FreeVar, val.index
+                else:
+                    continue
+                if self._lookup_captured_value(key) is val.value:
+                    values.append((key, val.value))
+        return tuple(values)
+
+    def _lookup_captured_value(self, key):
+        kind, name = key
+        if kind is ir.Global:
+            try:
+                return self.py_func.__globals__[name]
+            except KeyError:
+                return getattr(builtins, name, ir.UNDEFINED)
+        else:
+            try:
+                return self.py_func.__closure__[name].cell_contents
+            except ValueError:
+                return ir.UNDEFINED
+
+    def _untyped_ir_is_current(self):
+        return all(self._lookup_captured_value(key) is value
+                   for key, value in self._untyped_ir_values)
+
     def get_globals_for_reduction(self):
         return serialize._get_function_globals_for_reduction(self.py_func)
 
@@ -790,6 +884,12 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
                                         targetoptions, locals, pipeline_class)
         self._cache_hits = collections.Counter()
         self._cache_misses = collections.Counter()
+        self._cache_outcomes = {}
+        # With tiered compilation, the pending recompilations of overloads at
+        # full optimization, and the quickly compiled versions they replaced.
+        # These are kept alive as they may still be running in another thread.
+        self._reoptimizations = {}
+        self._tier1_overloads = []
 
         self._type = types.Dispatcher(self)
         self.typingctx.insert_global(self, self._type)
@@ -885,34 +985,129 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
                     return existing.entry_point
                 # Try to load from disk cache
                 cres = self._cache.load_overload(sig, self.targetctx)
-                if cres is not None:
-                    self._cache_hits[sig] += 1
-                    # XXX fold this in add_overload()? (also see compiler.py)
-                    if not cres.objectmode:
-                        self.targetctx.insert_user_function(cres.entry_point,
-                                                            cres.fndesc,
-                                                            [cres.library])
-                    self.add_overload(cres)
-                    return cres.entry_point
-
-                self._cache_misses[sig] += 1
                 ev_details = dict(
                     dispatcher=self,
                     args=args,
                     return_type=return_type,
                 )
+                if cres is not None:
+                    self._cache_hits[sig] += 1
+                    self._cache_outcomes[tuple(args)] = self._cache.explain(sig)
+                    with ev.trigger_event("numba:cache_load", data=ev_details):
+                        # XXX fold this in add_overload()? (also see
+                        # compiler.py)
+                        if not cres.objectmode:
+                            self.targetctx.insert_user_function(
+                                cres.entry_point, cres.fndesc, [cres.library])
+                        self.add_overload(cres)
+                    self._enable_lifted_caching(cres)
+                    return cres.entry_point
+
+                self._cache_misses[sig] += 1
+                opt_level = config.TIERED_OPT if self._is_tiered() else None
                 with ev.trigger_event("numba:compile", data=ev_details):
                     try:
-                        cres = self._compiler.compile(args, return_type)
+                        cres = self._compiler.compile(args, return_type,
+                                                      opt_level)
                     except errors.ForceLiteralArg as e:
                         def folded(args, kws):
                             return self._compiler.fold_argument_types(args,
                                                                       kws)[1]
                         raise e.bind_fold_arguments(folded)
                     self.add_overload(cres)
+                if opt_level is not None:
+                    # Only the fully optimized version is cached
+                    self._schedule_reoptimization(sig, return_type, cres)
+                    return cres.entry_point
                 self._cache.save_overload(sig, cres)
+                self._cache_outcomes[tuple(args)] = self._cache.explain(sig)
+                self._enable_lifted_caching(cres)
                 return cres.entry_point
 
+    def _is_tiered(self):
+        """
+        Whether new overloads are first compiled quickly, then recompiled at
+        full optimization in the background.
+        """
+        return (self.targetoptions.get('tiered', False) and
+                config.TIERED_OPT < config.OPT)
+
+    def _schedule_reoptimization(self, sig, return_type, tier1):
+        """
+        Schedule the recompilation of *tier1*, the quickly compiled version of
+        the overload for *sig*, at full optimization.
+        """
+        args = tuple(tier1.signature.args)
+        executor = _get_compile_executor()
+        self._reoptimizations[args] = executor.submit(
+            self._reoptimize, sig, return_type, tier1)
+
+    def _reoptimize(self, sig, return_type, tier1):
+        """
+        Recompile the overload *tier1* at full optimization and replace it.
+        Returns the new entry point, or None if the overload was discarded in
+        the meantime.
+        """
+        args = tuple(tier1.signature.args)
+        ev_details = dict(
+            dispatcher=self,
+            args=args,
+            return_type=return_type,
+        )
+        with ExitStack() as scope:
+            cres = None
+
+            def cb_compiler(dur):
+                if cres is not None:
+                    self._callback_add_compiler_timer(dur, cres)
+
+            def cb_llvm(dur):
+                if cres is not None:
+                    self._callback_add_llvm_timer(dur, cres)
+
+            scope.enter_context(ev.install_timer("numba:compiler_lock",
+                                                 cb_compiler))
+            scope.enter_context(ev.install_timer("numba:llvm_lock", cb_llvm))
+            scope.enter_context(global_compiler_lock)
+
+            if self.overloads.get(args) is not tier1:
+                # The overloads were reset, e.g. by recompile()
+                return None
+            with ev.trigger_event("numba:compile", data=ev_details):
+                cres = self._compiler.compile(args, return_type)
+                self._tier1_overloads.append(tier1)
+                self.overloads[args] = cres
+                self._replace(tier1.entry_point, cres.entry_point)
+                if not tier1.objectmode:
+                    self.targetctx.remove_user_function(tier1.entry_point)
+            self._cache.save_overload(sig, cres)
+            self._cache_outcomes[args] = self._cache.explain(sig)
+            self._enable_lifted_caching(cres)
+            return cres.entry_point
+
+    def wait_reoptimized(self, timeout=None):
+        """
+        With tiered compilation (``tiered=True``), wait until all the
+        overloads compiled so far have been replaced by their fully optimized
+        version.  Re-raises the error of a failed recompilation, if any.
+        """
+        futures = list(self._reoptimizations.values())
+        concurrent.futures.wait(futures, timeout=timeout)
+        for fut in futures:
+            if fut.done():
+                fut.result()
+
+    def _enable_lifted_caching(self, cres):
+        """
+        Let the loops lifted from this function use the disk cache, if the
+        function itself does.
+        """
+        if isinstance(self._cache, NullCache):
+            return
+        for lifted in cres.lifted:
+            if isinstance(lifted, LiftedLoop):
+                lifted.enable_caching()
+
     def get_compile_result(self, sig):
         """Compile (if needed) and return the compilation result with the
         given signature.
@@ -930,6 +1125,128 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
                 raise errors.TypingError(msg)
         return self.overloads[atypes]
 
+    def compile_async(self, sigs, executor=None):
+        """
+        Schedule the compilation of the given signatures on a background
+        thread and return immediately.
+
+        Returns a list of ``concurrent.futures.Future``, one per signature,
+        each resolving to the compiled entry point (or raising the
+        compilation error).  *executor* defaults to a process-wide thread
+        pool shared by all dispatchers.
+
+        Note that the compiler itself is serialised by the global compiler
+        lock, so with a thread pool this only moves compilation off the
+        calling thread.  If *executor* is a
+        ``concurrent.futures.ProcessPoolExecutor`` and the function is
+        cached and importable from its module, the signatures are compiled
+        concurrently by the worker processes, which save them to the disk
+        cache, and then loaded from the cache by this process.
+        """
+        if isinstance(sigs, (str, typing.Signature)):
+            sigs = [sigs]
+        if executor is None:
+            executor = _get_compile_executor()
+        # Initialise the extension entry points from the calling thread,
+        # before any compilation work is handed over to the executor.
+        self._compilation_chain_init_hook()
+        if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+            name = self._get_importable_name()
+            threads = _get_compile_executor()
+            if name is None or isinstance(self._cache, NullCache):
+                # The worker processes can't share the compiled code
+                return [threads.submit(self.compile, sig) for sig in sigs]
+            futures = []
+            for sig in sigs:
+                # Chain the compilation in this process onto the warming of
+                # the cache, without tying up a thread while it waits
+                future = concurrent.futures.Future()
+                warming = executor.submit(_warm_cache, *name, sig)
+                warming.add_done_callback(functools.partial(
+                    self._compile_warmed, sig, future))
+                futures.append(future)
+            return futures
+        return [executor.submit(self.compile, sig) for sig in sigs]
+
+    def _get_importable_name(self):
+        """
+        Return the (module name, qualified name) the function can be
+        imported with from another process, or None.
+        """
+        modname = self.py_func.__module__
+        qualname = self.py_func.__qualname__
+        if modname in (None, '__main__') or '<locals>' in qualname:
+            return None
+        return modname, qualname
+
+    def _compile_warmed(self, sig, future, warming):
+        """
+        Called when the *warming* future, compiling *sig* to the disk cache
+        in another process, is done: compile *sig* on the background
+        compilation threads, which loads it from the cache, and pass the
+        outcome on to *future*.
+        """
+        try:
+            exc = warming.exception()
+        except concurrent.futures.CancelledError as e:
+            exc = e
+        if exc is not None:
+            # Compile in this process instead, which raises the actual
+            # compilation error, if any
+            _logger.debug("warming the cache for %s%s failed: %r",
+                          self.py_func.__qualname__, sig, exc)
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            compiling = _get_compile_executor().submit(self.compile, sig)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        compiling.add_done_callback(
+            functools.partial(_chain_future, future))
+
+    def batch(self, arglist, max_workers=None):
+        """
+        Call the function on each tuple of positional arguments in
+        *arglist* and return the list of results, in the same order.
+
+        The calls are made by a native loop, without the interpreter
+        overhead of a Python loop, and the specialization for each distinct
+        signature is resolved once and reused for the following calls with
+        the same argument types.
+
+        If *max_workers* is given, *arglist* is split into that many chunks
+        which are called concurrently by a pool of threads.  This only
+        helps functions compiled with ``nogil=True``, as the GIL is held
+        otherwise.
+        """
+        if not isinstance(arglist, (list, tuple)):
+            arglist = list(arglist)
+        if max_workers is None or max_workers <= 1 or len(arglist) < 2:
+            return self._call_batch(arglist)
+        chunksize = -(-len(arglist) // max_workers)
+        chunks = [arglist[i:i + chunksize]
+                  for i in range(0, len(arglist), chunksize)]
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(chunks),
+                thread_name_prefix="numba-batch") as executor:
+            results = []
+            for res in executor.map(self._call_batch, chunks):
+                results.extend(res)
+        return results
+
+    def map(self, *iterables, max_workers=None):
+        """
+        Like the builtin ``map()``, call the function with arguments taken
+        from each of the *iterables* (stopping at the shortest) and return
+        the list of results.  See ``batch()`` for *max_workers*.
+        """
+        if len(iterables) == 1:
+            arglist = [(arg,) for arg in iterables[0]]
+        else:
+            arglist = list(zip(*iterables))
+        return self.batch(arglist, max_workers=max_workers)
+
     def recompile(self):
         """
         Recompile all signatures afresh.
@@ -948,6 +1265,39 @@ class Dispatcher(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
         finally:
             self._can_compile = old_can_compile
 
+    def inspect_cache(self, signature=None):
+        """Explain how the disk cache was used when compiling.
+
+        Parameters
+        ----------
+        signature : tuple of numba types, optional
+            Specify a signature for which to obtain the explanation. If None,
+            explanations are returned for all available signatures.
+
+        Returns
+        -------
+        explanation : dict[signature, str] or str
+            Either a description of whether the given signature was loaded
+            from or saved to the cache and, if it was not, the reason why,
+            or, if no signature was given, a dictionary mapping signatures
+            to such descriptions.  The loops lifted from the function are
+            described on separate lines.
+        """
+        if signature is not None:
+            cres = self.overloads[signature]
+            lines = [self._cache_outcomes.get(
+                signature, "the cache was not used for this signature")]
+            for lifted in cres.lifted:
+                if not isinstance(lifted, LiftedLoop):
+                    continue
+                for sig in lifted.signatures:
+                    lines.append("loop lifted at line %d, %s: %s"
+                                 % (lifted.get_source_location(), sig,
+                                    lifted._cache.explain(sig)))
+            return "\n".join(lines)
+
+        return dict((sig, self.inspect_cache(sig)) for sig in self.signatures)
+
     @property
     def stats(self):
         return _CompileStats(
@@ -1015,6 +1365,7 @@ class LiftedCode(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
         self.targetctx = targetctx
         self.flags = flags
         self.locals = locals
+        self._cache = NullCache()
 
         _DispatcherBase.__init__(self, self.func_ir.arg_count,
                                  self.func_ir.func_id.func,
@@ -1088,6 +1439,14 @@ class LiftedCode(serialize.ReduceMixin, _MemoMixin, _DispatcherBase):
 
 
 class LiftedLoop(LiftedCode):
+
+    can_cache = True
+
+    def enable_caching(self):
+        if isinstance(self._cache, NullCache):
+            self._cache = LiftedLoopCache(self.py_func,
+                                          self.get_source_location())
+
     def _pre_compile(self, args, return_type, flags):
         assert not flags.enable_looplift, "Enable looplift flags is on"
 
@@ -1120,6 +1479,16 @@ class LiftedLoop(LiftedCode):
                 if existing is not None:
                     return existing.entry_point
 
+                # Try to load from disk cache
+                cres = self._cache.load_overload(tuple(args), self.targetctx)
+                if cres is not None:
+                    if not cres.objectmode:
+                        self.targetctx.insert_user_function(cres.entry_point,
+                                                            cres.fndesc,
+                                                            [cres.library])
+                    self.add_overload(cres)
+                    return cres.entry_point
+
                 self._pre_compile(args, return_type, flags)
 
                 # copy the flags, use nopython first
@@ -1167,6 +1536,7 @@ class LiftedLoop(LiftedCode):
                     if (cres.typing_error is not None):
                         raise cres.typing_error
                     self.add_overload(cres)
+                self._cache.save_overload(tuple(args), cres)
                 return cres.entry_point
 
 
@@ -1323,6 +1693,91 @@ class ObjModeLiftedWith(LiftedWith):
         return super().compile(sig)
 
 
+_compile_executor = None
+_compile_executor_lock = threading.Lock()
+
+
+def _get_compile_executor():
+    """
+    Return the process-wide executor used for background compilation,
+    creating it on first use.
+    """
+    global _compile_executor
+    with _compile_executor_lock:
+        if _compile_executor is None:
+            _compile_executor = concurrent.futures.ThreadPoolExecutor(
+                thread_name_prefix="numba-compile")
+        return _compile_executor
+
+
+def _chain_future(future, done):
+    """
+    Pass the outcome of the *done* future on to *future*.
+    """
+    exc = done.exception()
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(done.result())
+
+
+def _warm_cache(modname, qualname, sig):
+    """
+    Compile the dispatcher *qualname* of the module *modname* for *sig*, in
+    a worker process, for the overload to be saved to the disk cache.
+    """
+    disp = importlib.import_module(modname)
+    for attr in qualname.split('.'):
+        disp = getattr(disp, attr)
+    disp.compile(sig)
+    if disp._is_tiered():
+        # Only the fully optimized version is cached
+        disp.wait_reoptimized()
+
+
+def precompile_all(funcs, max_workers=None, wait=True, processes=False):
+    """
+    Compile many dispatchers for the given signatures using a pool of
+    background threads.
+
+    *funcs* is either a mapping or an iterable of ``(dispatcher, sigs)``
+    pairs, where *sigs* is a signature or a list of signatures.  If
+    *max_workers* is given a dedicated thread pool of that size is used,
+    otherwise the process-wide compilation pool is.
+
+    If *processes* is true, a pool of *max_workers* worker processes
+    (defaulting to the number of CPUs) compiles the cached dispatchers
+    concurrently, see ``Dispatcher.compile_async``.
+
+    Returns the list of ``concurrent.futures.Future`` for all scheduled
+    compilations.  If *wait* is true, this blocks until all compilations
+    are finished and re-raises the first compilation error, if any.
+    """
+    if isinstance(funcs, collections.abc.Mapping):
+        funcs = funcs.items()
+    if processes:
+        # Spawn the workers, forking a process running threads is unsafe
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'))
+    elif max_workers is None:
+        executor = _get_compile_executor()
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="numba-compile")
+    try:
+        futures = []
+        for disp, sigs in funcs:
+            futures.extend(disp.compile_async(sigs, executor=executor))
+        if wait:
+            for fut in futures:
+                fut.result()
+    finally:
+        if processes or max_workers is not None:
+            executor.shutdown(wait=wait)
+    return futures
+
+
 # Initialize typeof machinery
 _dispatcher.typeof_init(
     OmittedArg,
@@ -12,6 +12,10 @@ The following events are built in:
   - ``"args"``: the argument types.
   - ``"return_type"``: the return type.
 
+- ``"numba:cache_load"`` is broadcast when a dispatcher installs an overload
+  loaded from the on-disk cache, instead of compiling it. Events of this
+  kind have the same ``data`` as ``"numba:compile"``.
+
 - ``"numba:compiler_lock"`` is broadcast when the internal compiler-lock is
   acquired. This is mostly used internally to measure time spent with the lock
   acquired.
@@ -28,6 +32,13 @@ The following events are built in:
     - ``"args"``: argument types.
     - ``"return_type"`` return type.
 
+- ``"numba:llvm_pass"`` is broadcast when a phase of the LLVM optimization or
+  code generation of a library is running.
+
+    - ``"name"``: phase name, followed by the library name in brackets.
+    - ``"pass_name"``: phase name.
+    - ``"library"``: name of the library.
+
 Applications can register callbacks that are listening for specific events using
 ``register(kind: str, listener: Listener)``, where ``listener`` is an instance
 of ``Listener`` that defines custom actions on occurrence of the specific event.
@@ -56,9 +67,11 @@ class EventStatus(enum.Enum):
 
 # Builtin event kinds.
 _builtin_kinds = frozenset([
+    "numba:cache_load",
     "numba:compiler_lock",
     "numba:compile",
     "numba:llvm_lock",
+    "numba:llvm_pass",
     "numba:run_pass",
 ])
 
@@ -166,7 +179,7 @@ class Event:
         -------
         res : bool
         """
-        return self._exc_details is None
+        return self._exc_details is not None
 
     def __str__(self):
         data = (f"{type(self.data).__qualname__}"
@@ -471,6 +484,7 @@ def _setup_chrome_trace_exit_handler():
     """
     listener = RecordingListener()
     register("numba:run_pass", listener)
+    register("numba:llvm_pass", listener)
     filename = config.CHROME_TRACE
 
     @atexit.register
@@ -4,6 +4,8 @@ import dis
 import operator
 import logging
 import textwrap
+import threading
+import weakref
 
 from numba.core import errors, ir, config
 from numba.core.errors import (
@@ -42,6 +44,33 @@ class _UNKNOWN_VALUE(object):
 _logger = logging.getLogger(__name__)
 
 
+# The data and control flow analyses of the bytecode only depend on the code
+# object, they are shared by all the functions created from it (e.g. the
+# closures returned by an @overload) and kept for as long as it lives.
+_flow_cache = weakref.WeakKeyDictionary()
+_flow_cache_lock = threading.Lock()
+
+
+def _analyze_flow(bytecode):
+    """
+    Return the (DFA, CFA) adaptors of the flow analysis of *bytecode*,
+    running the analysis only if the code object hasn't been seen before.
+    """
+    code = bytecode.func_id.code
+    with _flow_cache_lock:
+        analysis = _flow_cache.get(code)
+    if analysis is None:
+        flow = Flow(bytecode)
+        flow.run()
+        # The analysis is complete, don't keep the function (and so its
+        # code object, the key) alive from the cache
+        flow.detach()
+        analysis = AdaptDFA(flow), AdaptCFA(flow)
+        with _flow_cache_lock:
+            _flow_cache[code] = analysis
+    return analysis
+
+
 class Assigner(object):
     """
     This object keeps track of potential assignment simplifications
@@ -1372,10 +1401,7 @@ class Interpreter(object):
         global_scope = ir.Scope(parent=None, loc=self.loc)
         self.scopes.append(global_scope)
 
-        flow = Flow(bytecode)
-        flow.run()
-        self.dfa = AdaptDFA(flow)
-        self.cfa = AdaptCFA(flow)
+        self.dfa, self.cfa = _analyze_flow(bytecode)
         if config.DUMP_CFG:
             self.cfa.dump()
 
@@ -698,6 +698,9 @@ def is_const_call(module_name, func_name):
 
 alias_analysis_extensions = {}
 alias_func_extensions = {}
+# Methods returning a reference into the object they are called on, as
+# (type class, method name) pairs
+alias_method_extensions = set()
 
 def get_canonical_alias(v, alias_map):
     if v not in alias_map:
@@ -764,6 +767,10 @@ def find_potential_aliases(blocks, args, typemap, func_ir, alias_map=None,
                         _add_alias(lhs, expr.args[0].name, alias_map, arg_aliases)
                     if isinstance(fmod, ir.Var) and fname in np_alias_funcs:
                         _add_alias(lhs, fmod.name, alias_map, arg_aliases)
+                    if (isinstance(fmod, ir.Var) and typemap is not None and
+                            (type(typemap.get(fmod.name)), fname) in
+                            alias_method_extensions):
+                        _add_alias(lhs, fmod.name, alias_map, arg_aliases)
 
     # copy to avoid changing size during iteration
     old_alias_map = copy.deepcopy(alias_map)
@@ -203,3 +203,58 @@ def _split_mangled_ident(mangled):
     ctlen = len(str(ct))
     at = ctlen + ct
     return mangled[:at], mangled[at:]
+
+
+_re_length = re.compile(r'\d+')
+_re_escaped_char = re.compile(r'_([0-9a-f]{2})')
+
+
+def _unescape_string(text):
+    """
+    Undo ``_escape_string`` for the escaped ASCII characters, on a
+    best-effort basis as '_' itself isn't escaped.
+    """
+    def repl(m):
+        ch = chr(int(m.group(1), 16))
+        if ch.isprintable() and _re_invalid_char.match(ch):
+            return ch
+        return m.group(0)
+    return _re_escaped_char.sub(repl, text)
+
+
+def demangle_identifier(mangled):
+    """
+    Return the dotted name of the entity in a symbol produced by ``mangle``,
+    without its abi tags and argument types, e.g. "module.func".  A prefix
+    before the mangled name (such as "cfunc.") is kept.  Returns None if the
+    symbol isn't mangled this way.
+    """
+    start = mangled.find(PREFIX)
+    if start < 0:
+        return None
+    prefix, pos = mangled[:start], start + len(PREFIX)
+    nested = mangled.startswith('N', pos)
+    if nested:
+        pos += 1
+    parts = []
+    while pos < len(mangled):
+        if mangled[pos] == 'E' and nested:
+            break
+        is_abi_tag = mangled[pos] == 'B'
+        if is_abi_tag:
+            pos += 1
+        m = _re_length.match(mangled, pos)
+        if m is None:
+            return None
+        pos = m.end() + int(m.group(0))
+        if pos > len(mangled):
+            return None
+        if not is_abi_tag:
+            # Python identifiers don't start with a digit, so there is no
+            # _fix_lead_digit() to undo
+            parts.append(_unescape_string(mangled[m.end():pos]))
+        if not nested:
+            break
+    if not parts:
+        return None
+    return prefix + '.'.join(parts)
@@ -64,7 +64,10 @@ class BaseLower(object):
         # debuginfo def location
         self.defn_loc = self._compute_def_location()
 
-        directives_only = self.flags.dbg_directives_only
+        # The functions compiled internally for a function with line tables
+        # only must not add full debug info to its module
+        directives_only = (self.flags.dbg_directives_only or
+                           self.context.dbg_directives_only)
         self.debuginfo = dibuildercls(module=self.module,
                                       filepath=func_ir.loc.filename,
                                       cgctx=context,
@@ -90,6 +90,7 @@ class DefaultOptions:
     error_model = _mapping("error_model")
     inline = _mapping("inline")
     forceinline = _mapping("forceinline")
+    tiered = _mapping("tiered")
 
     _dbg_extend_lifetimes = _mapping("dbg_extend_lifetimes")
     _dbg_optnone = _mapping("dbg_optnone")
@@ -1493,8 +1493,11 @@ class PythonAPI(object):
 
         gendesc = self.context.get_generator_desc(typ)
 
-        # This is the PyCFunctionWithKeywords generated by PyCallWrapper
-        genfnty = ir.FunctionType(self.pyobj, [self.pyobj, self.pyobj, self.pyobj])
+        # This is the METH_FASTCALL | METH_KEYWORDS function generated by
+        # PyCallWrapper
+        genfnty = ir.FunctionType(self.pyobj, [self.pyobj,
+                                               self.pyobj.as_pointer(),
+                                               self.py_ssize_t, self.pyobj])
         genfn = self._get_function(genfnty, name=gendesc.llvm_cpython_wrapper_name)
 
         # This is the raw finalizer generated by _lower_generator_finalize_func()
@@ -17,6 +17,95 @@ memsys_use_cpython_allocator(PyObject *self, PyObject *args) {
     Py_RETURN_NONE;
 }
 
+/*
+ * An allocator giving fresh pages to the large blocks, for them to be placed
+ * on the NUMA node of the thread writing first to each page rather than to
+ * reuse memory freed by the allocating thread.  Each block starts with a
+ * header holding its size, which keeps the alignment of malloc().
+ */
+#define FIRST_TOUCH_HEADER 16
+#define FIRST_TOUCH_THRESHOLD (1 << 20)
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <sys/mman.h>
+#endif
+
+static void *
+first_touch_malloc(size_t size) {
+    char *base;
+    size_t total = size + FIRST_TOUCH_HEADER;
+    if (total < FIRST_TOUCH_THRESHOLD) {
+        base = PyMem_RawMalloc(total);
+    } else {
+#ifdef _WIN32
+        base = VirtualAlloc(NULL, total, MEM_COMMIT | MEM_RESERVE,
+                            PAGE_READWRITE);
+#else
+        base = mmap(NULL, total, PROT_READ | PROT_WRITE,
+                    MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+        if (base == MAP_FAILED)
+            base = NULL;
+#endif
+    }
+    if (base == NULL)
+        return NULL;
+    *(size_t *)base = size;
+    return base + FIRST_TOUCH_HEADER;
+}
+
+static void
+first_touch_free(void *ptr) {
+    char *base;
+    size_t total;
+    if (ptr == NULL)
+        return;
+    base = (char *)ptr - FIRST_TOUCH_HEADER;
+    total = *(size_t *)base + FIRST_TOUCH_HEADER;
+    if (total < FIRST_TOUCH_THRESHOLD) {
+        PyMem_RawFree(base);
+    } else {
+#ifdef _WIN32
+        VirtualFree(base, 0, MEM_RELEASE);
+#else
+        munmap(base, total);
+#endif
+    }
+}
+
+static void *
+first_touch_realloc(void *ptr, size_t size) {
+    char *base, *new_ptr;
+    size_t old_size;
+    if (ptr == NULL)
+        return first_touch_malloc(size);
+    base = (char *)ptr - FIRST_TOUCH_HEADER;
+    old_size = *(size_t *)base;
+    if (old_size + FIRST_TOUCH_HEADER < FIRST_TOUCH_THRESHOLD &&
+        size + FIRST_TOUCH_HEADER < FIRST_TOUCH_THRESHOLD) {
+        base = PyMem_RawRealloc(base, size + FIRST_TOUCH_HEADER);
+        if (base == NULL)
+            return NULL;
+        *(size_t *)base = size;
+        return base + FIRST_TOUCH_HEADER;
+    }
+    new_ptr = first_touch_malloc(size);
+    if (new_ptr == NULL)
+        return NULL;
+    memcpy(new_ptr, ptr, old_size < size ? old_size : size);
+    first_touch_free(ptr);
+    return new_ptr;
+}
+
+static PyObject *
+memsys_use_first_touch_allocator(PyObject *self, PyObject *args) {
+    NRT_MemSys_set_allocator(first_touch_malloc,
+                             first_touch_realloc,
+                             first_touch_free);
+    Py_RETURN_NONE;
+}
+
 static PyObject *
 memsys_get_stats_alloc(PyObject *self, PyObject *args) {
     if(!NRT_MemSys_stats_enabled()) {
@@ -126,6 +215,7 @@ static PyMethodDef ext_methods[] = {
 #define declmethod(func) { #func , ( PyCFunction )func , METH_VARARGS , NULL }
 #define declmethod_noargs(func) { #func , ( PyCFunction )func , METH_NOARGS, NULL }
     declmethod_noargs(memsys_use_cpython_allocator),
+    declmethod_noargs(memsys_use_first_touch_allocator),
     declmethod_noargs(memsys_shutdown),
     declmethod_noargs(memsys_get_stats_alloc),
     declmethod_noargs(memsys_get_stats_free),
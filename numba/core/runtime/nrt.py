@@ -121,7 +121,10 @@ def typeof_meminfo(val, c):
 
 
 # Create runtime
-_nrt.memsys_use_cpython_allocator()
+if config.PARALLEL_FIRST_TOUCH:
+    _nrt.memsys_use_first_touch_allocator()
+else:
+    _nrt.memsys_use_cpython_allocator()
 rtsys = _Runtime()
 
 # Install finalizer
@@ -439,7 +439,11 @@ class BaseNativeLowering(abc.ABC, LoweringPass):
     def run_pass(self, state):
         if state.library is None:
             codegen = state.targetctx.codegen()
-            state.library = codegen.create_library(state.func_id.func_qualname)
+            library_options = {}
+            if state.flags.opt_level is not None:
+                library_options['opt_level'] = state.flags.opt_level
+            state.library = codegen.create_library(state.func_id.func_qualname,
+                                                   **library_options)
             # Enable object caching upfront, so that the library can
             # be later serialized.
             state.library.enable_object_caching()
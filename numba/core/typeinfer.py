@@ -13,6 +13,7 @@ Constraints push types forward following the dataflow.
 """
 
 
+import heapq
 import logging
 import operator
 import contextlib
@@ -134,41 +135,109 @@ class TypeVar(object):
 
 class ConstraintNetwork(object):
     """
-    TODO: It is possible to optimize constraint propagation to consider only
-          dirty type variables.
+    The constraints of a function, executed with a worklist: the type
+    variables accessed by each constraint are recorded when it runs, and a
+    constraint is only executed again when one of them changes.
     """
 
     def __init__(self):
         self.constraints = []
+        # The outcome (error or None) of the last execution of each
+        # constraint
+        self._errors = []
+        # { type variable name: indices of the constraints accessing it }
+        self._dependents = defaultdict(set)
+        # Indices of the constraints which accessed all type variables
+        self._global_dependents = set()
 
     def append(self, constraint):
         self.constraints.append(constraint)
 
     def propagate(self, typeinfer):
         """
-        Execute all constraints.  Errors are caught and returned as a list.
-        This allows progressing even though some constraints may fail
-        due to lack of information
+        Execute the constraints until a fixed point is reached.  Errors are
+        caught and the ones raised by the last execution of each constraint
+        are returned as a list.  This allows progressing even though some
+        constraints may fail due to lack of information
         (e.g. imprecise types such as List(undefined)).
+
+        The constraints are executed in order, by rounds: the first round
+        executes all constraints (not executed yet), the following ones
+        only the constraints whose type variables were changed by a later
+        constraint of the previous round.  Constraints affected by an
+        earlier constraint of the same round are executed in that round,
+        and a constraint that succeeded is not executed again for its own
+        changes.
+        """
+        typevars = typeinfer.typevars
+        errors = self._errors
+        first = len(errors)
+        errors.extend([None] * (len(self.constraints) - first))
+        pending = list(range(first, len(self.constraints)))
+        while pending:
+            typeinfer.debug.propagate_started()
+            queued = set(pending)
+            next_round = set()
+            while pending:
+                index = heapq.heappop(pending)
+                queued.discard(index)
+                changed = self._execute(index, typeinfer, typevars)
+                if not changed:
+                    continue
+                affected = set(self._global_dependents)
+                for name in changed:
+                    affected.update(self._dependents[name])
+                # A constraint that succeeded already sees the changes it
+                # made itself
+                if self._errors[index] is None:
+                    affected.discard(index)
+                for other in affected:
+                    if other <= index:
+                        next_round.add(other)
+                    elif other not in queued:
+                        heapq.heappush(pending, other)
+                        queued.add(other)
+            typeinfer.debug.propagate_finished()
+            pending = sorted(next_round)
+
+        return [e for e in errors if e is not None]
+
+    def _execute(self, index, typeinfer, typevars):
+        """
+        Execute the constraint at *index*, record its outcome and the type
+        variables it accessed, and return the names of the type variables
+        whose type changed.
         """
-        errors = []
-        for constraint in self.constraints:
-            loc = constraint.loc
+        constraint = self.constraints[index]
+        loc = constraint.loc
+        error = None
+        saved = typevars.start_tracking()
+        try:
             with typeinfer.warnings.catch_warnings(filename=loc.filename,
                                                    lineno=loc.line):
                 try:
                     constraint(typeinfer)
                 except ForceLiteralArg as e:
-                    errors.append(e)
+                    error = e
                 except TypingError as e:
                     _logger.debug("captured error", exc_info=e)
                     new_exc = TypingError(
                         str(e), loc=constraint.loc,
                         highlighting=False,
                     )
-                    errors.append(utils.chain_exception(new_exc, e))
-
-        return errors
+                    error = utils.chain_exception(new_exc, e)
+        finally:
+            accessed, accessed_all = typevars.stop_tracking(saved)
+        self._errors[index] = error
+
+        for name in accessed:
+            self._dependents[name].add(index)
+        if accessed_all:
+            self._global_dependents.add(index)
+        else:
+            self._global_dependents.discard(index)
+        return [name for name, oldty in accessed.items()
+                if typevars.peek(name).type != oldty]
 
 
 class Propagate(object):
@@ -902,14 +971,62 @@ class PrintConstraint(object):
 
 
 class TypeVarMap(dict):
+    # The type variables accessed by the running constraint, mapped to their
+    # type at the time of the first access, and whether the whole map was
+    # iterated over (see ConstraintNetwork)
+    _accessed = None
+    _accessed_all = False
+
     def set_context(self, context):
         self.context = context
 
     def __getitem__(self, name):
         if name not in self:
             self[name] = TypeVar(self.context, name)
+        tv = super(TypeVarMap, self).__getitem__(name)
+        accessed = self._accessed
+        if accessed is not None and name not in accessed:
+            accessed[name] = tv.type
+        return tv
+
+    def peek(self, name):
+        """
+        Return the type variable *name* without recording the access.
+        """
         return super(TypeVarMap, self).__getitem__(name)
 
+    def start_tracking(self):
+        """
+        Start recording the accessed type variables.  Returns the state of
+        the enclosing tracking, to be passed to ``stop_tracking()``.
+        """
+        saved = self._accessed, self._accessed_all
+        self._accessed = {}
+        self._accessed_all = False
+        return saved
+
+    def stop_tracking(self, saved):
+        """
+        Stop recording and return a ``(accessed, accessed_all)`` tuple,
+        where *accessed* maps the names of the accessed type variables to
+        their type at the time of the first access.
+        """
+        result = self._accessed, self._accessed_all
+        self._accessed, self._accessed_all = saved
+        return result
+
+    def items(self):
+        self._accessed_all = True
+        return super(TypeVarMap, self).items()
+
+    def values(self):
+        self._accessed_all = True
+        return super(TypeVarMap, self).values()
+
+    def __iter__(self):
+        self._accessed_all = True
+        return super(TypeVarMap, self).__iter__()
+
     def __setitem__(self, name, value):
         assert isinstance(name, str)
         if name in self:
@@ -1062,19 +1179,11 @@ class TypeInferer(object):
         return cloned._unify_return_types(rettypes)
 
     def propagate(self, raise_errors=True):
-        newtoken = self.get_state_token()
-        oldtoken = None
         # Since the number of types are finite, the typesets will eventually
-        # stop growing.
-
-        while newtoken != oldtoken:
-            self.debug.propagate_started()
-            oldtoken = newtoken
-            # Errors can appear when the type set is incomplete; only
-            # raise them when there is no progress anymore.
-            errors = self.constraints.propagate(self)
-            newtoken = self.get_state_token()
-            self.debug.propagate_finished()
+        # stop growing.  Errors can appear when the type set is incomplete;
+        # only the ones remaining when there is no progress anymore are
+        # raised.
+        errors = self.constraints.propagate(self)
         if errors:
             if raise_errors:
                 force_lit_args = [e for e in errors
@@ -8,7 +8,7 @@ from shutil import get_terminal_size
 from .abstract import Callable, DTypeSpec, Dummy, Literal, Type, weakref
 from .common import Opaque
 from .misc import unliteral
-from numba.core import errors, utils, types, config
+from numba.core import errors, utils, types, config, targetconfig
 from numba.core.typeconv import Conversion
 
 _logger = logging.getLogger(__name__)
@@ -258,6 +258,9 @@ class BaseFunction(Callable):
             self.templates = (template,)
             self.typing_key = template.key
         self._impl_keys = {}
+        # The same, also keyed by the target options in effect when resolving
+        # the call, see get_impl_key().
+        self._impl_keys_by_flags = {}
         name = "%s(%s)" % (self.__class__.__name__, self.typing_key)
         self._depth = 0
         super(BaseFunction, self).__init__(name)
@@ -279,18 +282,60 @@ class BaseFunction(Callable):
         Get the implementation key (used by the target context) for the
         given signature.
         """
-        return self._impl_keys[sig.args]
+        # The implementation may depend on the target options (e.g. those of
+        # an @overload checking fastmath), which are in effect again when
+        # lowering the call.
+        flags = targetconfig.ConfigStack.top_or_none()
+        try:
+            return self._impl_keys_by_flags[sig.args, flags]
+        except KeyError:
+            return self._impl_keys[sig.args]
+
+    def _set_impl_key(self, temp, sig):
+        impl_key = temp.get_impl_key(sig)
+        self._impl_keys[sig.args] = impl_key
+        flags = targetconfig.ConfigStack.top_or_none()
+        self._impl_keys_by_flags[sig.args, flags] = impl_key
+
+    def _apply_template(self, temp, args, kws, uselit):
+        if uselit:
+            return temp.apply(args, kws)
+        else:
+            nolitargs = tuple([_unlit_non_poison(a) for a in args])
+            nolitkws = {k: _unlit_non_poison(v) for k, v in kws.items()}
+            return temp.apply(nolitargs, nolitkws)
 
     def get_call_type(self, context, args, kws):
 
         prefer_lit = [True, False]    # old behavior preferring literal
         prefer_not = [False, True]    # new behavior preferring non-literal
+
+        from numba.core.target_extension import get_local_target # circular
+        from numba.core.typing.templates import _resolved_templates
+        target_hw = get_local_target(context)
+
+        # Try the template that resolved the same call last time first, this
+        # avoids retrying all the templates that come before it in order.
+        resolved_key = (self, context, target_hw, tuple(args),
+                        tuple(kws.items()),
+                        targetconfig.ConfigStack.top_or_none())
+        resolved = _resolved_templates.get(resolved_key)
+        if resolved is not None:
+            temp_cls, uselit = resolved
+            temp = temp_cls(context)
+            try:
+                sig = self._apply_template(temp, args, kws, uselit)
+            except errors.NumbaError:
+                sig = None
+            if sig is not None:
+                self._set_impl_key(temp, sig)
+                return sig
+            _resolved_templates.discard(resolved_key)
+
         failures = _ResolutionFailures(context, self, args, kws,
                                        depth=self._depth)
 
         # get the order in which to try templates
-        from numba.core.target_extension import get_local_target # circular
-        target_hw = get_local_target(context)
         order = utils.order_by_target_specificity(target_hw, self.templates,
                                                   fnkey=self.key[0])
 
@@ -302,13 +347,7 @@ class BaseFunction(Callable):
             choice = prefer_lit if temp.prefer_literal else prefer_not
             for uselit in choice:
                 try:
-                    if uselit:
-                        sig = temp.apply(args, kws)
-                    else:
-                        nolitargs = tuple([_unlit_non_poison(a) for a in args])
-                        nolitkws = {k: _unlit_non_poison(v)
-                                    for k, v in kws.items()}
-                        sig = temp.apply(nolitargs, nolitkws)
+                    sig = self._apply_template(temp, args, kws, uselit)
                 except Exception as e:
                     if not isinstance(e, errors.NumbaError):
                         raise e
@@ -316,7 +355,9 @@ class BaseFunction(Callable):
                     failures.add_error(temp, False, e, uselit)
                 else:
                     if sig is not None:
-                        self._impl_keys[sig.args] = temp.get_impl_key(sig)
+                        self._set_impl_key(temp, sig)
+                        _resolved_templates.put(resolved_key,
+                                                (temp_cls, uselit))
                         self._depth -= 1
                         return sig
                     else:
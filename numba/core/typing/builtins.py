@@ -3,7 +3,7 @@ import itertools
 import numpy as np
 import operator
 
-from numba.core import types, errors
+from numba.core import types, errors, utils
 from numba import prange
 from numba.parfors.parfor import internal_prange
 
@@ -68,8 +68,6 @@ class Slice(ConcreteTemplate):
 
 
 @infer_global(range, typing_key=range)
-@infer_global(prange, typing_key=prange)
-@infer_global(internal_prange, typing_key=internal_prange)
 class Range(ConcreteTemplate):
     cases = [
         signature(types.range_state32_type, types.int32),
@@ -87,6 +85,34 @@ class Range(ConcreteTemplate):
     ]
 
 
+@infer_global(prange, typing_key=prange)
+@infer_global(internal_prange, typing_key=internal_prange)
+class PRange(Range):
+    """
+    prange() takes the arguments of range() and an optional constant
+    *schedule* for the parfor pass.
+    """
+
+    def apply(self, args, kws):
+        kwargs = dict(kws)
+        schedule = kwargs.pop('schedule', None)
+        if kwargs:
+            msg = "Unsupported keywords: {!r}"
+            raise errors.TypingError(msg.format([k for k in kwargs.keys()]))
+        sig = self._select(self.cases, args, {})
+        if sig is None or schedule is None:
+            return sig
+        if not isinstance(schedule, types.StringLiteral):
+            raise errors.TypingError('"schedule" must be a string literal')
+        names = {1: ('stop',), 2: ('start', 'stop'),
+                 3: ('start', 'stop', 'step')}[len(args)] + ('schedule',)
+        pysig = utils.pySignature(parameters=[
+            utils.pyParameter(name, utils.pyParameter.POSITIONAL_OR_KEYWORD)
+            for name in names])
+        return signature(sig.return_type, *sig.args,
+                         schedule).replace(pysig=pysig)
+
+
 @infer
 class GetIter(AbstractTemplate):
     key = "getiter"
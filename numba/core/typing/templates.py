@@ -7,7 +7,7 @@ import functools
 import sys
 import inspect
 import os.path
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 from collections.abc import Sequence
 from types import MethodType, FunctionType, MappingProxyType
 
@@ -516,6 +516,55 @@ class _EmptyImplementationEntry(InternalError):
         )
 
 
+class _ResolutionCache(object):
+    """
+    A bounded, process-wide mapping memoising the resolution of calls.  The
+    least recently used entries are evicted first.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        try:
+            sig = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return sig
+
+    def put(self, key, sig):
+        self._entries[key] = sig
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# The signatures resolved by overload templates.  Keys are ``(template,
+# typing context, argument types, keyword argument types, target flags)``;
+# literal values are part of the argument types.
+_resolution_cache = _ResolutionCache(maxsize=4096)
+
+# The template, and literal preference, that accepted a call of a function
+# type, see BaseFunction.get_call_type().  Keys are ``(function type, typing
+# context, target, argument types, keyword argument types, target flags)``.
+_resolved_templates = _ResolutionCache(maxsize=4096)
+
+
 class _OverloadFunctionTemplate(AbstractTemplate):
     """
     A base class of templates for overload functions.
@@ -621,6 +670,27 @@ class _OverloadFunctionTemplate(AbstractTemplate):
         disp, new_args = self._get_impl(args, kws)
         if disp is None:
             return
+        # The same overload is typically resolved for identical argument types
+        # from many call sites and functions, reuse the signature if the
+        # implementation itself is cached (otherwise a new dispatcher is built
+        # for every resolution) and still has the compiled (or inlinable)
+        # overload for it.
+        impl_key = (self.context, tuple(args), tuple(kws.items()),
+                    targetconfig.ConfigStack.top_or_none())
+        cache_key = (type(self),) + impl_key
+        impl_cached = self._impl_cache.get(impl_key, (None,))[0] is disp
+        sig = _resolution_cache.get(cache_key) if impl_cached else None
+        if sig is not None:
+            if self._inline.is_never_inline:
+                cres = disp.overloads.get(sig.args)
+                if cres is not None:
+                    # Another implementation may have been registered for the
+                    # same argument types in the meantime.
+                    self._compiled_overloads[sig.args] = cres.entry_point
+                    return sig
+            elif (self._inline.is_always_inline and
+                    sig.args in self._inline_overloads):
+                return sig
         # Compile and type it for the given types
         disp_type = types.Dispatcher(disp)
         # Store the compiled overload for use in the lowering phase if there's
@@ -700,6 +770,8 @@ class _OverloadFunctionTemplate(AbstractTemplate):
             if sig is None: # can't resolve for this target
                 return None
             self._compiled_overloads[sig.args] = disp_type.get_overload(sig)
+        if impl_cached:
+            _resolution_cache.put(cache_key, sig)
         return sig
 
     def _get_impl(self, args, kws):
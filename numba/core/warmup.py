@@ -0,0 +1,261 @@
+"""
+Warmup manifests: a record of the functions and signatures compiled by a
+process, which can be compiled (or loaded from the cache) eagerly and in
+parallel by another process, e.g. at the start of a service, so that the
+first calls of each signature don't pay the compilation latency.
+"""
+
+import atexit
+import importlib
+import os
+import pickle
+import tempfile
+import threading
+import warnings
+import weakref
+from contextlib import contextmanager, ExitStack
+
+from numba.core import config
+from numba.core.dispatcher import Dispatcher, precompile_all
+from numba.core.errors import NumbaWarning
+import numba.core.event as ev
+
+
+# Bump when the layout of the manifest changes
+_MANIFEST_VERSION = 1
+
+# The events telling that a dispatcher got a new overload
+_event_kinds = ("numba:compile", "numba:cache_load")
+
+
+def _get_function_key(dispatcher):
+    """
+    Return the ``(module name, qualified name)`` identifying the function
+    of *dispatcher*, or None if it cannot be looked up by name.
+    """
+    py_func = dispatcher.py_func
+    modname = getattr(py_func, '__module__', None)
+    qualname = getattr(py_func, '__qualname__', None)
+    if modname is None or qualname is None or '<locals>' in qualname:
+        return None
+    return modname, qualname
+
+
+def _resolve_function(modname, qualname):
+    """
+    Import the module *modname* and return the object named *qualname* in
+    it, or None if it cannot be found.
+    """
+    try:
+        obj = importlib.import_module(modname)
+        for attr in qualname.split('.'):
+            obj = getattr(obj, attr)
+    except (ImportError, AttributeError):
+        return None
+    return obj
+
+
+def read_manifest(path):
+    """
+    Read the warmup manifest at *path* and return its entries as a list of
+    ``(module name, qualified name, target options, signatures)`` tuples,
+    where *signatures* is a list of argument types tuples.
+    """
+    with open(path, "rb") as f:
+        manifest = pickle.load(f)
+    if manifest.get('version') != _MANIFEST_VERSION:
+        raise ValueError("unsupported warmup manifest version %r in %r"
+                         % (manifest.get('version'), path))
+    entries = []
+    for modname, qualname, targetoptions, sigs in manifest['entries']:
+        loaded = []
+        for payload in sigs:
+            try:
+                loaded.append(pickle.loads(payload))
+            except Exception:
+                # e.g. a type defined in a module that is gone
+                continue
+        entries.append((modname, qualname, targetoptions, loaded))
+    return entries
+
+
+def write_manifest(path, entries):
+    """
+    Write the warmup manifest *entries*, as returned by ``read_manifest()``,
+    to *path*.  The file is replaced atomically.
+    """
+    out = []
+    for modname, qualname, targetoptions, sigs in entries:
+        payloads = []
+        for sig in sigs:
+            try:
+                payloads.append(pickle.dumps(sig, protocol=-1))
+            except Exception:
+                # Some types (e.g. of first-class functions defined in a
+                # closure) are not picklable; skip them.
+                continue
+        if payloads:
+            out.append((modname, qualname, dict(targetoptions), payloads))
+    manifest = dict(version=_MANIFEST_VERSION, entries=out)
+    dirname = os.path.dirname(os.path.abspath(path))
+    fd, tmpname = tempfile.mkstemp(dir=dirname, prefix='.warmup-',
+                                   suffix='.tmp')
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(manifest, f, protocol=-1)
+        os.replace(tmpname, path)
+    except BaseException:
+        try:
+            os.unlink(tmpname)
+        except OSError:
+            pass
+        raise
+
+
+class WarmupRecorder(ev.Listener):
+    """
+    A listener recording the dispatchers that compile, or load from the
+    cache, new overloads.  Use ``install()`` to start listening and
+    ``entries()`` or ``save()`` to obtain the manifest of their signatures.
+
+    Dispatchers whose function cannot be imported by name (e.g. defined
+    inside another function) are not recorded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dispatchers = weakref.WeakSet()
+
+    def on_start(self, event):
+        pass
+
+    def on_end(self, event):
+        if event.is_failed:
+            return
+        self.add(event.data['dispatcher'])
+
+    def add(self, dispatcher):
+        """
+        Record *dispatcher* explicitly, along with all its signatures.
+        """
+        # Lifted code and other internal dispatchers are compiled along
+        # with the function they belong to.
+        if isinstance(dispatcher, Dispatcher):
+            with self._lock:
+                self._dispatchers.add(dispatcher)
+
+    @contextmanager
+    def install(self):
+        """
+        A context manager recording the dispatchers getting new overloads
+        while it is active.
+        """
+        with ExitStack() as scope:
+            for kind in _event_kinds:
+                scope.enter_context(ev.install_listener(kind, self))
+            yield self
+
+    def entries(self):
+        """
+        Return the manifest entries of the recorded dispatchers, in the same
+        form as ``read_manifest()``.
+        """
+        with self._lock:
+            dispatchers = list(self._dispatchers)
+        entries = []
+        for disp in dispatchers:
+            key = _get_function_key(disp)
+            sigs = disp.signatures
+            if key is None or not sigs:
+                continue
+            entries.append(key + (dict(disp.targetoptions), list(sigs)))
+        entries.sort(key=lambda entry: entry[:2])
+        return entries
+
+    def save(self, path):
+        """
+        Save the manifest of the recorded dispatchers to *path*.  If a
+        manifest already exists there, the entries are merged so that a
+        manifest can accumulate the signatures seen by several runs.
+        """
+        merged = {}
+        if os.path.exists(path):
+            try:
+                existing = read_manifest(path)
+            except Exception:
+                existing = []
+            for modname, qualname, targetoptions, sigs in existing:
+                merged[modname, qualname] = (targetoptions, list(sigs))
+        for modname, qualname, targetoptions, sigs in self.entries():
+            old_options, old_sigs = merged.get((modname, qualname),
+                                               (None, []))
+            if old_options != targetoptions:
+                # The function was changed, forget its former signatures
+                old_sigs = []
+            for sig in sigs:
+                if sig not in old_sigs:
+                    old_sigs.append(sig)
+            merged[modname, qualname] = (targetoptions, old_sigs)
+        write_manifest(path, [k + v for k, v in merged.items()])
+
+
+@contextmanager
+def record_warmup_manifest(path):
+    """
+    A context manager recording the functions compiled or loaded from the
+    cache while it is active, and saving their signatures in the warmup
+    manifest at *path* when it exits.
+    """
+    recorder = WarmupRecorder()
+    with recorder.install():
+        yield recorder
+    recorder.save(path)
+
+
+def load_warmup_manifest(path, max_workers=None, wait=True):
+    """
+    Compile, or load from the cache, all the signatures listed in the
+    warmup manifest at *path*, in parallel.  *max_workers* and *wait* have
+    the same meaning as for ``numba.precompile_all()``, whose result is
+    returned.
+
+    Functions that cannot be found anymore, or whose target options have
+    changed, are skipped with a warning.
+    """
+    funcs = {}
+    for modname, qualname, targetoptions, sigs in read_manifest(path):
+        disp = _resolve_function(modname, qualname)
+        name = "%s.%s" % (modname, qualname)
+        if not isinstance(disp, Dispatcher):
+            msg = ("Skipping %r from warmup manifest %r: not found or not a "
+                   "jitted function" % (name, path))
+            warnings.warn(msg, NumbaWarning)
+            continue
+        if dict(disp.targetoptions) != targetoptions:
+            msg = ("Skipping %r from warmup manifest %r: its options have "
+                   "changed" % (name, path))
+            warnings.warn(msg, NumbaWarning)
+            continue
+        sigs = [sig for sig in sigs if sig not in disp.overloads]
+        if sigs:
+            funcs[disp] = sigs
+    return precompile_all(funcs, max_workers=max_workers, wait=wait)
+
+
+def _setup_warmup_exit_handler():
+    """
+    Record all the dispatchers of the process and write their manifest to
+    the file given by ``NUMBA_WARMUP_RECORD`` at exit.
+    """
+    recorder = WarmupRecorder()
+    for kind in _event_kinds:
+        ev.register(kind, recorder)
+    filename = config.WARMUP_RECORD
+
+    @atexit.register
+    def _write_warmup_manifest():
+        recorder.save(filename)
+
+
+if config.WARMUP_RECORD:
+    _setup_warmup_exit_handler()
@@ -26,11 +26,13 @@ def make_range_impl(int_type, range_state_type, range_iter_type):
     @lower_builtin(range, int_type)
     @lower_builtin(prange, int_type)
     @lower_builtin(internal_prange, int_type)
+    @lower_builtin(prange, int_type, types.StringLiteral)
+    @lower_builtin(internal_prange, int_type, types.StringLiteral)
     def range1_impl(context, builder, sig, args):
         """
         range(stop: int) -> range object
         """
-        [stop] = args
+        stop = args[0]
         state = RangeState(context, builder)
         state.start = context.get_constant(int_type, 0)
         state.stop = stop
@@ -43,11 +45,13 @@ def make_range_impl(int_type, range_state_type, range_iter_type):
     @lower_builtin(range, int_type, int_type)
     @lower_builtin(prange, int_type, int_type)
     @lower_builtin(internal_prange, int_type, int_type)
+    @lower_builtin(prange, int_type, int_type, types.StringLiteral)
+    @lower_builtin(internal_prange, int_type, int_type, types.StringLiteral)
     def range2_impl(context, builder, sig, args):
         """
         range(start: int, stop: int) -> range object
         """
-        start, stop = args
+        start, stop = args[:2]
         state = RangeState(context, builder)
         state.start = start
         state.stop = stop
@@ -60,11 +64,14 @@ def make_range_impl(int_type, range_state_type, range_iter_type):
     @lower_builtin(range, int_type, int_type, int_type)
     @lower_builtin(prange, int_type, int_type, int_type)
     @lower_builtin(internal_prange, int_type, int_type, int_type)
+    @lower_builtin(prange, int_type, int_type, int_type, types.StringLiteral)
+    @lower_builtin(internal_prange, int_type, int_type, int_type,
+                   types.StringLiteral)
     def range3_impl(context, builder, sig, args):
         """
         range(start: int, stop: int, step: int) -> range object
         """
-        [start, stop, step] = args
+        start, stop, step = args[:3]
         state = RangeState(context, builder)
         state.start = start
         state.stop = stop
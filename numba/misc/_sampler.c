@@ -0,0 +1,186 @@
+/*
+ * A sampling profiler recording the program counter of the threads running
+ * when the process has used a given amount of CPU time, using SIGPROF.
+ * The samples are attributed to the source lines of the JIT compiled code
+ * by numba.misc.sampling.
+ */
+
+#include "../_pymodule.h"
+
+#if defined(__linux__) && (defined(__x86_64__) || defined(__aarch64__))
+#define SAMPLER_SUPPORTED 1
+#endif
+
+#ifdef SAMPLER_SUPPORTED
+
+#include <signal.h>
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/time.h>
+#include <ucontext.h>
+
+/* The sample buffer, never freed as a signal may still be delivered just
+   after stopping: it is only replaced by a larger one, the smaller one being
+   leaked.  The buffer is published before the number of samples recorded in
+   it, the handler loads them in the opposite order. */
+static uintptr_t *samples = NULL;
+static size_t capacity = 0;
+/* The number of samples recorded in the buffer, at most its capacity */
+static size_t limit = 0;
+/* The number of samples taken, including those not fitting in the buffer */
+static size_t count = 0;
+static int active = 0;
+static int running = 0;
+static struct sigaction old_action;
+
+static void
+handler(int sig, siginfo_t *info, void *context)
+{
+    ucontext_t *uc = (ucontext_t *) context;
+    uintptr_t pc;
+    size_t i, n;
+
+    if (!__atomic_load_n(&active, __ATOMIC_ACQUIRE))
+        return;
+#if defined(__x86_64__)
+    pc = (uintptr_t) uc->uc_mcontext.gregs[REG_RIP];
+#else
+    pc = (uintptr_t) uc->uc_mcontext.pc;
+#endif
+    i = __atomic_fetch_add(&count, 1, __ATOMIC_RELAXED);
+    n = __atomic_load_n(&limit, __ATOMIC_ACQUIRE);
+    if (i < n)
+        __atomic_load_n(&samples, __ATOMIC_RELAXED)[i] = pc;
+}
+
+static PyObject *
+sampler_start(PyObject *self, PyObject *args)
+{
+    long interval;
+    Py_ssize_t max_samples;
+    struct sigaction action;
+    struct itimerval timer;
+
+    if (!PyArg_ParseTuple(args, "ln", &interval, &max_samples))
+        return NULL;
+    if (interval <= 0 || max_samples <= 0) {
+        PyErr_SetString(PyExc_ValueError,
+                        "interval and max_samples must be positive");
+        return NULL;
+    }
+    if (running) {
+        PyErr_SetString(PyExc_RuntimeError, "the sampler is already running");
+        return NULL;
+    }
+    if ((size_t) max_samples > capacity) {
+        uintptr_t *buffer = malloc(max_samples * sizeof(uintptr_t));
+        if (buffer == NULL)
+            return PyErr_NoMemory();
+        __atomic_store_n(&samples, buffer, __ATOMIC_RELAXED);
+        capacity = max_samples;
+    }
+    __atomic_store_n(&limit, (size_t) max_samples, __ATOMIC_RELEASE);
+    __atomic_store_n(&count, 0, __ATOMIC_RELAXED);
+
+    memset(&action, 0, sizeof(action));
+    action.sa_sigaction = handler;
+    action.sa_flags = SA_SIGINFO | SA_RESTART;
+    sigemptyset(&action.sa_mask);
+    if (sigaction(SIGPROF, &action, &old_action) != 0)
+        return PyErr_SetFromErrno(PyExc_OSError);
+    __atomic_store_n(&active, 1, __ATOMIC_RELEASE);
+
+    timer.it_interval.tv_sec = interval / 1000000;
+    timer.it_interval.tv_usec = interval % 1000000;
+    timer.it_value = timer.it_interval;
+    if (setitimer(ITIMER_PROF, &timer, NULL) != 0) {
+        __atomic_store_n(&active, 0, __ATOMIC_RELEASE);
+        sigaction(SIGPROF, &old_action, NULL);
+        return PyErr_SetFromErrno(PyExc_OSError);
+    }
+    running = 1;
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+sampler_stop(PyObject *self, PyObject *args)
+{
+    struct itimerval timer;
+    PyObject *pcs;
+    size_t i, n, total;
+
+    if (!running) {
+        PyErr_SetString(PyExc_RuntimeError, "the sampler is not running");
+        return NULL;
+    }
+    memset(&timer, 0, sizeof(timer));
+    setitimer(ITIMER_PROF, &timer, NULL);
+    __atomic_store_n(&active, 0, __ATOMIC_RELEASE);
+    /* A pending SIGPROF would terminate the process with the default
+       action, ignore it instead. */
+    if (old_action.sa_handler == SIG_DFL && !(old_action.sa_flags & SA_SIGINFO))
+        old_action.sa_handler = SIG_IGN;
+    sigaction(SIGPROF, &old_action, NULL);
+    running = 0;
+
+    total = __atomic_load_n(&count, __ATOMIC_RELAXED);
+    n = total < limit ? total : limit;
+    pcs = PyList_New(n);
+    if (pcs == NULL)
+        return NULL;
+    for (i = 0; i < n; i++) {
+        PyObject *pc = PyLong_FromSize_t(samples[i]);
+        if (pc == NULL) {
+            Py_DECREF(pcs);
+            return NULL;
+        }
+        PyList_SET_ITEM(pcs, i, pc);
+    }
+    return Py_BuildValue("Nn", pcs, (Py_ssize_t) total);
+}
+
+#else
+
+static PyObject *
+sampler_start(PyObject *self, PyObject *args)
+{
+    PyErr_SetString(PyExc_NotImplementedError,
+                    "the sampling profiler is only supported on Linux "
+                    "x86-64 and AArch64");
+    return NULL;
+}
+
+static PyObject *
+sampler_stop(PyObject *self, PyObject *args)
+{
+    PyErr_SetString(PyExc_RuntimeError, "the sampler is not running");
+    return NULL;
+}
+
+#endif
+
+static PyMethodDef sampler_methods[] = {
+    {"start", sampler_start, METH_VARARGS,
+     "start(interval, max_samples): sample the program counter every "
+     "*interval* microseconds of CPU time"},
+    {"stop", sampler_stop, METH_NOARGS,
+     "stop() -> (samples, total): stop sampling and return the list of "
+     "sampled program counters, and the number of samples taken"},
+    {NULL, NULL, 0, NULL}
+};
+
+MOD_INIT(_sampler)
+{
+    PyObject *m;
+    MOD_DEF(m, "_sampler", "No docs", sampler_methods)
+    if (m == NULL)
+        return MOD_ERROR_VAL;
+#ifdef SAMPLER_SUPPORTED
+    if (PyModule_AddIntConstant(m, "supported", 1))
+#else
+    if (PyModule_AddIntConstant(m, "supported", 0))
+#endif
+        return MOD_ERROR_VAL;
+    return MOD_SUCCESS_VAL(m);
+}
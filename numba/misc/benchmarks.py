@@ -0,0 +1,183 @@
+"""
+Benchmarks of Numba itself, e.g. of the overhead of calling jitted functions
+or of the time spent compiling them.  Each benchmark returns a dictionary of
+times in seconds.  Run them with::
+
+    $ python -m numba.misc.benchmarks [name ...]
+"""
+
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from numba import njit, prange
+from numba.core import utils
+
+
+def call_overhead(maxsec=1):
+    """
+    Measure the overhead of calling a trivial jitted function, from
+    Python, with arguments of various types.  Returns a dictionary of the
+    best time per call for each kind of argument.
+    """
+    from numba.typed import Dict, List
+
+    @njit
+    def ident(*args):
+        return None
+
+    lst = List([1, 2, 3])
+    dct = Dict()
+    dct[1] = 2.5
+    cases = {
+        'int': (1,),
+        'float': (1.5,),
+        '3 scalars': (1, 1.5, True),
+        'numpy scalar': (np.float32(1.5),),
+        '1d array': (np.zeros(10),),
+        '2d array': (np.zeros((10, 10)),),
+        'tuple': ((1, 1.5),),
+        'nested tuple': (((1, 2), (3, 4)),),
+        'typed list': (lst,),
+        'typed dict': (dct,),
+    }
+    results = {}
+    for name, args in cases.items():
+        ident(*args)
+        results[name] = utils.benchmark(lambda: ident(*args), maxsec).best
+    return results
+
+
+def _make_large_function(nstmts):
+    """
+    Make a function of about *nstmts* statements, mixing straight-line
+    arithmetic and small loops.
+    """
+    lines = ["def large_function(a, x):",
+             "    acc = 0",
+             "    v0 = x"]
+    for i in range(1, nstmts):
+        lines.append("    v%d = v%d * 1.5 + a[%d %% a.size]" % (i, i - 1, i))
+        if i % 10 == 0:
+            lines.append("    for j in range(3):")
+            lines.append("        acc += v%d + j" % i)
+    lines.append("    return acc + v%d" % (nstmts - 1))
+    ns = {}
+    exec("\n".join(lines), ns)
+    return ns['large_function']
+
+
+def type_inference(sizes=(200, 500, 1000)):
+    """
+    Measure the time spent typing functions of various sizes, in number of
+    statements, without lowering them.  Returns a dictionary of the time
+    for each size.
+    """
+    from numba.core import compiler, typed_passes, types
+    from numba.core.compiler_lock import global_compiler_lock
+    from numba.core.registry import cpu_target
+
+    typingctx = cpu_target.typing_context
+    targetctx = cpu_target.target_context
+    typingctx.refresh()
+    targetctx.refresh()
+    args = (types.float64[::1], types.float64)
+    results = {}
+    for size in sizes:
+        func_ir = compiler.run_frontend(_make_large_function(size))
+        with global_compiler_lock:
+            start = time.perf_counter()
+            typed_passes.type_inference_stage(typingctx, targetctx, func_ir,
+                                              args, None)
+            results['%d statements' % size] = time.perf_counter() - start
+    return results
+
+
+def import_time(repeat=5):
+    """
+    Measure the time taken by ``import numba``, and then by compiling and
+    calling a trivial function (which loads the typing and lowering
+    registries), in fresh interpreters.  Returns a dictionary of the best
+    time of each step over *repeat* runs.
+    """
+    code = """if 1:
+        import time
+        start = time.perf_counter()
+        import numba
+        imported = time.perf_counter()
+
+        @numba.njit
+        def foo(x):
+            return x + 1
+
+        foo(1)
+        print(imported - start, time.perf_counter() - imported)
+        """
+    results = {'import': float('inf'), 'first compile': float('inf')}
+    for _ in range(repeat):
+        out = subprocess.check_output([sys.executable, '-c', code])
+        import_secs, compile_secs = map(float, out.split())
+        results['import'] = min(results['import'], import_secs)
+        results['first compile'] = min(results['first compile'],
+                                       compile_secs)
+    return results
+
+
+def _ragged_sum(a):
+    # The cost of iteration i grows with i, leaving the threads given the
+    # last iterations by a static schedule with most of the work
+    total = 0.
+    for i in prange(a.size):
+        x = 0.
+        for j in range(i):
+            x += a[j] * a[i - j]
+        total += x
+    return total
+
+
+def load_imbalance(n=20000, repeat=3):
+    """
+    Measure the time of a parallel loop over *n* iterations of increasing
+    cost with each schedule.  Returns a dictionary of the best time for each
+    schedule.
+    """
+    a = np.random.ranf(n)
+    results = {}
+    for schedule in ("static", "dynamic", "guided"):
+        cfunc = njit(parallel={"schedule": schedule})(_ragged_sum)
+        cfunc(a[:10])
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cfunc(a)
+            best = min(best, time.perf_counter() - start)
+        results[schedule] = best
+    return results
+
+
+_benchmarks = {
+    'call_overhead': call_overhead,
+    'type_inference': type_inference,
+    'import_time': import_time,
+    'load_imbalance': load_imbalance,
+}
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    names = argv or list(_benchmarks)
+    unknown = [name for name in names if name not in _benchmarks]
+    if unknown:
+        sys.exit("Unknown benchmarks: %s (available: %s)"
+                 % (", ".join(unknown), ", ".join(_benchmarks)))
+    for name in names:
+        print("%s:" % (name,))
+        for case, elapsed in _benchmarks[name]().items():
+            print("    %-20s %.3g s" % (case, elapsed))
+
+
+if __name__ == '__main__':
+    main()
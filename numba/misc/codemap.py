@@ -0,0 +1,121 @@
+"""
+A map of the machine code of the functions loaded by the JIT engine, with
+their source line tables, to attribute native addresses to Python source
+lines.  It is enabled by :envvar:`NUMBA_SAMPLING_PROFILER`, and only knows of
+the functions compiled, or loaded from the cache, after that.
+"""
+
+import bisect
+import threading
+from collections import namedtuple
+
+from numba.core import config
+from numba.misc import linetable
+
+
+# A function loaded by the JIT engine: its symbol name, address and size in
+# bytes, the sorted (offset, filename, line) rows of its line table (see
+# ``numba.misc.linetable``) and the name of its code library.
+JITFunction = namedtuple("JITFunction",
+                         ["name", "address", "size", "lines", "library"])
+
+
+class CodeMap(object):
+    """
+    The JIT compiled functions, sorted by address.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._addresses = []
+        self._functions = []
+        self._listeners = []
+
+    def add_object(self, library, object_code, get_address):
+        """
+        Add the functions defined by the *object_code* of code *library*,
+        once loaded.  *get_address* returns the address of a symbol, or 0 if
+        it isn't defined.  Returns the list of the added ``JITFunction``.
+        """
+        try:
+            symbols = linetable.read_functions(object_code)
+        except NotImplementedError:
+            # Not an ELF object
+            return []
+        added = []
+        with self._lock:
+            for sym in symbols:
+                address = get_address(sym.name)
+                if not address:
+                    continue
+                i = bisect.bisect_left(self._addresses, address)
+                if i < len(self._addresses) and self._addresses[i] == address:
+                    # e.g. a weak symbol defined by an earlier library
+                    continue
+                func = JITFunction(sym.name, address, sym.size, sym.lines,
+                                   library.name)
+                self._addresses.insert(i, address)
+                self._functions.insert(i, func)
+                added.append(func)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(added)
+        return added
+
+    def add_listener(self, listener):
+        """
+        Call ``listener(functions)`` with the list of the ``JITFunction``
+        added by each code library from now on.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def functions(self):
+        """
+        Return the list of all the ``JITFunction``, sorted by address.
+        """
+        with self._lock:
+            return list(self._functions)
+
+    def lookup(self, address):
+        """
+        Return the ``JITFunction`` containing the code at *address*, and the
+        (filename, line) of the code, or None if it has no line info.
+        Returns (None, None) if *address* isn't in a known function.
+        """
+        with self._lock:
+            i = bisect.bisect_right(self._addresses, address) - 1
+            if i < 0:
+                return None, None
+            func = self._functions[i]
+        offset = address - func.address
+        if offset >= func.size:
+            return None, None
+        return func, linetable.find_line(func.lines, offset)
+
+
+_code_map = None
+_code_map_lock = threading.Lock()
+
+
+def enable():
+    """
+    Start recording the functions loaded by the JIT engine, if not already
+    done, and return the ``CodeMap``.
+    """
+    global _code_map
+    with _code_map_lock:
+        if _code_map is None:
+            _code_map = CodeMap()
+        return _code_map
+
+
+def get_code_map():
+    """
+    Return the ``CodeMap``, or None if it isn't enabled.
+    """
+    return _code_map
+
+
+if config.SAMPLING_PROFILER:
+    enable()
@@ -0,0 +1,406 @@
+"""
+Read the function symbols and the DWARF line table of the object code that
+the JIT engine loads, to map the machine code of a function back to the
+Python source lines it was compiled from.
+
+Only little-endian 64-bit ELF relocatable objects are supported (i.e. Linux
+on x86-64 and AArch64), with line tables of DWARF versions 2 to 5.
+"""
+
+import bisect
+import struct
+from collections import namedtuple
+
+
+# The function symbols of an object, with the offset of each row of the line
+# table from the start of the function, as sorted lists of
+# (offset, filename, line).  A line of 0 means that the code has no source
+# location.
+FunctionLines = namedtuple("FunctionLines", ["name", "size", "lines"])
+
+
+_ELF_MAGIC = b"\x7fELF"
+_ELFCLASS64 = 2
+_ELFDATA2LSB = 1
+
+_SHT_SYMTAB = 2
+_SHT_RELA = 4
+
+_SHN_UNDEF = 0
+_STT_FUNC = 2
+_STB_LOCAL = 0
+
+_section_header = struct.Struct("<IIQQQQIIQQ")
+_symbol = struct.Struct("<IBBHQQ")
+_rela = struct.Struct("<QQq")
+
+# The size of the value patched by the absolute relocations found in debug
+# sections, per relocation type
+_relocation_sizes = {
+    # x86-64: R_X86_64_64, R_X86_64_32, R_X86_64_32S
+    1: 8, 10: 4, 11: 4,
+    # AArch64: R_AARCH64_ABS64, R_AARCH64_ABS32
+    257: 8, 258: 4,
+}
+
+# DWARF line number program opcodes
+_DW_LNS_copy = 1
+_DW_LNS_advance_pc = 2
+_DW_LNS_advance_line = 3
+_DW_LNS_set_file = 4
+_DW_LNS_const_add_pc = 8
+_DW_LNS_fixed_advance_pc = 9
+_DW_LNE_end_sequence = 1
+_DW_LNE_set_address = 2
+_DW_LNE_define_file = 3
+
+# DWARF 5 line table entry content types and forms
+_DW_LNCT_path = 1
+_DW_LNCT_directory_index = 2
+_fixed_form_sizes = {
+    0x0b: 1,   # DW_FORM_data1
+    0x05: 2,   # DW_FORM_data2
+    0x06: 4,   # DW_FORM_data4
+    0x07: 8,   # DW_FORM_data8
+    0x1e: 16,  # DW_FORM_data16
+}
+_DW_FORM_string = 0x08
+_DW_FORM_block = 0x09
+_DW_FORM_strp = 0x0e
+_DW_FORM_udata = 0x0f
+_DW_FORM_line_strp = 0x1f
+
+
+class _Section(object):
+    __slots__ = ("index", "name", "type", "offset", "size", "link", "info",
+                 "entsize")
+
+    def __init__(self, index, name, header):
+        self.index = index
+        self.name = name
+        (_, self.type, _, _, self.offset, self.size, self.link, self.info,
+         _, self.entsize) = header
+
+
+class _ELFObject(object):
+    """
+    A minimal reader of the sections and symbols of an ELF object.
+    """
+
+    def __init__(self, data):
+        if (data[:4] != _ELF_MAGIC or data[4] != _ELFCLASS64
+                or data[5] != _ELFDATA2LSB):
+            raise NotImplementedError("only little-endian 64-bit ELF objects "
+                                      "are supported")
+        self.data = data
+        shoff, = struct.unpack_from("<Q", data, 0x28)
+        shentsize, shnum, shstrndx = struct.unpack_from("<HHH", data, 0x3a)
+        headers = [_section_header.unpack_from(data, shoff + i * shentsize)
+                   for i in range(shnum)]
+        names_offset = headers[shstrndx][4]
+        self.sections = [
+            _Section(i, self._read_string(names_offset + header[0]), header)
+            for i, header in enumerate(headers)
+        ]
+        self.symbols = []
+        for sec in self.sections:
+            if sec.type == _SHT_SYMTAB:
+                strtab = self.sections[sec.link].offset
+                for pos in range(sec.offset, sec.offset + sec.size,
+                                 sec.entsize):
+                    name, info, _, shndx, value, size = \
+                        _symbol.unpack_from(data, pos)
+                    self.symbols.append((self._read_string(strtab + name),
+                                         info, shndx, value, size))
+
+    def _read_string(self, pos):
+        return _read_cstring(self.data, pos)[0]
+
+    def get_section(self, name):
+        for sec in self.sections:
+            if sec.name == name:
+                return sec
+        return None
+
+    def get_relocated_data(self, sec):
+        """
+        Return the contents of section *sec* with its absolute relocations
+        applied (relative to the start of the target sections), and a dict
+        mapping the offset of each relocated value to the index of the
+        section it refers to.
+        """
+        data = bytearray(self.data[sec.offset:sec.offset + sec.size])
+        targets = {}
+        for rel in self.sections:
+            if rel.type != _SHT_RELA or rel.info != sec.index:
+                continue
+            for pos in range(rel.offset, rel.offset + rel.size, rel.entsize):
+                offset, info, addend = _rela.unpack_from(self.data, pos)
+                size = _relocation_sizes.get(info & 0xffffffff)
+                if size is None:
+                    continue
+                _, _, shndx, value, _ = self.symbols[info >> 32]
+                data[offset:offset + size] = (value + addend).to_bytes(
+                    size, "little")
+                targets[offset] = shndx
+        return bytes(data), targets
+
+
+def _read_cstring(data, pos):
+    end = data.index(b"\0", pos)
+    return data[pos:end].decode("utf-8", "replace"), end + 1
+
+
+def _read_uleb128(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            return result, pos
+
+
+def _read_sleb128(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            if byte & 0x40:
+                result -= 1 << shift
+            return result, pos
+
+
+def _join_path(directory, name):
+    if not directory or name.startswith("/"):
+        return name
+    return "%s/%s" % (directory.rstrip("/"), name)
+
+
+class _LineProgramReader(object):
+    """
+    Run the line number programs of a ``.debug_line`` section.
+    """
+
+    def __init__(self, obj):
+        self.obj = obj
+        sec = obj.get_section(".debug_line")
+        self.data, self.targets = obj.get_relocated_data(sec)
+        self.strings = {}
+        for name in (".debug_str", ".debug_line_str"):
+            sec = obj.get_section(name)
+            if sec is not None:
+                self.strings[name] = obj.data[sec.offset:sec.offset + sec.size]
+
+    def rows(self):
+        """
+        Generate the (section index, address, filename, line, end_sequence)
+        rows of all the line tables, where the address is relative to the
+        start of the section.
+        """
+        pos = 0
+        while pos < len(self.data):
+            pos = yield from self._unit_rows(pos)
+
+    def _read_string_form(self, form, pos):
+        data = self.data
+        if form == _DW_FORM_string:
+            return _read_cstring(data, pos)
+        offset, = struct.unpack_from("<I", data, pos)
+        section = ".debug_line_str" if form == _DW_FORM_line_strp else \
+            ".debug_str"
+        return _read_cstring(self.strings[section], offset)[0], pos + 4
+
+    def _read_entries(self, pos):
+        """
+        Read a DWARF 5 directory or file name table.
+        """
+        data = self.data
+        nformats = data[pos]
+        pos += 1
+        formats = []
+        for _ in range(nformats):
+            content, pos = _read_uleb128(data, pos)
+            form, pos = _read_uleb128(data, pos)
+            formats.append((content, form))
+        count, pos = _read_uleb128(data, pos)
+        entries = []
+        for _ in range(count):
+            entry = {}
+            for content, form in formats:
+                if form in (_DW_FORM_string, _DW_FORM_strp,
+                            _DW_FORM_line_strp):
+                    value, pos = self._read_string_form(form, pos)
+                elif form == _DW_FORM_udata:
+                    value, pos = _read_uleb128(data, pos)
+                elif form == _DW_FORM_block:
+                    size, pos = _read_uleb128(data, pos)
+                    value, pos = None, pos + size
+                else:
+                    size = _fixed_form_sizes[form]
+                    value = int.from_bytes(data[pos:pos + size], "little")
+                    pos += size
+                entry[content] = value
+            entries.append(entry)
+        return entries, pos
+
+    def _unit_rows(self, pos):
+        data = self.data
+        unit_length, = struct.unpack_from("<I", data, pos)
+        pos += 4
+        offset_size = 4
+        if unit_length == 0xffffffff:
+            unit_length, = struct.unpack_from("<Q", data, pos)
+            pos += 8
+            offset_size = 8
+        end = pos + unit_length
+        version, = struct.unpack_from("<H", data, pos)
+        pos += 2
+        if version >= 5:
+            # address_size and segment_selector_size
+            pos += 2
+        header_length = int.from_bytes(data[pos:pos + offset_size], "little")
+        pos += offset_size
+        program = pos + header_length
+        min_inst_length = data[pos]
+        pos += 1
+        if version >= 4:
+            # maximum_operations_per_instruction, only used by VLIW targets
+            pos += 1
+        default_is_stmt, line_base, line_range, opcode_base = \
+            struct.unpack_from("<BbBB", data, pos)
+        pos += 4
+        opcode_lengths = data[pos:pos + opcode_base - 1]
+        pos += opcode_base - 1
+
+        if version >= 5:
+            dir_entries, pos = self._read_entries(pos)
+            file_entries, pos = self._read_entries(pos)
+            directories = [entry.get(_DW_LNCT_path, "")
+                           for entry in dir_entries]
+            files = [_join_path(directories[entry.get(_DW_LNCT_directory_index,
+                                                      0)],
+                                entry.get(_DW_LNCT_path, ""))
+                     for entry in file_entries]
+        else:
+            # Directory 0 is the compilation directory, which isn't part of
+            # the line table.  File 0 is unused before DWARF 5.
+            directories = [""]
+            while data[pos]:
+                name, pos = _read_cstring(data, pos)
+                directories.append(name)
+            pos += 1
+            files = [""]
+            while data[pos]:
+                name, pos = _read_cstring(data, pos)
+                index, pos = _read_uleb128(data, pos)
+                # Skip the modification time and length
+                _, pos = _read_uleb128(data, pos)
+                _, pos = _read_uleb128(data, pos)
+                files.append(_join_path(directories[index], name))
+
+        def get_file(index):
+            return files[index] if index < len(files) else ""
+
+        pos = program
+        section = None
+        address = 0
+        file_index = 1
+        line = 1
+        while pos < end:
+            opcode = data[pos]
+            pos += 1
+            if opcode >= opcode_base:
+                adjusted = opcode - opcode_base
+                address += (adjusted // line_range) * min_inst_length
+                line += line_base + adjusted % line_range
+                yield section, address, get_file(file_index), line, False
+            elif opcode == 0:
+                length, pos = _read_uleb128(data, pos)
+                next_pos = pos + length
+                sub_opcode = data[pos]
+                if sub_opcode == _DW_LNE_end_sequence:
+                    yield section, address, get_file(file_index), line, True
+                    section = None
+                    address = 0
+                    file_index = 1
+                    line = 1
+                elif sub_opcode == _DW_LNE_set_address:
+                    address = int.from_bytes(data[pos + 1:next_pos], "little")
+                    section = self.targets.get(pos + 1)
+                elif sub_opcode == _DW_LNE_define_file:
+                    name, _ = _read_cstring(data, pos + 1)
+                    files.append(name)
+                pos = next_pos
+            elif opcode == _DW_LNS_copy:
+                yield section, address, get_file(file_index), line, False
+            elif opcode == _DW_LNS_advance_pc:
+                delta, pos = _read_uleb128(data, pos)
+                address += delta * min_inst_length
+            elif opcode == _DW_LNS_advance_line:
+                delta, pos = _read_sleb128(data, pos)
+                line += delta
+            elif opcode == _DW_LNS_set_file:
+                file_index, pos = _read_uleb128(data, pos)
+            elif opcode == _DW_LNS_const_add_pc:
+                address += ((255 - opcode_base) // line_range
+                            * min_inst_length)
+            elif opcode == _DW_LNS_fixed_advance_pc:
+                delta, = struct.unpack_from("<H", data, pos)
+                pos += 2
+                address += delta
+            else:
+                # Skip the operands of the other standard opcodes
+                for _ in range(opcode_lengths[opcode - 1]):
+                    _, pos = _read_uleb128(data, pos)
+        return end
+
+
+def read_functions(data):
+    """
+    Return the ``FunctionLines`` of the global functions defined by the ELF
+    object *data*.  The lines are empty if the object has no line table,
+    e.g. if it was compiled without debug info.
+    """
+    obj = _ELFObject(data)
+    rows = {}
+    if obj.get_section(".debug_line") is not None:
+        for section, address, filename, line, end in \
+                _LineProgramReader(obj).rows():
+            if section is not None:
+                rows.setdefault(section, []).append(
+                    (address, filename, 0 if end else line))
+        for section_rows in rows.values():
+            section_rows.sort(key=_row_address)
+    functions = []
+    for name, info, shndx, value, size in obj.symbols:
+        if (info & 0xf != _STT_FUNC or info >> 4 == _STB_LOCAL
+                or shndx == _SHN_UNDEF):
+            continue
+        section_rows = rows.get(shndx, ())
+        start = bisect.bisect_left(section_rows, value, key=_row_address)
+        stop = bisect.bisect_left(section_rows, value + size,
+                                  key=_row_address)
+        lines = [(address - value, filename, line)
+                 for address, filename, line in section_rows[start:stop]]
+        functions.append(FunctionLines(name, size, lines))
+    return functions
+
+
+def _row_address(row):
+    return row[0]
+
+
+def find_line(lines, offset):
+    """
+    Return the (filename, line) of the code at *offset* in a function with
+    the given *lines*, or None if it has no source location.
+    """
+    i = bisect.bisect_right(lines, offset, key=_row_address) - 1
+    if i < 0 or lines[i][2] == 0:
+        return None
+    return lines[i][1], lines[i][2]
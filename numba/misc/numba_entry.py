@@ -9,7 +9,9 @@ from .numba_gdbinfo import display_gdbinfo
 
 
 def make_parser():
-    parser = argparse.ArgumentParser()
+    parser = argparse.ArgumentParser(
+        epilog="Run 'numba cache --help' for the management of cache "
+               "directories.")
     parser.add_argument('--annotate', help='Annotate source',
                         action='store_true')
     parser.add_argument('--dump-llvm', action="store_true",
@@ -30,7 +32,102 @@ def make_parser():
     return parser
 
 
+def make_cache_parser():
+    parser = argparse.ArgumentParser(
+        prog='numba cache',
+        description='Inspect and manage Numba cache directories. If no '
+                    'path is given, the directory set by NUMBA_CACHE_DIR or '
+                    'else the user-wide cache directory is used. Paths are '
+                    'searched recursively, e.g. a project root containing '
+                    'in-tree __pycache__ caches can be given.')
+    parser.add_argument('command', choices=['stats', 'prune', 'clear',
+                                            'verify'],
+                        help='stats: summarize the cache contents; prune: '
+                             'evict stale and least recently used entries; '
+                             'clear: remove all entries; verify: report '
+                             'stale, corrupt and missing entries')
+    parser.add_argument('paths', nargs='*', metavar='path',
+                        help='Cache directory or tree of directories')
+    parser.add_argument('--max-bytes', type=int, default=None,
+                        help='prune: maximum size in bytes of each cache '
+                             'directory (default: NUMBA_CACHE_MAX_BYTES)')
+    parser.add_argument('--max-age', type=int, default=None,
+                        help='prune: maximum time in seconds since an entry '
+                             'was last used (default: NUMBA_CACHE_MAX_AGE)')
+    parser.add_argument('-n', '--dry-run', action='store_true',
+                        help='prune, clear: only report what would be '
+                             'removed')
+    return parser
+
+
+def _format_size(size):
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if size < 1024 or unit == 'GiB':
+            break
+        size /= 1024
+    return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+
+
+def cache_main(argv):
+    """
+    Entry point of the ``numba cache`` command, returns the exit code.
+    """
+    from numba.core import config, caching
+    from numba.misc.appdirs import AppDirs
+
+    args = make_cache_parser().parse_intermixed_args(argv)
+    paths = args.paths
+    if not paths:
+        if config.CACHE_DIR:
+            paths = [config.CACHE_DIR]
+        else:
+            appdirs = AppDirs(appname="numba", appauthor=False)
+            paths = [appdirs.user_cache_dir]
+    action = "Would remove" if args.dry_run else "Removed"
+
+    status = 0
+    for cache_dir in caching.find_cache_dirs(paths):
+        if args.command == 'stats':
+            entries = caching.scan_cache_dir(cache_dir)
+            nfuncs = sum(e.kind == 'index' for e in entries)
+            ndata = sum(e.kind == 'data' and e.status != 'missing'
+                        for e in entries)
+            total = sum(e.size for e in entries)
+            stale = sum(e.size for e in entries
+                        if e.status in ('orphan', 'obsolete', 'corrupt'))
+            print(f"{cache_dir}: {nfuncs} indices, {ndata} entries, "
+                  f"{_format_size(total)} ({_format_size(stale)} stale)")
+        elif args.command == 'prune':
+            max_bytes = args.max_bytes
+            if max_bytes is None:
+                max_bytes = config.CACHE_MAX_BYTES
+            max_age = args.max_age
+            if max_age is None:
+                max_age = config.CACHE_MAX_AGE
+            removed = caching.prune_cache_dir(cache_dir, max_bytes=max_bytes,
+                                              max_age=max_age,
+                                              dry_run=args.dry_run)
+            size = _format_size(sum(e.size for e in removed))
+            print(f"{cache_dir}: {action} {len(removed)} entries, {size}")
+        elif args.command == 'clear':
+            removed = caching.clear_cache_dir(cache_dir, dry_run=args.dry_run)
+            size = _format_size(sum(e.size for e in removed))
+            print(f"{cache_dir}: {action} {len(removed)} entries, {size}")
+        elif args.command == 'verify':
+            problems = [e for e in caching.scan_cache_dir(cache_dir)
+                        if e.status != 'valid']
+            for entry in problems:
+                print(f"{cache_dir}: {entry.status} {entry.kind} "
+                      f"{entry.name}")
+            if problems:
+                status = 1
+    return status
+
+
 def main():
+    if sys.argv[1:2] == ['cache']:
+        sys.exit(cache_main(sys.argv[2:]))
+
     parser = make_parser()
     args = parser.parse_args()
 
@@ -0,0 +1,143 @@
+"""
+Publish the JIT compiled functions to the Linux ``perf`` profiler, which
+can't symbolize code it doesn't find in a file otherwise.  When
+:envvar:`NUMBA_PERF_MAP` is set, the address, size and name of each function
+loaded by the JIT engine are appended to ``/tmp/perf-<pid>.map``.  With
+``NUMBA_PERF_MAP=2``, the functions are also written in the jitdump format
+to ``/tmp/jit-<pid>.dump``, with their machine code and line tables, for
+``perf inject --jit`` to attribute the samples to source lines.
+"""
+
+import ctypes
+import mmap
+import os
+import platform
+import struct
+import threading
+import time
+
+from numba.core import config
+from numba.core.itanium_mangler import demangle_identifier
+from numba.misc import codemap
+
+
+def _get_symbol_name(func):
+    return demangle_identifier(func.name) or func.name
+
+
+class PerfMapWriter(object):
+    """
+    Append the JIT compiled functions to the perf map file at *path*.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w")
+        self._lock = threading.Lock()
+
+    def __call__(self, functions):
+        with self._lock:
+            for func in functions:
+                self._file.write("%x %x %s\n" % (func.address, func.size,
+                                                 _get_symbol_name(func)))
+            self._file.flush()
+
+
+# See tools/perf/Documentation/jitdump-specification.txt in the Linux tree
+_JITDUMP_MAGIC = 0x4A695444
+_JITDUMP_VERSION = 1
+_JIT_CODE_LOAD = 0
+_JIT_CODE_DEBUG_INFO = 2
+
+_elf_machines = {
+    "x86_64": 62,
+    "aarch64": 183,
+}
+
+_file_header = struct.Struct("<IIIIIIQQ")
+_record_header = struct.Struct("<IIQ")
+_code_load = struct.Struct("<IIQQQQ")
+_debug_info = struct.Struct("<QQ")
+_debug_entry = struct.Struct("<QII")
+
+
+def _timestamp():
+    # perf must be run with "-k mono" to use the same clock
+    return time.clock_gettime_ns(time.CLOCK_MONOTONIC)
+
+
+class JitDumpWriter(object):
+    """
+    Write the JIT compiled functions to the jitdump file at *path*.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Readable too, for the mapping
+        self._file = open(path, "w+b")
+        self._lock = threading.Lock()
+        self._code_index = 0
+        machine = _elf_machines.get(platform.machine(), 0)
+        self._file.write(_file_header.pack(
+            _JITDUMP_MAGIC, _JITDUMP_VERSION, _file_header.size, machine, 0,
+            os.getpid(), _timestamp(), 0))
+        self._file.flush()
+        # perf finds the jitdump file from the executable mapping of it
+        self._marker = mmap.mmap(self._file.fileno(), _file_header.size,
+                                 flags=mmap.MAP_PRIVATE,
+                                 prot=mmap.PROT_READ | mmap.PROT_EXEC)
+
+    def _write_record(self, record_id, payload):
+        self._file.write(_record_header.pack(
+            record_id, _record_header.size + len(payload), _timestamp()))
+        self._file.write(payload)
+
+    def __call__(self, functions):
+        with self._lock:
+            for func in functions:
+                entries = [_debug_entry.pack(func.address + offset, line, 0)
+                           + filename.encode() + b"\0"
+                           for offset, filename, line in func.lines
+                           if line != 0]
+                if entries:
+                    # Must precede the code load record
+                    self._write_record(
+                        _JIT_CODE_DEBUG_INFO,
+                        _debug_info.pack(func.address, len(entries))
+                        + b"".join(entries))
+                code = ctypes.string_at(func.address, func.size)
+                self._write_record(
+                    _JIT_CODE_LOAD,
+                    _code_load.pack(os.getpid(), threading.get_native_id(),
+                                    func.address, func.address, func.size,
+                                    self._code_index)
+                    + _get_symbol_name(func).encode() + b"\0" + code)
+                self._code_index += 1
+            self._file.flush()
+
+
+_writers = []
+_writers_lock = threading.Lock()
+
+
+def enable(jitdump=False):
+    """
+    Start publishing the functions loaded by the JIT engine from now on, in
+    the perf map file, and in the jitdump file if *jitdump* is true.
+    Returns the list of the writers.
+    """
+    with _writers_lock:
+        if not _writers:
+            code_map = codemap.enable()
+            # perf only looks for the map file there
+            pid = os.getpid()
+            _writers.append(PerfMapWriter("/tmp/perf-%d.map" % (pid,)))
+            if jitdump:
+                _writers.append(JitDumpWriter("/tmp/jit-%d.dump" % (pid,)))
+            for writer in _writers:
+                code_map.add_listener(writer)
+        return list(_writers)
+
+
+if config.PERF_MAP:
+    enable(jitdump=config.PERF_MAP >= 2)
@@ -0,0 +1,136 @@
+"""
+A sampling profiler for JIT compiled code.  Python profilers see a call to a
+jitted function as a single opaque call; this profiler instead samples the
+program counter of the running threads at regular intervals of CPU time, and
+attributes the samples to the Python source lines of the nopython and parfor
+code they fall in, using the line tables emitted when
+:envvar:`NUMBA_SAMPLING_PROFILER` is set.
+
+Example::
+
+    from numba.misc.sampling import SamplingProfiler
+
+    with SamplingProfiler() as prof:
+        kernel(data)
+    print(prof.report())
+"""
+
+import linecache
+from collections import Counter
+
+from numba.core.itanium_mangler import demangle_identifier
+from numba.misc import codemap
+
+
+class SamplingProfiler(object):
+    """
+    Sample the program counter of the running threads every *interval*
+    seconds of CPU time of the process, keeping up to *max_samples* samples.
+    Only the functions compiled, or loaded from the cache, once
+    :envvar:`NUMBA_SAMPLING_PROFILER` is set are known to the profiler.
+    Samples in other code, such as the interpreter or NumPy, are only
+    counted.  Only one profiler can run at a time.
+
+    This is only supported on Linux, on x86-64 and AArch64.
+    """
+
+    def __init__(self, interval=0.001, max_samples=1_000_000):
+        self.interval = interval
+        self.max_samples = max_samples
+        self._reset()
+
+    def _reset(self):
+        # The total number of samples taken, and of those which didn't fit
+        # in the buffer
+        self.samples = 0
+        self.dropped = 0
+        self._lines = Counter()
+        self._functions = Counter()
+        self._no_line = 0
+
+    def start(self):
+        """
+        Start sampling, discarding the previous results.
+        """
+        if codemap.get_code_map() is None:
+            raise RuntimeError("the sampling profiler requires setting "
+                               "NUMBA_SAMPLING_PROFILER=1 before compiling")
+        from numba.misc import _sampler
+        self._reset()
+        interval = max(int(self.interval * 1_000_000), 1)
+        _sampler.start(interval, self.max_samples)
+
+    def stop(self):
+        """
+        Stop sampling and attribute the samples.
+        """
+        from numba.misc import _sampler
+        pcs, self.samples = _sampler.stop()
+        self.dropped = self.samples - len(pcs)
+        code_map = codemap.get_code_map()
+        for pc, count in Counter(pcs).items():
+            func, location = code_map.lookup(pc)
+            if func is None:
+                continue
+            name = demangle_identifier(func.name) or func.name
+            self._functions[name] += count
+            if location is None:
+                self._no_line += count
+            else:
+                self._lines[location] += count
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_details):
+        self.stop()
+
+    @property
+    def jit_samples(self):
+        """
+        The number of samples attributed to JIT compiled functions.
+        """
+        return sum(self._functions.values())
+
+    def lines(self):
+        """
+        Return a dict mapping each (filename, line) to its number of samples,
+        by decreasing count.  Samples in JIT compiled code without line info,
+        such as the wrappers called from Python, are left out.
+        """
+        return dict(self._lines.most_common())
+
+    def functions(self):
+        """
+        Return a dict mapping the dotted name of each JIT compiled function
+        (prefixed by e.g. "cpython." for its wrappers) to its number of
+        samples, by decreasing count.
+        """
+        return dict(self._functions.most_common())
+
+    def report(self, limit=20):
+        """
+        Return a printable report of the *limit* source lines and functions
+        with the most samples.
+        """
+        def percent(count):
+            return 100.0 * count / self.samples if self.samples else 0.0
+
+        jit_samples = self.jit_samples
+        lines = ["Sampling profile: %d samples, %d (%.1f%%) in JIT compiled "
+                 "code, %d without line info"
+                 % (self.samples, jit_samples, percent(jit_samples),
+                    self._no_line)]
+        if self.dropped:
+            lines.append("(%d samples dropped, increase max_samples)"
+                         % (self.dropped,))
+        lines.append("%10s %6s  %s" % ("samples", "%", "line"))
+        for (filename, line), count in self._lines.most_common(limit):
+            source = linecache.getline(filename, line).strip()
+            lines.append("%10d %6.1f  %s:%d  %s"
+                         % (count, percent(count), filename, line, source))
+        lines.append("%10s %6s  %s" % ("samples", "%", "function"))
+        for name, count in self._functions.most_common(limit):
+            lines.append("%10d %6.1f  %s" % (count, percent(count), name))
+        return "\n".join(lines)
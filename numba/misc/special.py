@@ -14,8 +14,12 @@ def pndindex(*args):
 class prange(object):
     """ Provides a 1D parallel iterator that generates a sequence of integers.
     In non-parallel contexts, prange is identical to range.
+
+    The optional *schedule* ("static", "dynamic" or "guided") sets how the
+    iterations are shared between the threads, see
+    :ref:`parallel_schedule`.
     """
-    def __new__(cls, *args):
+    def __new__(cls, *args, schedule="static"):
         return range(*args)
 
 
@@ -6,7 +6,9 @@ from numba.np.ufunc import _internal, array_exprs
 from numba.np.ufunc.parallel import (threading_layer, get_num_threads,
                                      set_num_threads, get_thread_id,
                                      set_parallel_chunksize,
-                                     get_parallel_chunksize)
+                                     get_parallel_chunksize,
+                                     set_thread_affinity)
+from numba.np.ufunc.reduction import reduction
 
 
 if hasattr(_internal, 'PyUFunc_ReorderableNone'):
@@ -0,0 +1,127 @@
+/*
+ * Pinning of the threads of the threading layers to CPUs, see affinity.h.
+ * Each thread pins itself, as the threading libraries don't give access to
+ * the threads they create.
+ */
+
+#include <atomic>
+#include <mutex>
+#include <vector>
+#include "affinity.h"
+
+#if defined(_MSC_VER)
+#define THREAD_LOCAL(ty) __declspec(thread) ty
+#else
+#define THREAD_LOCAL(ty) __thread ty
+#endif
+
+#if defined(__linux__)
+#include <sched.h>
+#define AFFINITY_SUPPORTED
+#elif defined(_WIN32)
+#include <windows.h>
+#define AFFINITY_SUPPORTED
+#endif
+
+static std::mutex map_lock;
+static std::vector<int> cpu_map;
+// Incremented on each change of the map, 0 is the initial unpinned state
+static std::atomic<int> map_generation(0);
+static THREAD_LOCAL(int) pinned_generation = 0;
+
+#if defined(__linux__)
+
+// The affinity of the process before any thread was pinned
+static cpu_set_t initial_mask;
+static bool have_initial_mask = false;
+
+static void
+save_initial_mask(void)
+{
+    if (!have_initial_mask)
+    {
+        have_initial_mask = sched_getaffinity(0, sizeof(initial_mask),
+                                              &initial_mask) == 0;
+    }
+}
+
+static void
+pin_thread(int cpu)
+{
+    cpu_set_t mask;
+    if (cpu >= CPU_SETSIZE)
+        return;
+    CPU_ZERO(&mask);
+    CPU_SET(cpu, &mask);
+    // Failures, e.g. for a CPU outside of the cpuset, leave the thread as is
+    sched_setaffinity(0, sizeof(mask), &mask);
+}
+
+static void
+unpin_thread(void)
+{
+    if (have_initial_mask)
+        sched_setaffinity(0, sizeof(initial_mask), &initial_mask);
+}
+
+#elif defined(_WIN32)
+
+static void
+save_initial_mask(void)
+{
+}
+
+static void
+pin_thread(int cpu)
+{
+    if (cpu >= (int)(8 * sizeof(DWORD_PTR)))
+        return;
+    SetThreadAffinityMask(GetCurrentThread(), ((DWORD_PTR)1) << cpu);
+}
+
+static void
+unpin_thread(void)
+{
+    DWORD_PTR process_mask, system_mask;
+    if (GetProcessAffinityMask(GetCurrentProcess(), &process_mask,
+                               &system_mask))
+        SetThreadAffinityMask(GetCurrentThread(), process_mask);
+}
+
+#endif
+
+extern "C" int
+set_thread_affinity_map(const int *cpus, int count)
+{
+#ifdef AFFINITY_SUPPORTED
+    std::lock_guard<std::mutex> guard(map_lock);
+    save_initial_mask();
+    cpu_map.assign(cpus, cpus + count);
+    map_generation.fetch_add(1, std::memory_order_release);
+    return 0;
+#else
+    return -1;
+#endif
+}
+
+extern "C" void
+pin_current_thread(int index)
+{
+#ifdef AFFINITY_SUPPORTED
+    int generation = map_generation.load(std::memory_order_acquire);
+    int cpu = -1;
+    if (generation == pinned_generation || index < 0)
+        return;
+    {
+        std::lock_guard<std::mutex> guard(map_lock);
+        generation = map_generation.load(std::memory_order_relaxed);
+        if (!cpu_map.empty())
+            cpu = cpu_map[index % cpu_map.size()];
+    }
+    pinned_generation = generation;
+    if (cpu < 0)
+        unpin_thread();
+    else
+        pin_thread(cpu);
+#endif
+}
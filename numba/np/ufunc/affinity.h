@@ -0,0 +1,33 @@
+/*
+ * Pinning of the threads of the threading layers to CPUs.
+ */
+
+#ifndef NUMBA_AFFINITY
+#define NUMBA_AFFINITY
+
+#ifdef __cplusplus
+extern "C"
+{
+#endif
+
+/*
+ * Set the CPU each thread of the pool runs on: the thread of index i is
+ * pinned to cpus[i % count].  A count of 0 unpins the threads.  The threads
+ * apply the new map the next time they run a parallel region.  Only the
+ * workers of the pool are pinned, the threads launching parallel regions
+ * keep their affinity.
+ * Returns 0 on success, -1 if pinning is not supported on this platform.
+ */
+int set_thread_affinity_map(const int *cpus, int count);
+
+/*
+ * Pin the calling thread, of the given index in the pool, according to the
+ * current map, if it changed since the thread was last pinned.
+ */
+void pin_current_thread(int index);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif
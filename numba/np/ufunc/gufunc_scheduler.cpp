@@ -21,6 +21,10 @@
 
 // Default 0 value means one evenly-sized chunk of work per worker thread.
 static THREAD_LOCAL(uintp) parallel_chunksize = 0;
+// The kind of schedule of the next parallel loop launched by this thread.
+static THREAD_LOCAL(int) parallel_schedule = PARALLEL_SCHEDULE_STATIC;
+// The number of chunks per thread of a dynamic schedule without a chunksize.
+static const uintp DYNAMIC_CHUNKS_PER_THREAD = 16;
 
 // round not available on VS2010.
 double guround (double number) {
@@ -110,23 +114,100 @@ extern "C" uintp get_parallel_chunksize() {
     return parallel_chunksize;
 }
 
+/*
+ * The schedule kind is consumed by the next parallel_for call of the thread,
+ * which hands out the chunks of a dynamic or guided schedule to the threads
+ * as they become idle, instead of a fixed share of them to each thread.
+ */
+extern "C" int set_parallel_schedule(int kind) {
+    int orig = parallel_schedule;
+    parallel_schedule = kind;
+    return orig;
+}
+
+extern "C" int get_parallel_schedule() {
+    return parallel_schedule;
+}
+
+/*
+ * A guided schedule splits the longest dimension only.
+ */
+static uintp guided_dim(const std::vector<intp> &ipd) {
+    return std::max_element(ipd.begin(), ipd.end()) - ipd.begin();
+}
+
+/*
+ * The size of the smallest chunks of a guided schedule.
+ */
+static intp guided_min_chunk() {
+    return parallel_chunksize > 0 ? (intp)parallel_chunksize : 1;
+}
+
 extern "C" uintp get_sched_size(uintp num_threads, uintp num_dim, intp *starts, intp *ends) {
-    if (parallel_chunksize == 0) {
+    if (parallel_chunksize == 0 && parallel_schedule == PARALLEL_SCHEDULE_STATIC) {
         return num_threads;
     }
     RangeActual ra(num_dim, starts, ends);
     uintp total_work_size = ra.total_size();
-    uintp num_divisions = total_work_size / parallel_chunksize;
+    uintp num_divisions;
+    if (parallel_schedule == PARALLEL_SCHEDULE_DYNAMIC) {
+        // Chunks of chunksize iterations, or enough chunks for the threads
+        // to even out the work between them.
+        if (parallel_chunksize == 0) {
+            num_divisions = num_threads * DYNAMIC_CHUNKS_PER_THREAD;
+        } else {
+            num_divisions = (total_work_size + parallel_chunksize - 1) / parallel_chunksize;
+        }
+        num_divisions = std::min(num_divisions, total_work_size);
+    } else if (parallel_schedule == PARALLEL_SCHEDULE_GUIDED) {
+        // Trapezoid self-scheduling: the chunk sizes decrease linearly from
+        // half of an even share of the work down to the chunksize.
+        std::vector<intp> ipd = ra.iters_per_dim();
+        intp len = ipd[guided_dim(ipd)];
+        intp last = guided_min_chunk();
+        intp first = std::max((intp)((len + 2 * num_threads - 1) / (2 * num_threads)), last);
+        num_divisions = (2 * len + first + last - 1) / (first + last);
+    } else {
+        num_divisions = total_work_size / parallel_chunksize;
+    }
     return num_divisions < num_threads ? num_threads : num_divisions;
 }
 
+/*
+ * Each thread keeps the buffer of its last schedule, up to this number of
+ * entries, for the next parallel region it launches to reuse it instead of
+ * calling malloc() and free().  The buffer is handed out to one region at a
+ * time, a nested region gets a buffer of its own.
+ */
+#define SCHED_CACHE_MAX_SIZE 4096
+
+static THREAD_LOCAL(intp*) sched_cache = NULL;
+static THREAD_LOCAL(uintp) sched_cache_size = 0;
+static THREAD_LOCAL(bool) sched_cache_in_use = false;
+
 extern "C" intp* allocate_sched(uintp sched_size) {
     intp* ret;
-    ret = (intp*)malloc(sched_size * sizeof(intp));
-    return ret;
+    if (sched_cache_in_use || sched_size > SCHED_CACHE_MAX_SIZE) {
+        ret = (intp*)malloc(sched_size * sizeof(intp));
+        return ret;
+    }
+    if (sched_size > sched_cache_size) {
+        free(sched_cache);
+        sched_cache = (intp*)malloc(sched_size * sizeof(intp));
+        sched_cache_size = sched_cache ? sched_size : 0;
+        if (!sched_cache) {
+            return NULL;
+        }
+    }
+    sched_cache_in_use = true;
+    return sched_cache;
 }
 
 extern "C" void deallocate_sched(intp* sched) {
+    if (sched != NULL && sched == sched_cache) {
+        sched_cache_in_use = false;
+        return;
+    }
     return free(sched);
 }
 
@@ -386,6 +467,48 @@ std::vector<RangeActual> create_schedule(const RangeActual &full_space, uintp nu
     }
 }
 
+/*
+ * Compute a guided schedule of num_sched chunks, see get_sched_size.
+ * Trailing chunks may be left empty when there are few iterations.
+ */
+std::vector<RangeActual> create_guided_schedule(const RangeActual &full_space, uintp num_sched) {
+    std::vector<intp> ipd = full_space.iters_per_dim();
+    uintp dim = guided_dim(ipd);
+    intp len = ipd[dim];
+    // Empty chunks are signified by a start of 1 and an end of 0.
+    std::vector<RangeActual> ret(num_sched,
+                                 RangeActual(std::vector<intp>(ipd.size(), 1),
+                                             std::vector<intp>(ipd.size(), 0)));
+    if (len == 0) {
+        return ret;
+    }
+    // Chunk i has first - i * delta iterations, so that they add up to len.
+    double last = guided_min_chunk();
+    double first = 2.0 * len / num_sched - last;
+    double delta = num_sched > 1 ? (first - last) / (num_sched - 1) : 0.0;
+    intp cur = 0;
+    for(uintp i = 0; i < num_sched && cur < len; ++i) {
+        intp next = len;
+        if(i < num_sched - 1) {
+            next = intp(guround((i + 1) * first - delta * (i + 1) * i / 2));
+            next = std::min(std::max(next, cur + 1), len);
+        }
+        RangeActual chunk_range(full_space.start, full_space.end);
+        chunk_range.start[dim] = full_space.start[dim] + cur;
+        chunk_range.end[dim] = full_space.start[dim] + next - 1;
+        ret[i] = chunk_range;
+        cur = next;
+    }
+    return ret;
+}
+
+std::vector<RangeActual> create_schedule_of_kind(const RangeActual &full_space, uintp num_sched) {
+    if (parallel_schedule == PARALLEL_SCHEDULE_GUIDED) {
+        return create_guided_schedule(full_space, num_sched);
+    }
+    return create_schedule(full_space, num_sched);
+}
+
 /*
  *   Print the calculated schedule when in debug mode.
  */
@@ -421,7 +544,7 @@ extern "C" void do_scheduling_signed(uintp num_dim, intp *starts, intp *ends, ui
     if (num_threads == 0) return;
 
     RangeActual full_space(num_dim, starts, ends);
-    std::vector<RangeActual> ret = create_schedule(full_space, num_threads);
+    std::vector<RangeActual> ret = create_schedule_of_kind(full_space, num_threads);
     if (debug) {
         print_schedule(ret);
     }
@@ -443,7 +566,7 @@ extern "C" void do_scheduling_unsigned(uintp num_dim, intp *starts, intp *ends,
     if (num_threads == 0) return;
 
     RangeActual full_space(num_dim, starts, ends);
-    std::vector<RangeActual> ret = create_schedule(full_space, num_threads);
+    std::vector<RangeActual> ret = create_schedule_of_kind(full_space, num_threads);
     if (debug) {
         print_schedule(ret);
     }
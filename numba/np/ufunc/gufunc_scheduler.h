@@ -33,6 +33,11 @@
     #define uintp unsigned
 #endif
 
+/* The kinds of schedule of a parallel loop */
+#define PARALLEL_SCHEDULE_STATIC 0
+#define PARALLEL_SCHEDULE_DYNAMIC 1
+#define PARALLEL_SCHEDULE_GUIDED 2
+
 #ifdef __cplusplus
 extern "C"
 {
@@ -42,6 +47,8 @@ void do_scheduling_signed(uintp num_dim, intp *starts, intp *ends, uintp num_thr
 void do_scheduling_unsigned(uintp num_dim, intp *starts, intp *ends, uintp num_threads, uintp *sched, intp debug);
 uintp set_parallel_chunksize(uintp);
 uintp get_parallel_chunksize(void);
+int set_parallel_schedule(int);
+int get_parallel_schedule(void);
 uintp get_sched_size(uintp num_threads, uintp num_dim, intp *starts, intp *ends);
 intp * allocate_sched(uintp sched_size);
 void deallocate_sched(intp * sched);
@@ -14,6 +14,7 @@ Threading layer on top of OpenMP.
 #include <stdio.h>
 #include "workqueue.h"
 #include "gufunc_scheduler.h"
+#include "affinity.h"
 
 #ifdef _WIN32
 #include <malloc.h>
@@ -135,6 +136,8 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     // holds the shared variable for `num_threads`, this is a bit superfluous
     // but present to force thinking about the scope of validity
     int agreed_nthreads = num_threads;
+    // the schedule is consumed here, nested loops default to static
+    const int schedule = set_parallel_schedule(PARALLEL_SCHEDULE_STATIC);
 
     if(_DEBUG)
     {
@@ -163,9 +166,13 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
 
         // tell the active thread team about the number of threads
         set_num_threads(agreed_nthreads);
+        // Only pin the workers, the thread launching the region, of index
+        // 0, is left as is
+        const int thread_num = omp_get_thread_num();
+        if (thread_num != 0)
+            pin_current_thread(thread_num);
 
-        #pragma omp for
-        for(ptrdiff_t r = 0; r < size; r++)
+        auto run_chunk = [&](ptrdiff_t r)
         {
             memcpy(count_space, dimensions, arg_len * sizeof(size_t));
             count_space[0] = 1;
@@ -203,6 +210,20 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
                 printf("\n");
             }
             func(array_arg_space, count_space, steps, data);
+        };
+
+        if(schedule == PARALLEL_SCHEDULE_STATIC)
+        {
+            #pragma omp for
+            for(ptrdiff_t r = 0; r < size; r++)
+                run_chunk(r);
+        }
+        else
+        {
+            // hand out the chunks to the threads as they become idle
+            #pragma omp for schedule(dynamic)
+            for(ptrdiff_t r = 0; r < size; r++)
+                run_chunk(r);
         }
     }
 }
@@ -256,6 +277,9 @@ MOD_INIT(omppool)
     SetAttrStringFromVoidPointer(m, get_thread_id);
     SetAttrStringFromVoidPointer(m, set_parallel_chunksize);
     SetAttrStringFromVoidPointer(m, get_parallel_chunksize);
+    SetAttrStringFromVoidPointer(m, set_parallel_schedule);
+    SetAttrStringFromVoidPointer(m, get_parallel_schedule);
+    SetAttrStringFromVoidPointer(m, set_thread_affinity_map);
     SetAttrStringFromVoidPointer(m, get_sched_size);
     SetAttrStringFromVoidPointer(m, allocate_sched);
     SetAttrStringFromVoidPointer(m, deallocate_sched);
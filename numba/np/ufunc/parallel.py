@@ -119,6 +119,28 @@ def build_gufunc_kernel(library, ctx, info, sig, inner_ndim):
 
     args, dimensions, steps, data = lfunc.args
 
+    # Reference inner-function and link
+    innerfunc_fnty = ir.FunctionType(
+        ir.VoidType(),
+        [byte_ptr_ptr_t, intp_ptr_t, intp_ptr_t, byte_ptr_t],
+    )
+    tmp_voidptr = cgutils.get_or_insert_function(mod, innerfunc_fnty,
+                                                 info.name,)
+    wrapperlib.add_linking_library(info.library)
+
+    # A single item of work is run on this thread, without the round trip
+    # to the threads of the pool.  The schedule kind is consumed as
+    # parallel_for does.
+    set_schedule = cgutils.get_or_insert_function(
+        mod, ir.FunctionType(ir.IntType(32), [ir.IntType(32)]),
+        "set_parallel_schedule")
+    num_items = builder.load(dimensions)
+    with builder.if_then(builder.icmp_signed('<=', num_items,
+                                             num_items.type(1))):
+        builder.call(set_schedule, [ir.IntType(32)(0)])
+        builder.call(tmp_voidptr, [args, dimensions, steps, data])
+        builder.ret_void()
+
     # Release the GIL (and ensure we have the GIL)
     # Note: numpy ufunc may not always release the GIL; thus,
     #       we need to ensure we have the GIL.
@@ -142,15 +164,6 @@ def build_gufunc_kernel(library, ctx, info, sig, inner_ndim):
     parallel_for = cgutils.get_or_insert_function(mod, parallel_for_ty,
                                                   'numba_parallel_for')
 
-    # Reference inner-function and link
-    innerfunc_fnty = ir.FunctionType(
-        ir.VoidType(),
-        [byte_ptr_ptr_t, intp_ptr_t, intp_ptr_t, byte_ptr_t],
-    )
-    tmp_voidptr = cgutils.get_or_insert_function(mod, innerfunc_fnty,
-                                                 info.name,)
-    wrapperlib.add_linking_library(info.library)
-
     get_num_threads = cgutils.get_or_insert_function(
         builder.module,
         ir.FunctionType(ir.IntType(types.intp.bitwidth), []),
@@ -482,6 +495,9 @@ def _launch_threads():
                         requirements.append('OSX_OMP')
                     # omp is threadsafe everywhere
                     available.append('omp')
+                    # workqueue is threadsafe everywhere, it runs concurrent
+                    # parallel regions serially
+                    available.append('workqueue')
                 elif t == "forksafe":
                     # everywhere apart from linux (GNU OpenMP) has a guaranteed
                     # forksafe OpenMP, as OpenMP has better performance, prefer
@@ -525,6 +541,12 @@ def _launch_threads():
 
             _load_threading_functions(lib)  # load late
 
+            if config.THREAD_AFFINITY:
+                if not _apply_thread_affinity(config.THREAD_AFFINITY):
+                    warnings.warn("NUMBA_THREAD_AFFINITY is ignored, pinning "
+                                  "threads is not supported on this platform",
+                                  errors.NumbaSystemWarning)
+
             # set library name so it can be queried
             global _threading_layer
             _threading_layer = libname
@@ -549,6 +571,7 @@ def _load_threading_functions(lib):
 
     ll.add_symbol('set_parallel_chunksize', lib.set_parallel_chunksize)
     ll.add_symbol('get_parallel_chunksize', lib.get_parallel_chunksize)
+    ll.add_symbol('set_parallel_schedule', lib.set_parallel_schedule)
     ll.add_symbol('get_sched_size', lib.get_sched_size)
     global _set_parallel_chunksize
     _set_parallel_chunksize = CFUNCTYPE(c_uint,
@@ -562,6 +585,10 @@ def _load_threading_functions(lib):
                                 POINTER(c_int),
                                 POINTER(c_int))(lib.get_sched_size)
 
+    global _set_thread_affinity_map
+    _set_thread_affinity_map = CFUNCTYPE(c_int, POINTER(c_int),
+                                         c_int)(lib.set_thread_affinity_map)
+
 
 # Some helpers to make set_num_threads jittable
 
@@ -759,3 +786,151 @@ def ol_get_parallel_chunksize():
     def impl():
         return _get_parallel_chunksize()
     return impl
+
+
+# Pinning of the threads
+
+_THREAD_AFFINITY_KINDS = ('compact', 'scatter')
+
+# The CPUs the process may run on, before any thread is pinned
+_available_cpus = None
+
+
+def _get_available_cpus():
+    global _available_cpus
+    if _available_cpus is None:
+        if hasattr(os, 'sched_getaffinity'):
+            _available_cpus = sorted(os.sched_getaffinity(0))
+        else:
+            _available_cpus = list(range(os.cpu_count() or 1))
+    return _available_cpus
+
+
+def _get_cpu_topology(cpus):
+    """
+    Return a dict mapping each of the *cpus* to its (socket, core) pair, as
+    found in sysfs on Linux.  Elsewhere, each CPU is its own core.
+    """
+    topology = {}
+    for cpu in cpus:
+        path = '/sys/devices/system/cpu/cpu%d/topology/' % cpu
+        try:
+            with open(path + 'physical_package_id') as f:
+                socket = int(f.read())
+            with open(path + 'core_id') as f:
+                core = int(f.read())
+        except (OSError, ValueError):
+            socket, core = 0, cpu
+        topology[cpu] = (socket, core)
+    return topology
+
+
+def _parse_cpu_list(text):
+    """
+    Parse a list of CPUs such as "0,2,4-7".
+    """
+    cpus = []
+    for item in text.split(','):
+        first, sep, last = item.strip().partition('-')
+        if not (first.isdigit() and (not sep or last.isdigit())):
+            raise ValueError("Invalid thread affinity %r" % (text,))
+        if sep:
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(first))
+    return cpus
+
+
+def _order_cpus(kind, cpus, topology):
+    """
+    Order the *cpus* for the threads to be pinned in turn to each one,
+    following the *kind* of affinity, 'compact' or 'scatter'.
+    """
+    compact = sorted(cpus, key=lambda cpu: (topology[cpu], cpu))
+    if kind == 'compact':
+        return compact
+    # The rank of each CPU among the hardware threads of its core, and of
+    # its core among the cores of its socket
+    smt_ranks = {}
+    core_ranks = {}
+    seen_threads = {}
+    seen_cores = {}
+    for cpu in compact:
+        socket, core = topology[cpu]
+        smt_ranks[cpu] = seen_threads.setdefault((socket, core), 0)
+        seen_threads[(socket, core)] += 1
+        cores = seen_cores.setdefault(socket, [])
+        if core not in cores:
+            cores.append(core)
+        core_ranks[cpu] = cores.index(core)
+    return sorted(compact, key=lambda cpu: (smt_ranks[cpu], core_ranks[cpu],
+                                            topology[cpu][0], cpu))
+
+
+def _get_affinity_cpus(affinity):
+    """
+    Return the list of the CPUs to pin the threads to in turn for the given
+    *affinity*, or an empty list to not pin them.
+    """
+    if affinity is None:
+        return []
+    available = _get_available_cpus()
+    if isinstance(affinity, str):
+        kind = affinity.strip().lower()
+        if kind in ('', 'none'):
+            return []
+        if kind in _THREAD_AFFINITY_KINDS:
+            return _order_cpus(kind, available,
+                               _get_cpu_topology(available))
+        cpus = _parse_cpu_list(affinity)
+    else:
+        cpus = list(affinity)
+        if not all(isinstance(cpu, (int, np.integer)) for cpu in cpus):
+            raise TypeError("The CPUs of the thread affinity must be "
+                            "integers")
+    if not cpus:
+        raise ValueError("The thread affinity lists no CPU")
+    for cpu in cpus:
+        if cpu not in available:
+            raise ValueError("CPU %s is not available to the process"
+                             % (cpu,))
+    return [int(cpu) for cpu in cpus]
+
+
+def _apply_thread_affinity(affinity):
+    cpus = _get_affinity_cpus(affinity)
+    return _set_thread_affinity_map((c_int * len(cpus))(*cpus),
+                                    len(cpus)) == 0
+
+
+def set_thread_affinity(affinity):
+    """
+    Pin the threads used for parallel execution to CPUs, which keeps the
+    data of each thread in the caches and, with first-touch placement of
+    memory, on the NUMA node of the thread.
+
+    *affinity* is one of:
+
+    * ``"compact"``: the threads fill each core, then each socket, before
+      moving to the next one.
+    * ``"scatter"``: the threads are spread across the sockets, then across
+      the cores of each socket, before using the other hardware threads of
+      the cores.
+    * a list of CPU numbers, or a string listing them such as
+      ``"0,2,4-7"``: thread *i* is pinned to the *i*-th CPU of the list.
+    * ``"none"`` or ``None``: the threads are not pinned.
+
+    The threads go around the list of CPUs again if there are more threads
+    than CPUs.  The threads are pinned the next time they run a parallel
+    region.  The thread launching a parallel region is not pinned, even
+    when it takes part in it.  Pinning is supported on Linux and Windows.
+
+    See Also
+    --------
+    :envvar:`NUMBA_THREAD_AFFINITY`, :envvar:`NUMBA_PARALLEL_FIRST_TOUCH`
+
+    """
+    _launch_threads()
+    if not _apply_thread_affinity(affinity):
+        raise NotImplementedError("Pinning threads is not supported on "
+                                  "this platform")
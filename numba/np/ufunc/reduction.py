@@ -0,0 +1,55 @@
+"""
+Reductions over user-defined operators in parallel loops.  A reduction
+holds one accumulator per thread, which the iterations of a ``prange`` loop
+update without synchronization, and combines them pairwise once the loop is
+done.
+"""
+
+
+class Reduction(object):
+    """
+    The interpreter implementation of a reduction, with a single accumulator.
+    """
+
+    def __init__(self, init, combine):
+        self._combine = combine
+        self._accumulator = init()
+
+    def local(self):
+        return self._accumulator
+
+    def update(self, value):
+        self._accumulator = self._combine(self._accumulator, value)
+
+    def result(self):
+        return self._accumulator
+
+
+def reduction(init, combine):
+    """
+    Create a reduction with the accumulator returned by calling *init* and
+    the operator *combine*, for use in the ``prange`` loops of a jitted
+    function.
+
+    Each thread gets its own accumulator, created by calling *init* without
+    arguments, so that the loop iterations may update it without races:
+
+    - ``r.local()`` returns the accumulator of the calling thread, for
+      updating it in place, e.g. a ``typed.Dict``, a ``typed.List``, a
+      ``structref`` or an array.
+    - ``r.update(value)`` replaces the accumulator of the calling thread by
+      ``combine(accumulator, value)``, e.g. for scalars or tuples.
+    - ``r.result()``, once the loop is done, combines the accumulators of all
+      the threads pairwise, with ``accumulator = combine(accumulator,
+      other)``, in a tree of parallel steps, and returns the result.
+
+    *init* and *combine* must be jitted functions.  *combine* may update its
+    first argument in place and return it, and must be associative.  The
+    number of accumulators is the number of threads when the reduction is
+    created, see :func:`~.set_num_threads`.
+
+    Returns
+    -------
+    The reduction.
+    """
+    return Reduction(init, combine)
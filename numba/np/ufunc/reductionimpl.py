@@ -0,0 +1,107 @@
+"""
+Typing and lowering of the reductions of numba.np.ufunc.reduction, imported
+with the other implementations once something is compiled.
+"""
+
+from numba.core import types, cgutils, errors, ir_utils
+from numba.core.extending import (intrinsic, overload, overload_method,
+                                  register_model, models,
+                                  make_attribute_wrapper)
+from numba.misc.special import prange
+from numba.np.ufunc.parallel import get_num_threads, get_thread_id
+from numba.np.ufunc.reduction import reduction
+
+
+class ReductionType(types.Type):
+    """
+    The type of a reduction with accumulators of type *accumulator* and the
+    combine function of type *combine*.
+    """
+
+    def __init__(self, accumulator, combine):
+        self.accumulator = accumulator
+        self.combine = combine
+        name = "Reduction(%s, %s)" % (accumulator, combine)
+        super(ReductionType, self).__init__(name=name)
+
+
+@register_model(ReductionType)
+class ReductionModel(models.StructModel):
+    def __init__(self, dmm, fe_type):
+        members = [('accumulators', types.ListType(fe_type.accumulator))]
+        super(ReductionModel, self).__init__(dmm, fe_type, members)
+
+
+make_attribute_wrapper(ReductionType, 'accumulators', '_accumulators')
+
+# The accumulator of a thread is updated in place through its reference
+ir_utils.alias_method_extensions.add((ReductionType, 'local'))
+
+
+@intrinsic
+def _make_reduction(typingctx, accumulators, combine):
+    red_type = ReductionType(accumulators.item_type, combine)
+
+    def codegen(context, builder, signature, args):
+        red = cgutils.create_struct_proxy(red_type)(context, builder)
+        red.accumulators = args[0]
+        context.nrt.incref(builder, signature.args[0], args[0])
+        return red._getvalue()
+    return red_type(accumulators, combine), codegen
+
+
+@overload(reduction)
+def ol_reduction(init, combine):
+    from numba.typed import List
+
+    if not isinstance(init, types.Dispatcher):
+        raise errors.TypingError("The init function of a reduction must be "
+                                 "a jitted function, got %s" % (init,))
+    if not isinstance(combine, types.Dispatcher):
+        raise errors.TypingError("The combine function of a reduction must "
+                                 "be a jitted function, got %s" % (combine,))
+
+    def impl(init, combine):
+        accumulators = List()
+        for _ in range(get_num_threads()):
+            accumulators.append(init())
+        return _make_reduction(accumulators, combine)
+    return impl
+
+
+@overload_method(ReductionType, 'local')
+def ol_reduction_local(red):
+    def impl(red):
+        return red._accumulators[get_thread_id()]
+    return impl
+
+
+@overload_method(ReductionType, 'update')
+def ol_reduction_update(red, value):
+    combine = red.combine.dispatcher
+
+    def impl(red, value):
+        accumulators = red._accumulators
+        i = get_thread_id()
+        accumulators[i] = combine(accumulators[i], value)
+    return impl
+
+
+@overload_method(ReductionType, 'result', jit_options={'parallel': True})
+def ol_reduction_result(red):
+    combine = red.combine.dispatcher
+
+    def impl(red):
+        accumulators = red._accumulators
+        n = len(accumulators)
+        # Combine the accumulators step apart, the pairs of a step in
+        # parallel, until they are all combined in the first one
+        step = 1
+        while step < n:
+            for j in prange((n - 1 + step) // (2 * step)):
+                i = 2 * step * j
+                accumulators[i] = combine(accumulators[i],
+                                          accumulators[i + step])
+            step *= 2
+        return accumulators[0]
+    return impl
@@ -20,6 +20,7 @@ Implement parallel vectorize workqueue on top of Intel TBB.
 #include "workqueue.h"
 
 #include "gufunc_scheduler.h"
+#include "affinity.h"
 
 /* TBB 2021.6 is the minimum version */
 #if (TBB_INTERFACE_VERSION < 12060)
@@ -97,6 +98,9 @@ public:
 
 void fix_tls_observer::on_scheduler_entry(bool worker) {
     set_num_threads(mask_val);
+    // Only pin the workers, not the threads launching the parallel regions
+    if (worker)
+        pin_current_thread(tbb::this_task_arena::current_thread_index());
 }
 
 static void
@@ -157,10 +161,12 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     // parallel region the same logic applies as per program start/reinit.
     tbb::task_arena limited(num_threads);
     fix_tls_observer observer(limited, num_threads);
+    // the schedule is consumed here, nested loops default to static
+    const int schedule = set_parallel_schedule(PARALLEL_SCHEDULE_STATIC);
 
     limited.execute([&]{
         using range_t = tbb::blocked_range<size_t>;
-        tbb::parallel_for(range_t(0, dimensions[0]), [=](const range_t &range)
+        auto body = [=](const range_t &range)
         {
             size_t * count_space = (size_t *)alloca(sizeof(size_t) * arg_len);
             char ** array_arg_space = (char**)alloca(sizeof(char*) * array_count);
@@ -201,7 +207,18 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
             }
             auto func = reinterpret_cast<void (*)(char **args, size_t *dims, size_t *steps, void *data)>(fn);
             func(array_arg_space, count_space, steps, data);
-        });
+        };
+
+        if(schedule == PARALLEL_SCHEDULE_STATIC)
+        {
+            tbb::parallel_for(range_t(0, dimensions[0]), body);
+        }
+        else
+        {
+            // one task per chunk, for idle threads to steal them one by one
+            tbb::parallel_for(range_t(0, dimensions[0], 1), body,
+                              tbb::simple_partitioner());
+        }
     });
 }
 
@@ -341,6 +358,9 @@ MOD_INIT(tbbpool)
     SetAttrStringFromVoidPointer(m, get_thread_id);
     SetAttrStringFromVoidPointer(m, set_parallel_chunksize);
     SetAttrStringFromVoidPointer(m, get_parallel_chunksize);
+    SetAttrStringFromVoidPointer(m, set_parallel_schedule);
+    SetAttrStringFromVoidPointer(m, get_parallel_schedule);
+    SetAttrStringFromVoidPointer(m, set_thread_affinity_map);
     SetAttrStringFromVoidPointer(m, get_sched_size);
     SetAttrStringFromVoidPointer(m, allocate_sched);
     SetAttrStringFromVoidPointer(m, deallocate_sched);
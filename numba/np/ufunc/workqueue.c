@@ -4,9 +4,13 @@ Implement parallel vectorize workqueue.
 This keeps a set of worker threads running all the time.
 They wait and spin on a task queue for jobs.
 
+The pool runs one parallel region at a time.  A region launched from a
+worker thread (nested in another region), or by another thread while the
+pool is busy, runs serially on the calling thread instead.
+
 **WARNING**
-This module is not thread-safe.  Adding task to queue is not protected from
-race conditions.
+The add_task(), ready() and synchronize() entry points are not thread-safe.
+Adding task to queue is not protected from race conditions.
 */
 #include "../../_pymodule.h"
 #ifdef _POSIX_C_SOURCE
@@ -45,18 +49,17 @@ race conditions.
 #include <stdio.h>
 #include "workqueue.h"
 #include "gufunc_scheduler.h"
+#include "affinity.h"
 
 #define _DEBUG 0
 
-/* workqueue is not threadsafe, so we use DSO globals to flag and update various
- * states.
+/* The pool is used by one parallel region at a time, so we use DSO globals to
+ * flag and update various states.
  */
-/* This variable is the nesting level, it's incremented at the start of each
- * parallel region and decremented at the end, if parallel regions are nested
- * on entry the value == 1 and workqueue will abort (this in preference to just
- * hanging or segfaulting).
+/* This flag is set while a parallel region runs on the pool, it is only ever
+ * updated atomically, see pool_try_acquire().
  */
-static int _nesting_level = 0;
+static int _pool_busy = 0;
 
 /* As the thread-pool isn't inherited by children,
    free the task-queue, too. */
@@ -318,6 +321,9 @@ static int _INIT_NUM_THREADS = -1;
 // This is the per-thread thread mask, each thread can carry its own mask.
 static THREAD_LOCAL(int) _TLS_num_threads = 0;
 
+// Whether this thread is a worker of the pool.
+static THREAD_LOCAL(int) _TLS_is_worker = 0;
+
 static void
 set_num_threads(int count)
 {
@@ -362,6 +368,72 @@ static void sync_tls(void *args, void *dims, void *steps, void *data) {
 };
 
 
+#ifdef NUMBA_WINTHREAD
+#define fetch_and_increment(ptr) \
+    ((size_t)InterlockedIncrement64((volatile LONG64 *)(ptr)) - 1)
+#else
+#define fetch_and_increment(ptr) __atomic_fetch_add((ptr), 1, __ATOMIC_RELAXED)
+#endif
+
+/* Take the pool for a parallel region, returns 0 if it is busy. */
+static int
+pool_try_acquire(void)
+{
+#ifdef NUMBA_WINTHREAD
+    return InterlockedCompareExchange((volatile LONG *)&_pool_busy, 1, 0) == 0;
+#else
+    int expected = 0;
+    return __atomic_compare_exchange_n(&_pool_busy, &expected, 1, 0,
+                                       __ATOMIC_ACQUIRE, __ATOMIC_RELAXED);
+#endif
+}
+
+static void
+pool_release(void)
+{
+#ifdef NUMBA_WINTHREAD
+    InterlockedExchange((volatile LONG *)&_pool_busy, 0);
+#else
+    __atomic_store_n(&_pool_busy, 0, __ATOMIC_RELEASE);
+#endif
+}
+
+/* A loop whose chunks are handed out one at a time to the threads as they
+   become idle, for dynamic and guided schedules. */
+typedef struct
+{
+    void (*fn)(void *args, void *dims, void *steps, void *data);
+    char **args;
+    size_t *dimensions;
+    size_t *steps;
+    void *data;
+    size_t arg_len;
+    size_t array_count;
+    size_t total;
+    /* The next chunk to hand out */
+    size_t next;
+} dynamic_loop;
+
+static void
+dynamic_worker(void *args, void *dims, void *steps, void *data)
+{
+    dynamic_loop *loop = (dynamic_loop *)args;
+    size_t *count_space = (size_t *)alloca(sizeof(size_t) * loop->arg_len);
+    char **array_arg_space = (char **)alloca(sizeof(char*) * loop->array_count);
+    size_t i, j;
+
+    memcpy(count_space, loop->dimensions, loop->arg_len * sizeof(size_t));
+    count_space[0] = 1;
+    while ((i = fetch_and_increment(&loop->next)) < loop->total)
+    {
+        for (j = 0; j < loop->array_count; j++)
+        {
+            array_arg_space[j] = loop->args[j] + loop->steps[j] * i;
+        }
+        loop->fn(array_arg_space, count_space, loop->steps, loop->data);
+    }
+}
+
 static void
 parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *data,
              size_t inner_ndim, size_t array_count, int num_threads)
@@ -372,27 +444,17 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     //     steps = <ir.Argument '.3' of type i64*>
     //     data = <ir.Argument '.4' of type i8*>
 
-    // check the nesting level, if it's already 1, abort, workqueue cannot
-    // handle nesting.
-    if (_nesting_level >= 1){
-        fprintf(stderr, "%s", "Numba workqueue threading layer is terminating: "
-                              "Concurrent access has been detected.\n\n"
-                              " - The workqueue threading layer is not "
-                              "threadsafe and may not be accessed concurrently "
-                              "by multiple threads. Concurrent access "
-                              "typically occurs through a nested parallel "
-                              "region launch or by calling Numba parallel=True "
-                              "functions from multiple Python threads.\n"
-                              " - Try using the TBB threading layer as an "
-                              "alternative, as it is, itself, threadsafe. "
-                              "Docs: https://numba.readthedocs.io/en/stable/user/threading-layer.html\n\n");
-        raise(SIGABRT);
+    // A region nested in another one, or launched while another thread uses
+    // the pool, runs all of its chunks on this thread: the pool runs one
+    // region at a time and waiting for it could deadlock.
+    if (_TLS_is_worker || !pool_try_acquire())
+    {
+        void (*func)(char **args, size_t *dims, size_t *steps, void *data) = fn;
+        set_parallel_schedule(PARALLEL_SCHEDULE_STATIC);
+        func(args, dimensions, steps, data);
         return;
     }
 
-    // increment the nest level
-    _nesting_level += 1;
-
     size_t * count_space = NULL;
     char ** array_arg_space = NULL;
     const size_t arg_len = (inner_ndim + 1);
@@ -404,6 +466,8 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     int old_queue_count = -1;
 
     size_t step;
+    int schedule = set_parallel_schedule(PARALLEL_SCHEDULE_STATIC);
+    dynamic_loop loop;
 
     debug_marker();
 
@@ -452,68 +516,86 @@ parallel_for(void *fn, char **args, size_t *dimensions, size_t *steps, void *dat
     old_queue_count = queue_count;
     queue_count = num_threads;
 
-    for (i = 0; i < num_threads; i++)
+    if (schedule != PARALLEL_SCHEDULE_STATIC)
     {
-        count_space = (size_t *)alloca(sizeof(size_t) * arg_len);
-        memcpy(count_space, dimensions, arg_len * sizeof(size_t));
-        if(i == num_threads - 1)
+        loop.fn = fn;
+        loop.args = args;
+        loop.dimensions = dimensions;
+        loop.steps = steps;
+        loop.data = data;
+        loop.arg_len = arg_len;
+        loop.array_count = array_count;
+        loop.total = total;
+        loop.next = 0;
+        for (i = 0; i < num_threads; i++)
         {
-            // Last thread takes all leftover
-            count_space[0] = remain;
+            add_task_internal(dynamic_worker, (void *)&loop, NULL, NULL, NULL, i);
         }
-        else
-        {
-            count_space[0] = count;
-            remain = remain - count;
-        }
-
-        if(_DEBUG)
+    }
+    else
+    {
+        for (i = 0; i < num_threads; i++)
         {
-            printf("\n=================== THREAD %d ===================\n", i);
-            printf("\ncount_space: ");
-            for(j = 0; j < arg_len; j++)
+            count_space = (size_t *)alloca(sizeof(size_t) * arg_len);
+            memcpy(count_space, dimensions, arg_len * sizeof(size_t));
+            if(i == num_threads - 1)
             {
-                printf("%zd, ", count_space[j]);
+                // Last thread takes all leftover
+                count_space[0] = remain;
+            }
+            else
+            {
+                count_space[0] = count;
+                remain = remain - count;
             }
-            printf("\n");
-        }
-
-        array_arg_space = alloca(sizeof(char*) * array_count);
-
-        for(j = 0; j < array_count; j++)
-        {
-            base = args[j];
-            step = steps[j];
-            offset = step * count * i;
-            array_arg_space[j] = (char *)(base + offset);
 
             if(_DEBUG)
             {
-                printf("Index %zd\n", j);
-                printf("-->Got base %p\n", (void *)base);
-                printf("-->Got step %zd\n", step);
-                printf("-->Got offset %td\n", offset);
-                printf("-->Got addr %p\n", (void *)array_arg_space[j]);
+                printf("\n=================== THREAD %d ===================\n", i);
+                printf("\ncount_space: ");
+                for(j = 0; j < arg_len; j++)
+                {
+                    printf("%zd, ", count_space[j]);
+                }
+                printf("\n");
             }
-        }
 
-        if(_DEBUG)
-        {
-            printf("\narray_arg_space: ");
+            array_arg_space = alloca(sizeof(char*) * array_count);
+
             for(j = 0; j < array_count; j++)
             {
-                printf("%p, ", (void *)array_arg_space[j]);
+                base = args[j];
+                step = steps[j];
+                offset = step * count * i;
+                array_arg_space[j] = (char *)(base + offset);
+
+                if(_DEBUG)
+                {
+                    printf("Index %zd\n", j);
+                    printf("-->Got base %p\n", (void *)base);
+                    printf("-->Got step %zd\n", step);
+                    printf("-->Got offset %td\n", offset);
+                    printf("-->Got addr %p\n", (void *)array_arg_space[j]);
+                }
+            }
+
+            if(_DEBUG)
+            {
+                printf("\narray_arg_space: ");
+                for(j = 0; j < array_count; j++)
+                {
+                    printf("%p, ", (void *)array_arg_space[j]);
+                }
             }
+            add_task_internal(fn, (void *)array_arg_space, (void *)count_space, steps, data, i);
         }
-        add_task_internal(fn, (void *)array_arg_space, (void *)count_space, steps, data, i);
     }
 
     ready();
     synchronize();
 
     queue_count = old_queue_count;
-    // decrement the nest level
-    _nesting_level -= 1;
+    pool_release();
 }
 
 static void
@@ -555,6 +637,7 @@ void thread_worker(void *arg)
     Queue *queue = (Queue*)arg;
     Task *task;
 
+    _TLS_is_worker = 1;
     while (1)
     {
         /* Wait for the queue to be in READY state (i.e. for some task
@@ -564,6 +647,7 @@ void thread_worker(void *arg)
 
         task = &queue->task;
         set_thread_id(task->tid);
+        pin_current_thread((int)(queue - queues));
         task->func(task->args, task->dims, task->steps, task->data);
 
         /* Task is done. */
@@ -635,7 +719,7 @@ static void reset_after_fork(void)
     {
         NUM_THREADS = _INIT_NUM_THREADS;
     }
-    _nesting_level = 0;
+    _pool_busy = 0;
 }
 
 MOD_INIT(workqueue)
@@ -657,6 +741,9 @@ MOD_INIT(workqueue)
     SetAttrStringFromVoidPointer(m, get_thread_id);
     SetAttrStringFromVoidPointer(m, set_parallel_chunksize);
     SetAttrStringFromVoidPointer(m, get_parallel_chunksize);
+    SetAttrStringFromVoidPointer(m, set_parallel_schedule);
+    SetAttrStringFromVoidPointer(m, get_parallel_schedule);
+    SetAttrStringFromVoidPointer(m, set_thread_affinity_map);
     SetAttrStringFromVoidPointer(m, get_sched_size);
     SetAttrStringFromVoidPointer(m, allocate_sched);
     SetAttrStringFromVoidPointer(m, deallocate_sched);
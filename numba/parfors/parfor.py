@@ -36,6 +36,7 @@ from numba.np.numpy_support import as_dtype, numpy_version
 from numba.core.typing.templates import infer_global, AbstractTemplate
 from numba.stencils.stencilparfor import StencilPass
 from numba.core.extending import register_jitable, lower_builtin
+from numba.core.cpu_options import PARALLEL_SCHEDULES
 
 from numba.core.ir_utils import (
     mk_unique_var,
@@ -64,6 +65,7 @@ from numba.core.ir_utils import (
     add_offset_to_labels,
     find_callname,
     find_build_sequence,
+    find_const,
     guard,
     require,
     GuardException,
@@ -646,7 +648,8 @@ class Parfor(ir.Expr, ir.Stmt):
             flags,
             *,  #only specify the options below by keyword
             no_sequential_lowering=False,
-            races=None):
+            races=None,
+            schedule=None):
         if races is None:
             races = set()
         super(Parfor, self).__init__(
@@ -674,6 +677,9 @@ class Parfor(ir.Expr, ir.Stmt):
         # sequential lowering option
         self.no_sequential_lowering = no_sequential_lowering
         self.races = races
+        # The schedule of the loop iterations across the threads, None means
+        # the "schedule" parallel option of the function
+        self.schedule = schedule
         self.redvars = []
         self.reddict = {}
         # If the lowerer is None then the standard lowerer will be used.
@@ -2740,7 +2746,8 @@ class ConvertLoopPass:
                                     orig_index_var if mask_indices else index_var,
                                     equiv_set,
                                     ("prange", loop_kind, loop_replacing),
-                                    pass_states.flags, races=races)
+                                    pass_states.flags, races=races,
+                                    schedule=self._get_schedule(inst))
 
                     blocks[loop.header].body = [parfor]
                     # We have to insert the header_body after the parfor because in
@@ -2791,6 +2798,18 @@ class ConvertLoopPass:
             kind = 'pndindex', ''
         return kind
 
+    def _get_schedule(self, call):
+        """get the schedule keyword of a prange call, if any"""
+        schedule = dict(call.value.kws).get('schedule')
+        if schedule is None:
+            return None
+        schedule = guard(find_const, self.pass_states.func_ir, schedule)
+        if schedule not in PARALLEL_SCHEDULES:
+            raise errors.UnsupportedRewriteError(
+                "The schedule of prange must be one of %s"
+                % (PARALLEL_SCHEDULES,), loc=call.loc)
+        return schedule
+
     def _get_prange_init_block(self, entry_block, call_table, prange_args):
         """
         If there is init_prange, find the code between init_prange and prange
@@ -4327,6 +4346,13 @@ def try_fuse(equiv_set, parfor1, parfor2, metadata, func_ir, typemap):
         report = FusionReport(parfor1.id, parfor2.id, msg)
         return None, report
 
+    # fusion of parfors with different schedules is not possible
+    if parfor1.schedule != parfor2.schedule:
+        dprint("try_fuse: parfors different schedules")
+        msg = "- fusion failed: schedule mismatch"
+        report = FusionReport(parfor1.id, parfor2.id, msg)
+        return None, report
+
     # fusion of parfors with different dimensions not supported yet
     if len(parfor1.loop_nests) != len(parfor2.loop_nests):
         dprint("try_fuse: parfors number of dimensions mismatch")
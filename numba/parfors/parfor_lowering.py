@@ -35,6 +35,7 @@ from numba.core.ir_utils import (
 )
 from numba.core.typing import signature
 from numba.core import lowering
+from numba.core.controlflow import CFGraph
 from numba.parfors.parfor import ensure_parallel_support
 from numba.core.errors import (
     NumbaParallelSafetyWarning, NotDefinedError, CompilerError, InternalError,
@@ -114,6 +115,9 @@ def _lower_parfor_parallel_std(lowerer, parfor):
             print("lower init_block instr = ", instr)
         lowerer.lower_inst(instr)
 
+    # The body is transformed by the gufunc creation, estimate its cost now
+    body_cost = _estimate_body_cost(parfor)
+
     for racevar in parfor.races:
         if racevar not in varmap:
             rvtyp = typemap[racevar]
@@ -393,7 +397,9 @@ def _lower_parfor_parallel_std(lowerer, parfor):
         parfor.init_block,
         index_var_typ,
         parfor.races,
-        exp_name_to_tuple_var)
+        exp_name_to_tuple_var,
+        schedule=parfor.schedule or flags.auto_parallel.schedule,
+        body_cost=body_cost)
 
     if nredvars > 0:
         _parfor_lowering_finalize_reduction(
@@ -1445,6 +1451,9 @@ def _create_gufunc_for_parfor_body(
         print("gufunc_func = ", type(gufunc_func), "\n", gufunc_func)
     # Get the IR for the gufunc outline.
     gufunc_ir = compiler.run_frontend(gufunc_func)
+    # The outline has no source file, the line info of its code refers to
+    # the file of the parfor
+    gufunc_ir.loc = loc
     if config.DEBUG_ARRAY_OPT:
         print("gufunc_ir dump ", type(gufunc_ir))
         gufunc_ir.dump()
@@ -1663,11 +1672,46 @@ def replace_var_with_array(vars, loop_body, typemap, calltypes):
         typemap.pop(v, None)
         typemap[v] = types.npytypes.Array(el_typ, 1, "C")
 
+# The kinds of schedule in gufunc_scheduler.h
+_schedule_kinds = {"static": 0, "dynamic": 1, "guided": 2}
+
+
+def _estimate_body_cost(pf):
+    """
+    Estimate the cost of one iteration of the parfor *pf* as the number of IR
+    statements of its body.  Returns None if the body contains a loop, or a
+    nested parfor, whose cost depends on its own trip count.
+    """
+    blocks = pf.loop_body
+    cfg = CFGraph()
+    for label in blocks:
+        cfg.add_node(label)
+    for label, block in blocks.items():
+        for stmt in block.body:
+            if isinstance(stmt, parfor.Parfor):
+                return None
+        if block.body and block.body[-1].is_terminator:
+            for target in block.terminator.get_targets():
+                if target in blocks:
+                    cfg.add_edge(label, target)
+    cfg.set_entry_point(min(blocks))
+    cfg.process()
+    if cfg.loops():
+        return None
+    return sum(len(block.body) for block in blocks.values())
+
+
 def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr_arg_types,
                          loop_ranges, redvars, reddict, redarrdict, init_block, index_var_typ, races,
-                         exp_name_to_tuple_var):
+                         exp_name_to_tuple_var, schedule="static",
+                         body_cost=None):
     '''
     Adds the call to the gufunc function from the main function.
+    The chunks of the schedule are handed out to the threads as they become
+    idle with a "dynamic" or "guided" *schedule*.
+    The loop runs serially on the calling thread if its trip count times the
+    estimated *body_cost* of an iteration is below
+    NUMBA_PARALLEL_SERIAL_THRESHOLD.
     '''
     context = lowerer.context
     builder = lowerer.builder
@@ -1728,6 +1772,7 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
     byte_ptr_ptr_t = llvmlite.ir.PointerType(byte_ptr_t)
     intp_t = context.get_value_type(types.intp)
     uintp_t = context.get_value_type(types.uintp)
+    int32_t = llvmlite.ir.IntType(32)
     intp_ptr_t = llvmlite.ir.PointerType(intp_t)
     intp_ptr_ptr_t = llvmlite.ir.PointerType(intp_ptr_t)
     uintp_ptr_t = llvmlite.ir.PointerType(uintp_t)
@@ -1796,8 +1841,46 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
 
     # Get the current number of threads.
     num_threads = builder.call(get_num_threads, [])
+    schedule_kind = int32_t(_schedule_kinds[schedule])
+    serial = None
+    threshold = config.PARALLEL_SERIAL_THRESHOLD
+    if threshold > 0 and body_cost is not None:
+        # Run the loop serially if its trip count is below this limit.  The
+        # length of each dimension and the trip count are clamped to it, to
+        # avoid overflowing.
+        limit = context.get_constant(
+            types.intp, min(-(-threshold // max(body_cost, 1)), 1 << 31))
+        trip_count = context.get_constant(types.intp, 1)
+        for i in range(num_dim):
+            index = context.get_constant(types.uintp, i)
+            start = builder.load(builder.gep(dim_starts, [index]))
+            stop = builder.load(builder.gep(dim_stops, [index]))
+            length = builder.add(builder.sub(stop, start), one)
+            length = builder.select(
+                builder.icmp_signed('<', length, zero), zero, length)
+            length = builder.select(
+                builder.icmp_signed('<', length, limit), length, limit)
+            trip_count = builder.mul(trip_count, length)
+            trip_count = builder.select(
+                builder.icmp_signed('<', trip_count, limit), trip_count, limit)
+        serial = builder.icmp_signed('<', trip_count, limit)
+        # A single chunk makes the kernel run it on this thread
+        num_threads = builder.select(serial, num_threads.type(1), num_threads)
+        schedule_kind = builder.select(serial, int32_t(0), schedule_kind)
+    if schedule != "static":
+        # The schedule kind is used by get_sched_size and do_scheduling, and
+        # consumed by the parallel_for call of the kernel.
+        set_schedule = cgutils.get_or_insert_function(
+            builder.module,
+            llvmlite.ir.FunctionType(int32_t, [int32_t]),
+            name="set_parallel_schedule")
+        current_schedule = builder.call(set_schedule, [schedule_kind])
     # Get the current chunksize so we can use it and restore the value later.
     current_chunksize = builder.call(get_chunksize, [])
+    if serial is not None:
+        # A chunk size would split the loop in several chunks
+        with builder.if_then(serial):
+            builder.call(set_chunksize, [zero])
 
     with cgutils.if_unlikely(builder, builder.icmp_signed('<=', num_threads,
                                                   num_threads.type(0))):
@@ -1818,8 +1901,6 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
                                                   context.get_constant(types.uintp, num_dim),
                                                   dim_starts,
                                                   dim_stops])
-    # Set the chunksize to zero so that any nested calls get the default chunk size behavior.
-    builder.call(set_chunksize, [zero])
 
     # Each entry in the schedule is 2 times the number of dimensions long.
     multiplier = context.get_constant(types.uintp, num_dim * 2)
@@ -1859,6 +1940,8 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
                 types.uintp, num_dim), dim_starts, dim_stops, num_divisions,
             builder.load(sched), context.get_constant(
                     types.intp, debug_flag)])
+    # Set the chunksize to zero so that any nested calls get the default chunk size behavior.
+    builder.call(set_chunksize, [zero])
 
     # Get the LLVM vars for the Numba IR reduction array vars.
     redarrs = [lowerer.loadvar(redarrdict[x].name) for x in redvars]
@@ -2051,6 +2134,8 @@ def call_parallel_gufunc(lowerer, cres, gu_signature, outer_sig, expr_args, expr
         cgutils.printf(builder, "after calling kernel %p\n", fn)
 
     builder.call(set_chunksize, [current_chunksize])
+    if schedule != "static":
+        builder.call(set_schedule, [current_schedule])
 
     # Deallocate the schedule's memory.
     dealloc_sched_fnty = llvmlite.ir.FunctionType(llvmlite.ir.VoidType(), [sched_ptr_type])
@@ -25,7 +25,8 @@ __all__ = ['ModuleCompiler']
 NULL = ir.Constant(lt._void_star, None)
 ZERO = ir.Constant(lt._int32, 0)
 ONE = ir.Constant(lt._int32, 1)
-METH_VARARGS_AND_KEYWORDS = ir.Constant(lt._int32, 1|2)
+# METH_FASTCALL | METH_KEYWORDS, the calling convention of the wrappers
+METH_FASTCALL_AND_KEYWORDS = ir.Constant(lt._int32, 0x80|2)
 
 
 def get_header():
@@ -264,7 +265,7 @@ class _ModuleCompiler(object):
             method_def_const = ir.Constant.literal_struct(
                 (method_name,
                  ir.Constant.bitcast(lfunc, lt._void_star),
-                 METH_VARARGS_AND_KEYWORDS,
+                 METH_FASTCALL_AND_KEYWORDS,
                  NULL))
             method_defs.append(method_def_const)
 
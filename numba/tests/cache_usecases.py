@@ -62,6 +62,15 @@ def looplifted(n):
     return res
 
 
+@jit(cache=True, forceobj=True)
+def looplifted_c_sin(x):
+    object()
+    res = 0.
+    for i in range(x.size):
+        res = res + c_sin(x[i])
+    return res
+
+
 @jit(cache=True, nopython=True)
 def use_c_sin(x):
     return c_sin(x)
@@ -170,3 +179,11 @@ def self_test():
 @jit(parallel=True, cache=True, nopython=True)
 def parfor_usecase(ary):
     return ary * ary + ary
+
+
+@jit(parallel=True, cache=True, nopython=True)
+def parfor_reduction_usecase(ary):
+    acc = 0.
+    for i in prange(ary.shape[0]):
+        acc += ary[i]
+    return acc
@@ -1,9 +1,14 @@
 """
 Test byteflow.py specific issues
 """
+import gc
 import unittest
+import weakref
+from unittest import mock
 
+from numba import njit
 from numba.tests.support import TestCase
+from numba.core import byteflow, interpreter
 from numba.core.compiler import run_frontend
 
 
@@ -90,5 +95,42 @@ class TestByteFlowIssues(TestCase):
         run_frontend(udt)
 
 
+class TestFlowCache(TestCase):
+
+    def make_function(self):
+        ns = {}
+        exec("def udt(x, k):\n"
+             "    for i in range(3):\n"
+             "        x += k\n"
+             "    return x\n", ns)
+        return ns["udt"]
+
+    def test_reuse(self):
+        # The flow analysis runs once per code object, whatever the function
+        # or the compilation using it
+        udt = self.make_function()
+        udt2 = type(udt)(udt.__code__, udt.__globals__)
+        with mock.patch.object(byteflow.Flow, "run",
+                               autospec=True,
+                               side_effect=byteflow.Flow.run) as run:
+            first = run_frontend(udt)
+            second = run_frontend(udt2)
+            self.assertEqual(njit(udt)(1, 2), 7)
+            self.assertEqual(njit(udt2)(1., 2), 7.)
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(first.dump_to_string(), second.dump_to_string())
+        self.assertIs(second.func_id.func, udt2)
+
+    def test_lifetime(self):
+        # The cache doesn't keep the code object alive
+        udt = self.make_function()
+        self.assertEqual(njit(udt)(1, 2), 7)
+        code = weakref.ref(udt.__code__)
+        self.assertIn(code(), interpreter._flow_cache)
+        del udt
+        gc.collect()
+        self.assertIsNone(code())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,13 +1,18 @@
+import gc
+import hashlib
 import importlib
 import inspect
 import multiprocessing
 import os
+import pickle
 import shutil
+import sqlite3
 import stat
 import subprocess
 import sys
 import traceback
 import unittest
+from unittest import mock
 import warnings
 import zipfile
 from pathlib import Path
@@ -17,13 +22,21 @@ import numpy as np
 from math import floor
 
 from numba import njit
-from numba.core import codegen
+from numba.core import caching, codegen, types
 from numba.core.caching import (
     UserWideCacheLocator,
     ZipCacheLocator,
     FunctionCache,
     InTreeCacheLocator,
     InTreeCacheLocatorFsAgnostic,
+    IndexDataCacheFile,
+    SQLiteCacheFile,
+    _stale_miss_reason,
+    clear_cache_dir,
+    find_cache_dirs,
+    get_cache_dependencies,
+    prune_cache_dir,
+    scan_cache_dir,
 )
 from numba.core.errors import NumbaWarning
 from numba.parfors import parfor
@@ -392,19 +405,80 @@ class TestCache(DispatcherCacheUsecasesTest):
         self.check_pycache(0)
 
     def test_looplifted(self):
-        # Loop-lifted functions can't be cached and raise a warning
+        # Loop-lifted functions are cached along with their lifted loops
         mod = self.import_module()
+        f = mod.looplifted
+        self.assertPreciseEqual(f(4), 6)
+        # 1 index, 1 data for the function and for the loop
+        self.check_pycache(4)
+        [explanation] = f.inspect_cache().values()
+        lines = explanation.splitlines()
+        self.assertEqual(len(lines), 2, explanation)
+        self.assertIn("saved to the cache", lines[0])
+        self.assertIn("loop lifted at line", lines[1])
+        self.assertIn("saved to the cache", lines[1])
+        del mod, f
+        gc.collect()
 
+        mod = self.import_module()
+        f = mod.looplifted
+        self.assertPreciseEqual(f(4), 6)
+        self.check_pycache(4)
+        self.check_hits(f, 1, 0)
+        [explanation] = f.inspect_cache().values()
+        lines = explanation.splitlines()
+        self.assertEqual(lines[0], "loaded from the cache")
+        self.assertIn("loaded from the cache", lines[1])
+
+    def test_looplifted_unpicklable(self):
+        # The lifted loop calls a ctypes function, which cannot be pickled
+        # along with its IR: the function is still compiled and run, but
+        # not cached
+        mod = self.import_module()
+        f = mod.looplifted_c_sin
+        x = np.arange(5.)
         with warnings.catch_warnings(record=True) as w:
             warnings.simplefilter('always', NumbaWarning)
+            self.assertPreciseEqual(f(x), np.sin(x).sum())
+        messages = [str(x.message) for x in w]
+        self.assertIn('Cannot cache compiled function "looplifted_c_sin" '
+                      'as its lifted code is not picklable', messages)
+        self.check_pycache(0)
+        [explanation] = f.inspect_cache().values()
+        self.assertIn("not saved to the cache as its lifted code is not "
+                      "picklable", explanation.splitlines()[0])
 
-            f = mod.looplifted
-            self.assertPreciseEqual(f(4), 6)
-            self.check_pycache(0)
+    def test_inspect_cache(self):
+        mod = self.import_module()
+        sig = (types.int64, types.int64)
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertEqual(f.inspect_cache(sig),
+                         "not loaded from the cache as the function has not "
+                         "been cached yet; saved to the cache")
+        f = mod.add_nocache_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertEqual(f.inspect_cache(),
+                         {sig: "caching is not enabled for this function"})
 
-        self.assertEqual(len(w), 1)
-        self.assertIn('Cannot cache compiled function "looplifted" '
-                      'as it uses lifted code', str(w[0].message))
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertEqual(f.inspect_cache(sig), "loaded from the cache")
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.assertEqual(f.inspect_cache((types.float64, types.int64)),
+                         "not loaded from the cache as no entry for this "
+                         "signature and target; saved to the cache")
+
+        # The source file is modified
+        st = os.stat(self.modfile)
+        os.utime(self.modfile, (st.st_atime + 100, st.st_mtime + 100))
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertEqual(f.inspect_cache(sig),
+                         "not loaded from the cache as the source file has "
+                         "changed since it was cached; saved to the cache")
 
     def test_big_array(self):
         # Code references big array globals cannot be cached
@@ -419,6 +493,8 @@ class TestCache(DispatcherCacheUsecasesTest):
         self.assertEqual(len(w), 1)
         self.assertIn('Cannot cache compiled function "use_big_array" '
                       'as it uses dynamic globals', str(w[0].message))
+        self.assertIn("not saved to the cache as it uses dynamic globals",
+                      f.inspect_cache(()))
 
     def test_ctypes(self):
         # Functions using a ctypes pointer can't be cached and raise
@@ -719,6 +795,430 @@ class TestCache(DispatcherCacheUsecasesTest):
         self.assertIn("cache hits = 1", err.strip())
 
 
+class TestSQLiteCache(DispatcherCacheUsecasesTest):
+    # Same checks as TestCache, using the single-file SQLite backend
+
+    def setUp(self):
+        super().setUp()
+        self._backend_override = override_config("CACHE_BACKEND", "sqlite")
+        self._backend_override.__enter__()
+
+    def tearDown(self):
+        self._backend_override.__exit__(None, None, None)
+        super().tearDown()
+
+    def test_caching(self):
+        self.check_pycache(0)
+        mod = self.import_module()
+        self.check_pycache(0)
+
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertEqual(self.cache_contents(), ["numba_cache.sqlite3"])
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_hits(f, 0, 2)
+
+        f = mod.add_objmode_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_hits(f, 0, 2)
+        # Everything is stored in a single file
+        self.assertEqual(self.cache_contents(), ["numba_cache.sqlite3"])
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.assertPreciseEqual(f(2.5, 3), 6.5)
+        self.check_hits(f, 2, 0)
+
+        # Check the code runs ok from another process
+        self.run_in_separate_process(
+            envvars={"NUMBA_CACHE_BACKEND": "sqlite"})
+
+    def test_cache_invalidate(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+
+        # This should change the functions' results
+        with open(self.modfile, "a") as f:
+            f.write("\nZ = 10\n")
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 15)
+        self.check_hits(f, 0, 1)
+
+    def test_recompile(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+
+        mod = self.import_module()
+        f = mod.add_usecase
+        mod.Z = 10
+        self.assertPreciseEqual(f(2, 3), 6)
+        f.recompile()
+        self.assertPreciseEqual(f(2, 3), 15)
+
+        # Freshly recompiled version is re-used from other imports
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 15)
+        self.check_hits(f, 1, 0)
+
+
+class TestSQLiteCacheFile(TestCase):
+    # Checks the consistency of the SQLite backend's entries
+
+    _numba_parallel_test_ = False
+
+    key = ("sig", "target")
+    filename_base = "mod.f-1.py3"
+
+    def setUp(self):
+        self.cache_path = temp_directory(self.id())
+
+    def make_cache_file(self, stamp):
+        return SQLiteCacheFile(self.cache_path, self.filename_base, stamp)
+
+    def test_outdated_index(self):
+        cache_file = self.make_cache_file("stamp1")
+        cache_file.save(self.key, "data1")
+        self.assertEqual(cache_file.load(self.key), "data1")
+
+        # Another process saves the same overload for an edited source,
+        # reusing the data entry, while the index loaded in bulk by this
+        # process still refers to it
+        code = """if 1:
+            from numba.core.caching import SQLiteCacheFile
+            cache_file = SQLiteCacheFile(%r, %r, "stamp2")
+            cache_file.save(%r, "data2")
+            """ % (self.cache_path, self.filename_base, self.key)
+        subprocess.check_call([sys.executable, "-c", code])
+
+        self.assertIsNone(cache_file.load(self.key))
+        self.assertEqual(cache_file.miss_reason,
+                         "the cached data was replaced by another process")
+        # The index was refreshed
+        self.assertIsNone(cache_file.load(self.key))
+        self.assertEqual(cache_file.miss_reason, _stale_miss_reason)
+        self.assertEqual(self.make_cache_file("stamp2").load(self.key),
+                         "data2")
+
+    def test_atomic_save(self):
+        cache_file = self.make_cache_file("stamp1")
+        cache_file.save(self.key, "data1")
+        store = cache_file._store
+
+        def fail(name, payload):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        other_key = ("sig2", "target")
+        with mock.patch.object(store, "set_data", fail):
+            cache_file.save(other_key, "data2")
+        # The index written before the data was rolled back
+        self.assertIsNone(cache_file.load(other_key))
+        self.assertEqual(cache_file.miss_reason,
+                         "no entry for this signature and target")
+        self.assertEqual(cache_file.load(self.key), "data1")
+
+
+class TestCacheContentHash(DispatcherCacheUsecasesTest):
+
+    def setUp(self):
+        super().setUp()
+        self._hash_override = override_config("CACHE_CONTENT_HASH", 1)
+        self._hash_override.__enter__()
+
+    def tearDown(self):
+        self._hash_override.__exit__(None, None, None)
+        super().tearDown()
+
+    def test_touched_source(self):
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_pycache(2)
+
+        # Changing the file metadata doesn't invalidate the cache
+        st = os.stat(self.modfile)
+        os.utime(self.modfile, (st.st_atime + 100, st.st_mtime + 100))
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 6)
+        self.check_hits(f, 1, 0)
+
+        # Changing the contents does
+        with open(self.modfile, "a") as f:
+            f.write("\nZ = 10\n")
+        mod = self.import_module()
+        f = mod.add_usecase
+        self.assertPreciseEqual(f(2, 3), 15)
+        self.check_hits(f, 0, 1)
+
+    def test_relocated_source(self):
+        # Caches under NUMBA_CACHE_DIR survive moving the sources
+        cache_dir = temp_directory(self.__class__.__name__)
+        with override_config("CACHE_DIR", cache_dir):
+            mod = self.import_module()
+            f = mod.add_usecase
+            self.assertPreciseEqual(f(2, 3), 6)
+            self.check_hits(f, 0, 1)
+
+            newdir = temp_directory(self.__class__.__name__)
+            shutil.copy(self.modfile, newdir)
+            sys.path.remove(self.tempdir)
+            self.tempdir = newdir
+            self.modfile = os.path.join(newdir, self.modname + ".py")
+            sys.path.insert(0, newdir)
+            mod = self.import_module()
+            f = mod.add_usecase
+            self.assertPreciseEqual(f(2, 3), 6)
+            self.check_hits(f, 1, 0)
+
+    def test_scripts_in_different_directories(self):
+        # Scripts of the same name in different directories don't share
+        # their cache under NUMBA_CACHE_DIR
+        cache_dir = temp_directory(self.__class__.__name__)
+        source = """if 1:
+            from numba import njit
+
+            @njit(cache=True)
+            def f(x):
+                return x + %d
+
+            print(f(1), sum(f.stats.cache_hits.values()))
+            """
+        scripts = []
+        for i in range(2):
+            script_dir = temp_directory(self.__class__.__name__)
+            scripts.append(os.path.join(script_dir, "script.py"))
+            with open(scripts[-1], "w") as f:
+                f.write(source % (i,))
+        env = os.environ.copy()
+        env["NUMBA_CACHE_DIR"] = cache_dir
+        env["NUMBA_CACHE_CONTENT_HASH"] = "1"
+
+        def run(script):
+            return subprocess.check_output([sys.executable, script],
+                                           env=env, text=True).split()
+
+        self.assertEqual(run(scripts[0]), ["1", "0"])
+        self.assertEqual(run(scripts[1]), ["2", "0"])
+        self.assertEqual(run(scripts[0]), ["1", "1"])
+        self.assertEqual(run(scripts[1]), ["2", "1"])
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+    def test_package_subpath(self):
+        # The cache subpath of a module is derived from its package, not
+        # from where it is installed
+        get_subpath = caching._CacheLocator.get_suitable_cache_subpath
+        func = caching.Cache.__init__
+        expected = "core_" + hashlib.sha1(b"numba/core").hexdigest()
+        self.assertEqual(get_subpath(caching.__file__, func), expected)
+
+    def test_source_stamp(self):
+        def mock_func():
+            return 42
+
+        locator = InTreeCacheLocator(mock_func, __file__)
+        with open(__file__, "rb") as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+        self.assertEqual(locator.get_source_stamp(), ("sha256", expected))
+        locator = InTreeCacheLocatorFsAgnostic(mock_func, __file__)
+        self.assertEqual(locator.get_source_stamp(), ("sha256", expected))
+
+
+class TestCacheEviction(DispatcherCacheUsecasesTest):
+
+    def setUp(self):
+        super().setUp()
+        # Forget the directories pruned by the other tests
+        patcher = mock.patch.dict(caching._last_pruned, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_stale_entries(self):
+        # An index from another Numba version and an unreferenced data file
+        with open(os.path.join(self.cache_dir, "old-1.py39.nbi"), "wb") as f:
+            pickle.dump("0.1.0", f, protocol=-1)
+            f.write(b"garbage")
+        with open(os.path.join(self.cache_dir, "old-1.py39.1.nbc"),
+                  "wb") as f:
+            f.write(b"garbage")
+
+    def age_entry(self, entry, seconds):
+        t = entry.last_used - seconds
+        if entry.backend is SQLiteCacheFile:
+            with sqlite3.connect(entry.path) as conn:
+                conn.execute("UPDATE numba_data SET mtime = ? "
+                             "WHERE name = ?", (t, entry.name))
+            conn.close()
+        else:
+            os.utime(entry.path, (t, t))
+
+    def data_entries(self):
+        # Data stored in the cache directory, sorted by name
+        return sorted((e for e in scan_cache_dir(self.cache_dir)
+                       if e.kind == 'data' and e.status != 'missing'),
+                      key=lambda e: e.name)
+
+    def run_cache_command(self, *args):
+        cmdline = [sys.executable, "-m", "numba", "cache"]
+        cmdline.extend(args)
+        cmdline.append(self.tempdir)
+        return subprocess.run(cmdline, stdout=subprocess.PIPE,
+                              stderr=subprocess.STDOUT, text=True)
+
+    def check_prune_then_verify(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3)
+        old, new = self.data_entries()
+        self.age_entry(old, 7200)
+        res = self.run_cache_command("prune", "--max-age", "3600")
+        self.assertEqual(res.returncode, 0, res.stdout)
+        self.assertIn("Removed 1 entries", res.stdout)
+        # The index doesn't refer to the evicted data anymore
+        statuses = sorted((e.kind, e.status)
+                          for e in scan_cache_dir(self.cache_dir))
+        self.assertEqual(statuses, [("data", "valid"), ("index", "valid")])
+        res = self.run_cache_command("verify")
+        self.assertEqual(res.returncode, 0, res.stdout)
+        # The evicted overload is compiled again, the other one is loaded
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3)
+        self.check_hits(mod.add_usecase, 1, 1)
+        self.assertEqual(len(self.data_entries()), 2)
+
+    def test_scan(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3)
+        entries = scan_cache_dir(self.cache_dir)
+        self.assertEqual(sorted(e.kind for e in entries),
+                         ["data", "data", "index"])
+        self.assertTrue(all(e.status == "valid" for e in entries))
+
+        self.make_stale_entries()
+        os.unlink(self.data_entries()[0].path)
+        statuses = sorted((e.kind, e.status)
+                          for e in scan_cache_dir(self.cache_dir))
+        self.assertEqual(statuses, [("data", "missing"), ("data", "orphan"),
+                                    ("data", "valid"), ("index", "obsolete"),
+                                    ("index", "valid")])
+
+    def test_prune_stale(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        self.make_stale_entries()
+        self.check_pycache(4)
+        removed = prune_cache_dir(self.cache_dir)
+        self.assertEqual(sorted(e.name for e in removed),
+                         ["old-1.py39.1.nbc", "old-1.py39.nbi"])
+        self.check_pycache(2)
+        # The valid entry is still used
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        self.check_hits(mod.add_usecase, 1, 0)
+
+    def test_prune_max_age(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3)
+        old, new = self.data_entries()
+        self.age_entry(old, 7200)
+        removed = prune_cache_dir(self.cache_dir, max_age=3600)
+        self.assertEqual([e.name for e in removed], [old.name])
+        self.assertEqual([e.name for e in self.data_entries()], [new.name])
+
+    def test_prune_max_bytes(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_usecase(2.5, 3)
+        mod.add_objmode_usecase(2, 3)
+        entries = scan_cache_dir(self.cache_dir)
+        total = sum(e.size for e in entries)
+        data = self.data_entries()
+        # Make the least recently used entry explicit
+        self.age_entry(data[1], 100)
+        self.assertEqual(prune_cache_dir(self.cache_dir, dry_run=True,
+                                         max_bytes=total), [])
+        removed = prune_cache_dir(self.cache_dir, max_bytes=total - 1)
+        self.assertEqual([e.name for e in removed], [data[1].name])
+        self.check_pycache(4)
+
+    def test_load_updates_last_used(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        [entry] = self.data_entries()
+        self.age_entry(entry, 100)
+        with override_config("CACHE_MAX_AGE", 3600):
+            mod = self.import_module()
+            mod.add_usecase(2, 3)
+        self.check_hits(mod.add_usecase, 1, 0)
+        [touched] = self.data_entries()
+        self.assertGreater(touched.last_used, entry.last_used - 100)
+
+    def test_eviction_on_save(self):
+        with override_config("CACHE_MAX_BYTES", 1):
+            mod = self.import_module()
+            mod.add_usecase(2, 3)
+        # The data could not fit the cache and was evicted
+        self.assertEqual(self.data_entries(), [])
+        self.make_stale_entries()
+        with override_config("CACHE_MAX_AGE", 3600):
+            mod = self.import_module()
+            mod.add_usecase(2, 3)
+            # The directory was pruned by this process too recently
+            self.check_pycache(4)
+            with mock.patch.object(caching, "_prune_interval", 0):
+                mod.add_usecase(2.5, 3)
+        self.check_pycache(3)
+        self.assertEqual(len(self.data_entries()), 2)
+
+    def test_prune_then_verify(self):
+        self.check_prune_then_verify()
+
+    def test_clear(self):
+        mod = self.import_module()
+        mod.add_usecase(2, 3)
+        mod.add_objmode_usecase(2, 3)
+        self.make_stale_entries()
+        self.assertEqual(len(clear_cache_dir(self.cache_dir, dry_run=True)),
+                         6)
+        self.check_pycache(6)
+        self.assertEqual(len(clear_cache_dir(self.cache_dir)), 6)
+        self.check_pycache(0)
+
+    def test_sqlite_backend(self):
+        with override_config("CACHE_BACKEND", "sqlite"):
+            mod = self.import_module()
+            mod.add_usecase(2, 3)
+            mod.add_usecase(2.5, 3)
+        entries = scan_cache_dir(self.cache_dir)
+        self.assertEqual(sorted(e.kind for e in entries),
+                         ["data", "data", "index"])
+        self.assertTrue(all(e.status == "valid" for e in entries))
+        total = sum(e.size for e in entries)
+        old, new = self.data_entries()
+        removed = prune_cache_dir(self.cache_dir, max_bytes=total - 1)
+        self.assertEqual(len(removed), 1)
+        self.assertEqual(len(self.data_entries()), 1)
+        self.assertTrue(all(e.status == "valid"
+                            for e in scan_cache_dir(self.cache_dir)))
+        self.assertEqual(len(clear_cache_dir(self.cache_dir)), 2)
+        self.assertEqual(scan_cache_dir(self.cache_dir), [])
+        self.assertEqual(list(find_cache_dirs([self.tempdir])),
+                         [self.cache_dir])
+
+    def test_sqlite_prune_then_verify(self):
+        with override_env_config("NUMBA_CACHE_BACKEND", "sqlite"):
+            self.check_prune_then_verify()
+
+
 class TestCacheZip(DispatcherCacheUsecasesTest):
 
     def setUp(self):
@@ -828,6 +1328,19 @@ class TestSequentialParForsCache(DispatcherCacheUsecasesTest):
         self.assertEqual(dynamic_globals, [False])
         self.check_pycache(2)  # 1 index, 1 data
 
+    def test_reduction(self):
+        mod = self.import_module()
+        self.check_pycache(0)
+        f = mod.parfor_reduction_usecase
+        ary = np.arange(10.)
+        self.assertPreciseEqual(f(ary), ary.sum())
+        self.check_pycache(2)  # 1 index, 1 data
+
+        mod = self.import_module()
+        f = mod.parfor_reduction_usecase
+        self.assertPreciseEqual(f(ary), ary.sum())
+        self.check_hits(f, 1, 0)
+
 
 class TestCacheWithCpuSetting(DispatcherCacheUsecasesTest):
     # Disable parallel testing due to envvars modification
@@ -1081,6 +1594,116 @@ def cache_file_collision_tester(q, tempdir, modname_bar1, modname_bar2):
     q.put(r2)
 
 
+class TestCacheDependencies(TestCase):
+    # A cached function is invalidated when a function it calls, defined in
+    # another module, changes.
+
+    _numba_parallel_test_ = False
+
+    callee_source = """
+from numba import njit
+from numba.extending import overload
+
+def generic(x):
+    pass
+
+@overload(generic)
+def ol_generic(x):
+    def impl(x):
+        return x * %(factor)d
+    return impl
+
+@njit
+def inner(x):
+    return x + %(offset)d
+"""
+
+    caller_source = """
+from numba import njit
+from dependency_test_callee import inner, generic
+
+@njit(cache=True)
+def outer_dispatcher(x):
+    return inner(x)
+
+@njit(cache=True)
+def outer_overload(x):
+    return generic(x)
+"""
+
+    def setUp(self):
+        self.tempdir = temp_directory('test_cache_dependencies')
+        sys.path.insert(0, self.tempdir)
+        self.write_callee(offset=1, factor=2)
+        with open(os.path.join(self.tempdir,
+                               'dependency_test_caller.py'), 'w') as fout:
+            fout.write(self.caller_source)
+
+    def tearDown(self):
+        for modname in ('dependency_test_caller', 'dependency_test_callee'):
+            sys.modules.pop(modname, None)
+        sys.path.remove(self.tempdir)
+
+    def write_callee(self, **kwargs):
+        path = os.path.join(self.tempdir, 'dependency_test_callee.py')
+        with open(path, 'w') as fout:
+            fout.write(self.callee_source % kwargs)
+
+    def import_caller(self):
+        for modname in ('dependency_test_caller', 'dependency_test_callee'):
+            sys.modules.pop(modname, None)
+        return import_dynamic('dependency_test_caller')
+
+    def check_hits(self, func, hits, misses):
+        st = func.stats
+        self.assertEqual(sum(st.cache_hits.values()), hits, st.cache_hits)
+        self.assertEqual(sum(st.cache_misses.values()), misses,
+                         st.cache_misses)
+
+    def test_dispatcher_dependency(self):
+        mod = self.import_caller()
+        self.assertEqual(mod.outer_dispatcher(1), 2)
+        self.check_hits(mod.outer_dispatcher, 0, 1)
+
+        mod = self.import_caller()
+        self.assertEqual(mod.outer_dispatcher(1), 2)
+        self.check_hits(mod.outer_dispatcher, 1, 0)
+
+        self.write_callee(offset=100, factor=2)
+        mod = self.import_caller()
+        self.assertEqual(mod.outer_dispatcher(1), 101)
+        self.check_hits(mod.outer_dispatcher, 0, 1)
+
+        # The updated entry is reused
+        mod = self.import_caller()
+        self.assertEqual(mod.outer_dispatcher(1), 101)
+        self.check_hits(mod.outer_dispatcher, 1, 0)
+
+    def test_overload_dependency(self):
+        mod = self.import_caller()
+        self.assertEqual(mod.outer_overload(3), 6)
+        self.check_hits(mod.outer_overload, 0, 1)
+
+        mod = self.import_caller()
+        self.assertEqual(mod.outer_overload(3), 6)
+        self.check_hits(mod.outer_overload, 1, 0)
+
+        self.write_callee(offset=1, factor=300)
+        mod = self.import_caller()
+        self.assertEqual(mod.outer_overload(3), 900)
+        self.check_hits(mod.outer_overload, 0, 1)
+
+    def test_get_cache_dependencies(self):
+        mod = self.import_caller()
+        mod.outer_dispatcher(1)
+        mod.outer_overload(1)
+        for func in (mod.outer_dispatcher, mod.outer_overload):
+            [cres] = func.overloads.values()
+            deps = get_cache_dependencies(cres)
+            self.assertIn('dependency_test_callee', deps)
+            self.assertFalse(any(m.startswith('numba') for m in deps))
+
+
 class TestCacheMultipleFilesWithSignature(unittest.TestCase):
     # Regression test for https://github.com/numba/numba/issues/3658
 
@@ -1258,6 +1881,38 @@ class TestCacheLocatorEnvironmentIntegration(TestCase):
         self.assertIsInstance(cache._impl.locator, expectedLocator)
 
 
+class TestCacheBackendEnvironmentIntegration(TestCase):
+
+    def test_backend_env_override_unknown(self):
+        def mock_func():
+            return 42
+
+        with override_env_config("NUMBA_CACHE_BACKEND", "foo"):
+            with self.assertRaises(RuntimeError):
+                FunctionCache(mock_func)
+
+    def test_backend_env_override(self):
+        def mock_func():
+            return 42
+
+        with override_env_config("NUMBA_CACHE_BACKEND", "sqlite"):
+            cache = FunctionCache(mock_func)
+            self.assertIsInstance(cache._cache_file, SQLiteCacheFile)
+
+        with override_env_config("NUMBA_CACHE_BACKEND",
+                                 "numba.core.caching.SQLiteCacheFile"):
+            cache = FunctionCache(mock_func)
+            self.assertIsInstance(cache._cache_file, SQLiteCacheFile)
+
+    def test_default_backend(self):
+        def mock_func():
+            return 42
+
+        cache = FunctionCache(mock_func)
+        self.assertIsInstance(cache._cache_file, IndexDataCacheFile)
+        self.assertNotIsInstance(cache._cache_file, SQLiteCacheFile)
+
+
 class TestInTreeCacheLocatorFsAgnostic(TestCase):
     """Test _InTreeCacheLocatorFsAgnostic class functionality."""
 
@@ -5,6 +5,7 @@ import subprocess
 import sys
 import threading
 import json
+import pickle
 from subprocess import CompletedProcess
 from tempfile import TemporaryDirectory
 from unittest import mock
@@ -116,6 +117,54 @@ class TestCLI(TestCase):
         self.assertIn("Numba printing extension support", o)
 
 
+class TestCacheCLI(TestCase):
+
+    def make_cache_dir(self, d):
+        cache_dir = os.path.join(d, "pkg", "__pycache__")
+        os.makedirs(cache_dir)
+        # An unreferenced data file and an index from another Numba version
+        with open(os.path.join(cache_dir, "mod.f-1.py39.1.nbc"), "wb") as f:
+            f.write(b"x" * 100)
+        with open(os.path.join(cache_dir, "mod.f-1.py39.nbi"), "wb") as f:
+            pickle.dump("0.1.0", f)
+        return cache_dir
+
+    def test_stats(self):
+        with TemporaryDirectory() as d:
+            cache_dir = self.make_cache_dir(d)
+            cmdline = [sys.executable, "-m", "numba", "cache", "stats", d]
+            o, _ = run_cmd(cmdline)
+            self.assertIn(f"{cache_dir}: 1 indices, 1 entries", o)
+
+    def test_verify(self):
+        with TemporaryDirectory() as d:
+            cache_dir = self.make_cache_dir(d)
+            cmdline = [sys.executable, "-m", "numba", "cache", "verify", d]
+            with self.assertRaises(AssertionError) as raises:
+                run_cmd(cmdline)
+            self.assertIn("process failed with code 1", str(raises.exception))
+            # Clean up and verify again
+            cmdline = [sys.executable, "-m", "numba", "cache", "prune", d]
+            o, _ = run_cmd(cmdline)
+            self.assertIn(f"{cache_dir}: Removed 2 entries", o)
+            self.assertEqual(os.listdir(cache_dir), [])
+            cmdline = [sys.executable, "-m", "numba", "cache", "verify", d]
+            run_cmd(cmdline)
+
+    def test_clear(self):
+        with TemporaryDirectory() as d:
+            cache_dir = self.make_cache_dir(d)
+            cmdline = [sys.executable, "-m", "numba", "cache", "clear", "-n",
+                       d]
+            o, _ = run_cmd(cmdline)
+            self.assertIn(f"{cache_dir}: Would remove 2 entries", o)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            cmdline = [sys.executable, "-m", "numba", "cache", "clear", d]
+            o, _ = run_cmd(cmdline)
+            self.assertIn(f"{cache_dir}: Removed 2 entries", o)
+            self.assertEqual(os.listdir(cache_dir), [])
+
+
 class TestGDBCLIInfo(TestCase):
 
     def setUp(self):
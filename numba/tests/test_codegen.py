@@ -18,7 +18,8 @@ import unittest
 from numba import njit
 from numba.core.codegen import JITCPUCodegen
 from numba.core.compiler_lock import global_compiler_lock
-from numba.tests.support import TestCase
+from numba.core.errors import NumbaWarning
+from numba.tests.support import TestCase, override_config, temp_directory
 
 
 asm_sum = r"""
@@ -207,6 +208,61 @@ class JITCPUCodegenTestCase(TestCase):
         self.assertIs(v(), None)
 
 
+class TestLinkBySymbol(TestCase):
+    """
+    Test NUMBA_LINK_BY_SYMBOL, with which the callees of JIT compiled
+    functions are not linked into their callers.
+    """
+
+    def compile_chain(self):
+        @njit
+        def leaf(x):
+            return x * 2 + 1
+
+        @njit
+        def caller(x):
+            return leaf(x) + leaf(x + 1)
+
+        self.assertEqual(caller(3), 16)
+        return leaf, caller
+
+    def test_callee_not_linked(self):
+        with override_config('LINK_BY_SYMBOL', True):
+            leaf, caller = self.compile_chain()
+        leaf_name = leaf.overloads[leaf.signatures[0]].fndesc.mangled_name
+        library = caller.overloads[caller.signatures[0]].library
+        self.assertTrue(library.has_symbol_links)
+        # The callee is declared but not defined in the caller's module
+        self.assertTrue(library.get_function(leaf_name).is_declaration)
+
+    def test_callee_linked_by_default(self):
+        with override_config('LINK_BY_SYMBOL', False):
+            leaf, caller = self.compile_chain()
+        leaf_name = leaf.overloads[leaf.signatures[0]].fndesc.mangled_name
+        library = caller.overloads[caller.signatures[0]].library
+        self.assertFalse(library.has_symbol_links)
+        # The callee is linked in (and usually inlined)
+        declared = [fn.name for fn in library._final_module.functions
+                    if fn.is_declaration]
+        self.assertNotIn(leaf_name, declared)
+
+    def test_not_cachable(self):
+        cache_dir = temp_directory(self.__class__.__name__)
+        with override_config('LINK_BY_SYMBOL', True), \
+                override_config('CACHE_DIR', cache_dir):
+            leaf, _ = self.compile_chain()
+
+            def caller(x):
+                return leaf(x) - 1
+
+            cfunc = njit(cache=True)(caller)
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter('always', NumbaWarning)
+                self.assertEqual(cfunc(3), 6)
+        self.assertTrue(any('calls other functions by symbol' in str(x.message)
+                            for x in w))
+
+
 class TestWrappers(TestCase):
 
     def test_noinline_on_main_call(self):
@@ -0,0 +1,173 @@
+import json
+import os
+
+import numpy as np
+
+import numba
+from numba import njit
+from numba.core import compile_profile, event as ev
+from numba.tests.support import TestCase, run_in_subprocess, temp_directory
+import unittest
+
+
+def callee(x):
+    return x * 2
+
+
+def caller(arr):
+    s = 0.
+    for x in arr:
+        s += numba_callee(x)
+    return s
+
+
+numba_callee = njit(callee)
+
+
+class TestCompileProfile(TestCase):
+
+    def setUp(self):
+        self.was_enabled = compile_profile.is_enabled()
+        compile_profile.enable()
+        # Only look at the compilations made by the test
+        numba.compile_profile(reset=True)
+
+    def tearDown(self):
+        if not self.was_enabled:
+            compile_profile.disable()
+
+    def compile_caller(self):
+        # Compile the callee again too
+        global numba_callee
+        numba_callee = njit(callee)
+        cfunc = njit(caller)
+        cfunc(np.arange(3.))
+        return numba.compile_profile()
+
+    def test_records(self):
+        profile = self.compile_caller()
+        caller_name = "%s.caller" % (__name__,)
+        callee_name = "%s.callee" % (__name__,)
+        functions = profile.functions()
+        self.assertIn(caller_name, functions)
+        self.assertIn(callee_name, functions)
+
+        func = functions[caller_name]
+        self.assertEqual(func["compilations"], 1)
+        self.assertEqual(func["cache_loads"], 0)
+        passes = func["passes"]
+        self.assertIn("nopython_type_inference", passes)
+        self.assertIn("native_lowering", passes)
+        self.assertIn("Module passes (full optimization)", passes)
+        self.assertAlmostEqual(func["time"],
+                               sum(stats["time"] for stats in passes.values()))
+        if compile_profile.resource is not None:
+            self.assertGreater(func["peak_rss"], 0)
+            self.assertGreaterEqual(func["rss_growth"], 0)
+
+        records = [rec for rec in profile.records
+                   if rec.function == caller_name]
+        [compile_rec] = [rec for rec in records if rec.kind == "compile"]
+        self.assertEqual(compile_rec.args,
+                         str((numba.typeof(np.arange(3.)),)))
+        # The callee is compiled while typing the caller, its time is not
+        # included in the caller's
+        [typing] = [rec for rec in records
+                    if rec.name == "nopython_type_inference"]
+        callee_time = sum(rec.self_duration for rec in profile.records
+                          if rec.function == callee_name)
+        self.assertGreaterEqual(typing.duration,
+                                typing.self_duration + callee_time * 0.99)
+        for rec in profile.records:
+            self.assertGreaterEqual(rec.self_duration, 0)
+            self.assertGreaterEqual(rec.duration, rec.self_duration)
+
+        # The summary per pass covers all the functions
+        summary = profile.passes()
+        self.assertEqual(summary["compile"]["count"], 2)
+        self.assertEqual(sum(stats["count"] for stats in summary.values()),
+                         len(profile))
+        self.assertIn(caller_name, profile.report())
+
+    def test_reset(self):
+        self.compile_caller()
+        self.assertGreater(len(numba.compile_profile(reset=True)), 0)
+        self.assertEqual(len(numba.compile_profile()), 0)
+
+    def test_disabled(self):
+        compile_profile.disable()
+        try:
+            with self.assertRaises(RuntimeError) as raises:
+                numba.compile_profile()
+            self.assertIn("NUMBA_COMPILE_PROFILE", str(raises.exception))
+            njit(callee)(1)
+        finally:
+            compile_profile.enable()
+        self.assertEqual(len(numba.compile_profile()), 0)
+
+    def test_export(self):
+        profile = self.compile_caller()
+        tempdir = temp_directory("test_compile_profile")
+
+        path = os.path.join(tempdir, "profile.json")
+        profile.to_json(path)
+        with open(path) as f:
+            doc = json.load(f)
+        self.assertEqual(doc["pid"], os.getpid())
+        self.assertEqual(len(doc["records"]), len(profile))
+        self.assertEqual(list(doc["functions"]), list(profile.functions()))
+        self.assertEqual(json.loads(profile.to_json()), doc)
+
+        path = os.path.join(tempdir, "trace.json")
+        profile.to_chrome_trace(path)
+        with open(path) as f:
+            trace = json.load(f)
+        self.assertEqual(len(trace), len(profile))
+        for event, rec in zip(trace, profile.records):
+            self.assertEqual(event["ph"], "X")
+            self.assertEqual(event["cat"], rec.kind)
+            self.assertEqual(event["tid"], rec.thread)
+            self.assertEqual(event["name"],
+                             "%s [%s]" % (rec.name, rec.function))
+            self.assertAlmostEqual(event["dur"], rec.duration * 1e6)
+
+    def test_environment_variable(self):
+        code = """if 1:
+            import numba
+            from numba import njit
+
+            @njit
+            def foo(x):
+                return x + 1
+
+            foo(1)
+            print("__main__.foo" in numba.compile_profile().functions())
+            """
+        env = os.environ.copy()
+        env["NUMBA_COMPILE_PROFILE"] = "1"
+        out, _ = run_in_subprocess(code, env=env)
+        self.assertEqual(out.decode().strip(), "True")
+
+
+class TestLLVMPassEvent(TestCase):
+
+    def test_llvm_pass_event(self):
+        @njit
+        def foo(x):
+            return x + x
+
+        with ev.install_recorder("numba:llvm_pass") as rec:
+            foo(1)
+        names = [event.data["pass_name"] for _, event in rec.buffer
+                 if event.is_start]
+        self.assertIn("Function passes", names)
+        self.assertIn("Module passes (full optimization)", names)
+        self.assertIn("Finalize object", names)
+        for _, event in rec.buffer:
+            self.assertEqual(event.data["name"], "%s [%s]"
+                             % (event.data["pass_name"],
+                                event.data["library"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
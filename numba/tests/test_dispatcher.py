@@ -1,17 +1,22 @@
 import multiprocessing
+import os
 import platform
+import sys
 import threading
 import pickle
 import weakref
 from itertools import chain
 from io import StringIO
+from unittest import mock
 
 import numpy as np
 
-from numba import njit, jit, typeof, vectorize
-from numba.core import types, errors
+from numba import njit, jit, typeof, vectorize, precompile_all
+from numba.core import types, errors, interpreter, config
+from numba.core.compiler_lock import global_compiler_lock
 from numba import _dispatcher
-from numba.tests.support import TestCase, captured_stdout
+from numba.tests.support import (TestCase, captured_stdout, override_config,
+                                 import_dynamic, temp_directory)
 from numba.np.numpy_support import as_dtype
 from numba.core.dispatcher import Dispatcher
 from numba.extending import overload
@@ -691,6 +696,102 @@ class TestDispatcherMethods(TestCase):
         self.assertPreciseEqual(foo(1), 3)
         self.assertPreciseEqual(foo(1.5), 3)
 
+    def test_compile_async(self):
+        @jit(nopython=True)
+        def foo(x):
+            return x + 1
+
+        futures = foo.compile_async(["int64(int64)", "float64(float64)"])
+        self.assertEqual(len(futures), 2)
+        for fut in futures:
+            self.assertIsNotNone(fut.result())
+        self.assertEqual(sorted(map(str, foo.signatures)),
+                         ["(float64,)", "(int64,)"])
+        self.assertPreciseEqual(foo(1), 2)
+        self.assertPreciseEqual(foo(1.5), 2.5)
+        # Nothing was compiled at call time
+        self.assertEqual(len(foo.signatures), 2)
+
+    def test_compile_async_error(self):
+        @jit(nopython=True)
+        def foo(x):
+            return x.does_not_exist
+
+        [fut] = foo.compile_async(["int64(int64)"])
+        with self.assertRaises(errors.TypingError):
+            fut.result()
+
+    def test_precompile_all(self):
+        @jit(nopython=True)
+        def foo(x):
+            return x + 1
+
+        @jit(nopython=True)
+        def bar(x, y):
+            return foo(x) * y
+
+        futures = precompile_all({foo: "int64(int64)",
+                                  bar: ["int64(int64, int64)",
+                                        "float64(float64, float64)"]},
+                                 max_workers=2)
+        self.assertEqual(len(futures), 3)
+        self.assertTrue(all(fut.done() for fut in futures))
+        self.assertEqual(len(foo.signatures), 2)
+        self.assertEqual(len(bar.signatures), 2)
+        self.assertPreciseEqual(bar(2, 3), 9)
+
+        @jit(nopython=True)
+        def baz(x):
+            return x.does_not_exist
+
+        with self.assertRaises(errors.TypingError):
+            precompile_all([(baz, ["int64(int64)"])])
+
+    def test_precompile_all_processes(self):
+        source = """if 1:
+            from numba import njit
+
+            @njit(cache=True)
+            def add(x, y):
+                return x + y
+
+            @njit(cache=True)
+            def broken(x):
+                return x.does_not_exist
+            """
+        tempdir = temp_directory('test_precompile_all')
+        modname = "precompile_all_test_fodder"
+        with open(os.path.join(tempdir, modname + ".py"), "w") as f:
+            f.write(source)
+        sys.path.insert(0, tempdir)
+        self.addCleanup(sys.path.remove, tempdir)
+        self.addCleanup(sys.modules.pop, modname, None)
+        mod = import_dynamic(modname)
+
+        @jit(nopython=True)
+        def neg(x):
+            return -x
+
+        sigs = ["int64(int64, int64)", "float64(float64, float64)"]
+        futures = precompile_all({mod.add: sigs, neg: "int64(int64)"},
+                                 max_workers=2, processes=True)
+        self.assertEqual(len(futures), 3)
+        # The worker processes saved the overloads of the cached function to
+        # the disk cache, this process loaded them
+        self.assertEqual(sum(mod.add.stats.cache_hits.values()), 2)
+        self.assertEqual(sum(mod.add.stats.cache_misses.values()), 0)
+        self.assertPreciseEqual(mod.add(1, 2), 3)
+        # The other function was compiled by this process
+        self.assertEqual(len(neg.signatures), 1)
+        self.assertPreciseEqual(neg(1), -1)
+
+        # The worker's failure is logged and the function compiled again
+        # by this process, which raises the actual error
+        with self.assertLogs('numba.core.dispatcher', 'DEBUG') as logs:
+            with self.assertRaises(errors.TypingError):
+                precompile_all({mod.broken: "int64(int64)"}, processes=True)
+        self.assertIn("warming the cache for broken", logs.output[0])
+
     def test_inspect_llvm(self):
         # Create a jited function
         @jit
@@ -1134,6 +1235,148 @@ def _checker(f1, arg):
     assert f1(arg) == f1.py_func(arg)
 
 
+_reuse_ir_global = 1
+
+
+def reuse_ir_usecase(a, b):
+    s = 0
+    for x in a:
+        if x > b:
+            s += x * _reuse_ir_global
+    return s
+
+
+class TestUntypedIRReuse(TestCase):
+    """Test that the bytecode of a function is only translated once for all
+    its signatures.
+    """
+
+    def count_translations(self, func, *argsets):
+        orig = interpreter.Interpreter.interpret
+        with mock.patch.object(interpreter.Interpreter, 'interpret',
+                               autospec=True, side_effect=orig) as mocked:
+            results = [func(*args) for args in argsets]
+        count = sum(1 for c in mocked.call_args_list
+                    if c.args[0].func_id.func is func.py_func)
+        return count, results
+
+    def test_new_signatures(self):
+        cfunc = njit(reuse_ir_usecase)
+        argsets = [(np.arange(5), 2), (np.arange(5.), 2.5),
+                   (np.arange(5, dtype=np.int32), 2), ([1, 2, 3], 1)]
+        count, results = self.count_translations(cfunc, *argsets)
+        self.assertEqual(count, 1)
+        self.assertEqual(len(cfunc.overloads), 4)
+        for args, got in zip(argsets, results):
+            self.assertPreciseEqual(got, reuse_ir_usecase(*args))
+
+    def test_rebound_global(self):
+        global _reuse_ir_global
+        cfunc = njit(reuse_ir_usecase)
+        self.assertEqual(cfunc(np.arange(5), 2), 7)
+        _reuse_ir_global = 10
+        try:
+            count, results = self.count_translations(
+                cfunc, (np.arange(5.), 2.5), (np.arange(5.), 0))
+        finally:
+            _reuse_ir_global = 1
+        # The IR is translated again once to capture the new value
+        self.assertEqual(count, 1)
+        self.assertEqual(results, [70., 100.])
+        # Already compiled signatures keep the value they were compiled with
+        self.assertEqual(cfunc(np.arange(5), 2), 7)
+
+    def test_rebound_freevar(self):
+        k = 2
+
+        def inner(x):
+            return x * k
+
+        cfunc = njit(inner)
+        self.assertEqual(cfunc(3), 6)
+        k = 3
+        self.assertEqual(cfunc(3.0), 9.0)
+
+    def test_object_mode(self):
+        cfunc = jit(forceobj=True)(reuse_ir_usecase)
+        count, _ = self.count_translations(cfunc, (np.arange(5), 2),
+                                           (np.arange(5.), 2.5))
+        self.assertEqual(count, 2)
+
+
+class TestTieredCompilation(TestCase):
+    """Test dispatchers compiling a quick first version of each overload,
+    replaced by a fully optimized one compiled in the background.
+    """
+
+    def check_dispatched(self, cfunc, cres):
+        # The C dispatcher holds the given overload's entry point
+        self.assertTrue(cfunc._replace(cres.entry_point, cres.entry_point))
+
+    def test_reoptimized(self):
+        cfunc = njit(tiered=True)(reuse_ir_usecase)
+        arr = np.arange(10.)
+        expected = reuse_ir_usecase(arr, 2.5)
+        self.assertPreciseEqual(cfunc(arr, 2.5), expected)
+        [tier1] = cfunc.overloads.values()
+        self.assertEqual(tier1.library._opt_level, config.TIERED_OPT)
+
+        cfunc.wait_reoptimized()
+        [cres] = cfunc.overloads.values()
+        self.assertIsNot(cres, tier1)
+        self.assertIsNone(cres.library._opt_level)
+        self.assertEqual(cres.signature, tier1.signature)
+        self.check_dispatched(cfunc, cres)
+        self.assertFalse(cfunc._replace(tier1.entry_point, tier1.entry_point))
+        self.assertPreciseEqual(cfunc(arr, 2.5), expected)
+
+        # Callers compiled from now on link in the fully optimized version
+        self.assertIn(cres.entry_point, cfunc.targetctx._defns)
+        self.assertNotIn(tier1.entry_point, cfunc.targetctx._defns)
+
+        @njit
+        def caller(arr, b):
+            return cfunc(arr, b) + 1
+
+        self.assertPreciseEqual(caller(arr, 2.5), expected + 1)
+
+    def test_discarded(self):
+        cfunc = njit(tiered=True)(reuse_ir_usecase)
+        arr = np.arange(10)
+        # Hold the compiler lock so that the first recompilation cannot start
+        # before the overloads are reset
+        with global_compiler_lock:
+            self.assertEqual(cfunc(arr, 2), 42)
+            [tier1] = cfunc.overloads.values()
+            cfunc.recompile()
+            [other] = cfunc.overloads.values()
+        self.assertIsNot(other, tier1)
+        cfunc.wait_reoptimized()
+        [cres] = cfunc.overloads.values()
+        self.assertIsNone(cres.library._opt_level)
+        self.assertEqual(cfunc._tier1_overloads, [other])
+        self.check_dispatched(cfunc, cres)
+        self.assertEqual(cfunc(arr, 2), 42)
+
+    def test_cached_once(self):
+        cfunc = njit(tiered=True)(reuse_ir_usecase)
+        with mock.patch.object(cfunc._cache, 'save_overload') as mocked:
+            cfunc(np.arange(10), 2)
+            cfunc.wait_reoptimized()
+        [cres] = cfunc.overloads.values()
+        mocked.assert_called_once_with((types.Array(types.int64, 1, 'C'),
+                                        types.int64), cres)
+
+    def test_not_tiered(self):
+        # Pointless when the first tier is as optimized as the second
+        with override_config('TIERED_OPT', config.OPT):
+            cfunc = njit(tiered=True)(reuse_ir_usecase)
+            self.assertEqual(cfunc(np.arange(10), 2), 42)
+        [cres] = cfunc.overloads.values()
+        self.assertIsNone(cres.library._opt_level)
+        self.assertEqual(cfunc._reoptimizations, {})
+
+
 class TestMultiprocessingDefaultParameters(SerialMixin, unittest.TestCase):
     def run_fc_multiproc(self, fc):
         try:
@@ -1168,6 +1411,204 @@ class TestMultiprocessingDefaultParameters(SerialMixin, unittest.TestCase):
         self.run_fc_multiproc(add_func)
 
 
+class TestDispatcherInlineCache(TestCase):
+    """
+    Check the overload resolved through the inline cache of the dispatcher
+    is the right one, when argument types vary from call to call.
+    """
+
+    def test_scalars_and_tuples(self):
+        @njit
+        def ident(x):
+            return x
+
+        values = [1, 2.5, 1j, True, None, (1, 2), (1, 2.5), (1.5, 2),
+                  (), (None, False), np.int32(3), np.float32(1.5),
+                  np.bool_(True)]
+        for _ in range(3):
+            for v in values:
+                self.assertPreciseEqual(ident(v), v)
+        self.assertEqual(set(ident.signatures),
+                         set((typeof(v),) for v in values))
+
+    def test_arrays(self):
+        @njit
+        def array_info(a, b):
+            return (a.ndim, a.flags.c_contiguous, a.flags.f_contiguous,
+                    a.itemsize, b)
+
+        arrays = [np.zeros(3), np.zeros(3, dtype=np.int32),
+                  np.zeros((2, 2)), np.zeros((2, 2), order='F'),
+                  np.zeros((2, 4))[:, ::2], np.zeros(3, dtype=np.int16),
+                  np.zeros(3, dtype=np.uint8)]
+        ro = np.zeros(3)
+        ro.flags.writeable = False
+        arrays.append(ro)
+        for _ in range(3):
+            for a in arrays:
+                expected = (a.ndim, a.flags.c_contiguous, a.flags.f_contiguous,
+                            a.itemsize, 1)
+                self.assertEqual(array_info(a, 1), expected)
+        self.assertEqual(set(array_info.signatures),
+                         set((typeof(a), types.intp) for a in arrays))
+
+    def test_disable_compile(self):
+        @njit
+        def ident(x):
+            return x
+
+        self.assertPreciseEqual(ident(1.5), 1.5)
+        ident.disable_compile()
+        # An unsafe conversion is used when compilation is disabled
+        self.assertPreciseEqual(ident(2), 2.0)
+        self.assertPreciseEqual(ident(2), 2.0)
+        ident.disable_compile(False)
+        self.assertPreciseEqual(ident(2), 2)
+        self.assertPreciseEqual(ident(2), 2)
+        self.assertEqual(len(ident.signatures), 2)
+
+    def test_recompile(self):
+        y = 1
+
+        @njit
+        def add_y(x):
+            return x + y
+
+        self.assertPreciseEqual(add_y(1), 2)
+        y = 2
+        add_y.recompile()
+        self.assertPreciseEqual(add_y(1), 3)
+
+
+class TestVectorcall(TestCase):
+    """
+    Check the vectorcall entry points of dispatchers and compiled overloads.
+    """
+
+    def test_dispatcher_supports_vectorcall(self):
+        @njit
+        def ident(x):
+            return x
+
+        # Py_TPFLAGS_HAVE_VECTORCALL is set on the Python subclasses too
+        self.assertTrue(type(ident).__flags__ & (1 << 11))
+        self.assertTrue(_dispatcher.Dispatcher.__flags__ & (1 << 11))
+
+    def test_folded_arguments(self):
+        @njit
+        def f(a, b=2, *args):
+            return a + b + len(args)
+
+        self.assertPreciseEqual(f(1), 3)
+        self.assertPreciseEqual(f(1, 3), 4)
+        self.assertPreciseEqual(f(1, b=4), 5)
+        self.assertPreciseEqual(f(b=4, a=1), 5)
+        self.assertPreciseEqual(f(1, 2, 3, 4), 5)
+        with self.assertRaises(TypeError) as raises:
+            f()
+        self.assertIn("not enough arguments", str(raises.exception))
+        with self.assertRaises(TypeError) as raises:
+            f(1, c=2)
+        self.assertIn("some keyword arguments unexpected",
+                      str(raises.exception))
+
+    def test_entry_point(self):
+        @njit
+        def add(x, y):
+            return x + y
+
+        add(1, 2)
+        entry_point = add.overloads[add.signatures[0]].entry_point
+        self.assertPreciseEqual(entry_point(3, 4), 7)
+        with self.assertRaises(TypeError) as raises:
+            entry_point(3)
+        self.assertRegex(str(raises.exception),
+                         r"\badd expected 2 arguments, got 1$")
+        with self.assertRaises(TypeError) as raises:
+            entry_point(3, 4, 5)
+        self.assertRegex(str(raises.exception),
+                         r"\badd expected 2 arguments, got 3$")
+
+    def test_generator(self):
+        @njit
+        def gen(n):
+            for i in range(n):
+                yield i * 2
+
+        self.assertEqual(list(gen(4)), [0, 2, 4, 6])
+
+    def test_object_mode(self):
+        @jit(forceobj=True)
+        def obj(x, y):
+            return object(), x + y
+
+        self.assertEqual(obj(1, y=2)[1], 3)
+        self.assertEqual(obj("a", "b")[1], "ab")
+
+
+class TestBatchCall(TestCase):
+    """
+    Tests for Dispatcher.batch() and Dispatcher.map().
+    """
+
+    def test_batch(self):
+        @njit
+        def muladd(x, y):
+            return x * y + 1
+
+        arglist = [(1, 2), (3, 4.5), (np.float32(1.5), 2), (1j, 2), (5, 6)]
+        self.assertPreciseEqual(muladd.batch(arglist),
+                                [muladd.py_func(*args) for args in arglist])
+        self.assertEqual(set(muladd.signatures),
+                         set(tuple(map(typeof, args)) for args in arglist))
+        # Any iterable of tuples is accepted
+        self.assertPreciseEqual(muladd.batch(iter([(1, 2)])), [3])
+        self.assertPreciseEqual(muladd.batch([]), [])
+
+    def test_folded_arguments(self):
+        @njit
+        def f(a, b=2, *args):
+            return a + b + len(args)
+
+        self.assertPreciseEqual(f.batch([(1,), (1, 3), (1, 2, 3, 4)]),
+                                [3, 4, 5])
+
+    def test_errors(self):
+        @njit
+        def div(x, y):
+            return x // y
+
+        with self.assertRaises(TypeError) as raises:
+            div.batch([(1, 2), [3, 4]])
+        self.assertIn("argument sets must be tuples, got list",
+                      str(raises.exception))
+        with self.assertRaises(ZeroDivisionError):
+            div.batch([(1, 2), (3, 0)])
+        with self.assertRaises(TypeError) as raises:
+            div.batch([(1,)])
+        self.assertIn("not enough arguments", str(raises.exception))
+
+    def test_map(self):
+        @njit
+        def scale(x, factor=2):
+            return x * factor
+
+        self.assertPreciseEqual(scale.map([1.0, 2.0, 3.0]), [2.0, 4.0, 6.0])
+        self.assertPreciseEqual(scale.map([1, 2, 3], [3, 4]), [3, 8])
+
+    def test_max_workers(self):
+        @njit(nogil=True)
+        def square(x):
+            return x * x
+
+        arglist = [(i,) for i in range(103)]
+        expected = [i * i for i in range(103)]
+        self.assertPreciseEqual(square.batch(arglist, max_workers=4),
+                                expected)
+        self.assertPreciseEqual(square.map(range(103), max_workers=8),
+                                expected)
+
+
 class TestVectorizeDifferentTargets(unittest.TestCase):
     """Test that vectorize can be reapplied if the target is different
     """
@@ -166,6 +166,24 @@ class TestEvent(TestCase):
             float,
         )
 
+    def test_failed_event(self):
+        @njit
+        def foo(x):
+            return x.undefined_attribute
+
+        with ev.install_recorder("numba:compile") as rec:
+            with self.assertRaises(Exception):
+                foo(1)
+
+        [(_, start), (_, end)] = rec.buffer
+        self.assertFalse(start.is_failed)
+        self.assertTrue(end.is_failed)
+
+        with ev.install_recorder("numba:compile") as rec:
+            njit(lambda x: x)(1)
+
+        self.assertFalse(any(evt.is_failed for _, evt in rec.buffer))
+
     def test_timing_properties(self):
         a = tuple(string.ascii_lowercase)
 
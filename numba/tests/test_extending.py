@@ -7,6 +7,7 @@ import multiprocessing
 import ctypes
 import warnings
 import re
+from unittest import mock
 
 import numpy as np
 from llvmlite import ir
@@ -1294,6 +1295,143 @@ def run_caching_overload_method(q, cache_dir):
         _assert_cache_stats(cfunc, 1, 0)
 
 
+class TestOverloadResolutionCache(TestCase):
+    """
+    Tests that overloads resolved for the same argument types are reused
+    across call sites and functions.
+    """
+
+    def test_resolution_cache_bounded(self):
+        from numba.core.typing.templates import _ResolutionCache
+
+        cache = _ResolutionCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        # 'b' is the least recently used entry
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_inline_overload_typed_once(self):
+        from numba.core.inline_closurecall import InlineWorker
+
+        def myfunc(x):
+            pass
+
+        def impl(x):
+            return x + 1
+
+        @overload(myfunc, inline='always')
+        def ol_myfunc(x):
+            return impl
+
+        @njit
+        def foo(x):
+            return myfunc(x) + myfunc(x)
+
+        @njit
+        def bar(x):
+            return myfunc(x) * 2
+
+        orig = InlineWorker.run_untyped_passes
+        with mock.patch.object(InlineWorker, 'run_untyped_passes',
+                               autospec=True, side_effect=orig) as mocked:
+            self.assertEqual(foo(1), 4)
+            self.assertEqual(bar(1), 4)
+            self.assertEqual(foo(1.5), 5.0)
+
+        calls = [c for c in mocked.call_args_list if c.args[1] is impl]
+        # once for intp and once for float64
+        self.assertEqual(len(calls), 2)
+
+    def test_resolved_template_reused(self):
+        from numba.core.typing.templates import _OverloadFunctionTemplate
+
+        def myfunc(x):
+            pass
+
+        @overload(myfunc)
+        def ol_myfunc_float(x):
+            if isinstance(x, types.Float):
+                return lambda x: x - 1
+
+        @overload(myfunc)
+        def ol_myfunc_int(x):
+            if isinstance(x, types.Integer):
+                return lambda x: x + 1
+
+        @njit
+        def foo(x):
+            return myfunc(x)
+
+        @njit
+        def bar(x):
+            return myfunc(x) + myfunc(x)
+
+        orig = _OverloadFunctionTemplate.generic
+        with mock.patch.object(_OverloadFunctionTemplate, 'generic',
+                               autospec=True, side_effect=orig) as mocked:
+            self.assertEqual(foo(1), 2)
+            self.assertEqual(bar(1), 4)
+            self.assertEqual(bar(1.5), 1.0)
+
+        attempts = [(type(c.args[0])._overload_func.__name__, c.args[1])
+                    for c in mocked.call_args_list]
+        rejected = [(name, args) for name, args in attempts
+                    if ((name == 'ol_myfunc_float') !=
+                        (args == (types.float64,)))]
+        # The template rejecting a call is tried (with and without literals)
+        # for the first call site only, later call sites reuse the template
+        # that accepted the same argument types.
+        self.assertEqual(len(rejected), 2)
+        self.assertEqual(len(attempts), 7)
+
+    def test_resolved_templates_bounded(self):
+        from numba.core.typing import templates
+
+        def myfunc(x):
+            pass
+
+        @overload(myfunc)
+        def ol_myfunc_float(x):
+            if isinstance(x, types.Float):
+                return lambda x: x - 1
+
+        @overload(myfunc)
+        def ol_myfunc_int(x):
+            if isinstance(x, types.Integer):
+                return lambda x: x + 1
+
+        @njit
+        def foo(x):
+            return myfunc(x) * 2
+
+        @njit
+        def bar(x):
+            return myfunc(x)
+
+        cache = templates._ResolutionCache(maxsize=1)
+        orig = templates._OverloadFunctionTemplate.generic
+        with mock.patch.object(templates, '_resolved_templates', cache), \
+                mock.patch.object(templates._OverloadFunctionTemplate,
+                                  'generic', autospec=True,
+                                  side_effect=orig) as mocked:
+            self.assertEqual(foo(1), 4)
+            self.assertEqual(bar(1), 2)
+            self.assertEqual(len(cache), 1)
+
+        rejected = [c for c in mocked.call_args_list
+                    if type(c.args[0])._overload_func is ol_myfunc_float]
+        # The template accepting the call was evicted by the resolution of
+        # the multiplication, so the rejecting template is tried again for
+        # the second function.
+        self.assertEqual(len(rejected), 4)
+
+
 class TestIntrinsic(TestCase):
     def test_void_return(self):
         """
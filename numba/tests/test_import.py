@@ -23,13 +23,14 @@ class TestNumbaImport(TestCase):
                    'numba.core.typing.collections',
                    'numba.core.typing.listdecl',
                    'numba.np.types.datetime_registry',
+                   'yaml',
                    ]
 
         # Sanity check the modules still exist...
         for mod in banlist:
             distutils_check = (mod != 'distutils' or
                                utils.PYVERSION < (3, 12))
-            if mod not in ('cffi',) and distutils_check:
+            if mod not in ('cffi', 'yaml') and distutils_check:
                 __import__(mod)
 
         code = """if 1:
@@ -75,7 +76,9 @@ class TestNumbaImport(TestCase):
                    'numba.np.npyimpl',
                    'numba.typed.typeddict',
                    'numba.typed.typedlist',
-                   'numba.experimental.jitclass.base',]
+                   'numba.experimental.jitclass.base',
+                   'numba.experimental.jitclass.overloads',
+                   'numba.np.ufunc.reductionimpl',]
 
         code1 = """if 1:
             import sys
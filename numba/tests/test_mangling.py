@@ -5,6 +5,7 @@ The mangling affects the ABI of numba compiled binaries.
 """
 from numba.core import types
 from numba.core.funcdesc import default_mangler
+from numba.core.itanium_mangler import demangle_identifier
 from numba.tests.support import unittest, TestCase
 
 
@@ -36,6 +37,16 @@ class TestMangling(TestCase):
         # ensure result chars are in the right charset
         self.assertRegex(name, r'^_Z[a-zA-Z0-9_\$]+$')
 
+    def test_demangle_identifier(self):
+        argtypes = types.int32, types.Array(types.float64, 1, 'C')
+        for fname in ('foo', 'mod.sub.foo', 'mod.outer.<locals>.inner'):
+            name = default_mangler(fname, argtypes, abi_tags=('tag',))
+            self.assertEqual(demangle_identifier(name), fname)
+            self.assertEqual(demangle_identifier('cpython.' + name),
+                             'cpython.' + fname)
+        self.assertIsNone(demangle_identifier('NRT_decref'))
+        self.assertIsNone(demangle_identifier('_Z9foo'))
+
 
 if __name__ == '__main__':
     unittest.main()
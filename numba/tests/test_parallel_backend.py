@@ -66,6 +66,9 @@ _parfors_unsupported = _32bit
 
 _HAVE_OS_FORK = not _windows
 
+skip_unless_linux = unittest.skipUnless(sys.platform.startswith('linux'),
+                                        "Linux only")
+
 
 # some functions to jit
 
@@ -423,11 +426,6 @@ class TestSpecificBackend(TestInSubprocess, TestParallelBackendBase):
                             sys.platform.startswith('linux')):
                         continue
 
-                    # workqueue is not thread safe
-                    if (p in ('threading', 'random') and
-                            backend == 'workqueue'):
-                        continue
-
                     cls._inject(p, name, backend, backend_guard)
 
 
@@ -655,9 +653,9 @@ class TestMiscBackendIssues(ThreadLayerTestHelper):
         env['NUMBA_NUM_THREADS'] = "1"
         self.run_cmd(cmdline, env=env)
 
-    def test_workqueue_aborts_on_nested_parallelism(self):
+    def test_workqueue_nested_parallelism(self):
         """
-        Tests workqueue raises sigabrt if a nested parallel call is performed
+        Tests workqueue runs a nested parallel region serially
         """
         runme = """if 1:
             from numba import njit, prange
@@ -668,33 +666,71 @@ class TestMiscBackendIssues(ThreadLayerTestHelper):
                 for i in prange(len(x)):
                     x[i] += 1
 
+            @njit(parallel=True)
+            def nested_sum(x):
+                acc = 0.
+                for i in prange(len(x)):
+                    acc += x[i]
+                return acc
 
             @njit(parallel=True)
             def main():
                 Z = np.zeros((5, 10))
                 for i in prange(Z.shape[0]):
                     nested(Z[i])
-                return Z
+                S = np.zeros(Z.shape[0])
+                for i in prange(Z.shape[0]):
+                    S[i] = nested_sum(Z[i])
+                return Z, S
 
-            main()
+            Z, S = main()
+            np.testing.assert_equal(Z, np.ones((5, 10)))
+            np.testing.assert_equal(S, np.full(5, 10.))
         """
         cmdline = [sys.executable, '-c', runme]
         env = os.environ.copy()
         env['NUMBA_THREADING_LAYER'] = "workqueue"
         env['NUMBA_NUM_THREADS'] = "4"
+        self.run_cmd(cmdline, env=env)
 
-        try:
-            out, err = self.run_cmd(cmdline, env=env)
-        except AssertionError as e:
-            if self._DEBUG:
-                print(out, err)
-            e_msg = str(e)
-            self.assertIn("failed with code", e_msg)
-            # raised a SIGABRT, but the value is platform specific so just check
-            # the error message
-            expected = ("Numba workqueue threading layer is terminating: "
-                        "Concurrent access has been detected.")
-            self.assertIn(expected, e_msg)
+    def test_workqueue_concurrent_access(self):
+        """
+        Tests workqueue can be used concurrently by several Python threads
+        """
+        runme = """if 1:
+            import threading
+            from numba import njit, prange, threading_layer
+            import numpy as np
+
+            @njit(parallel=True, nogil=True)
+            def work(x):
+                acc = 0.
+                for i in prange(len(x)):
+                    acc += np.sqrt(x[i])
+                return acc
+
+            x = np.arange(100000.)
+            expected = work.py_func(x)
+            results = []
+
+            def run():
+                for _ in range(50):
+                    results.append(work(x))
+
+            threads = [threading.Thread(target=run) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert len(results) == 200
+            np.testing.assert_allclose(results, expected)
+            assert threading_layer() == "workqueue"
+        """
+        cmdline = [sys.executable, '-c', runme]
+        env = os.environ.copy()
+        env['NUMBA_THREADING_LAYER'] = "workqueue"
+        env['NUMBA_NUM_THREADS'] = "4"
+        self.run_cmd(cmdline, env=env)
 
     @unittest.skipUnless(_HAVE_OS_FORK, "Test needs fork(2)")
     def test_workqueue_handles_fork_from_non_main_thread(self):
@@ -738,6 +774,185 @@ class TestMiscBackendIssues(ThreadLayerTestHelper):
         self.run_cmd(cmdline, env=env)
 
 
+@skip_parfors_unsupported
+class TestThreadAffinity(ThreadLayerTestHelper):
+    """
+    Tests the pinning of the threads to CPUs and the first-touch allocator
+    """
+
+    _DEBUG = False
+
+    # Two sockets of two cores with two hardware threads each
+    topology = {0: (0, 0), 1: (0, 1), 2: (1, 0), 3: (1, 1),
+                4: (0, 0), 5: (0, 1), 6: (1, 0), 7: (1, 1)}
+
+    def test_order_cpus(self):
+        from numba.np.ufunc.parallel import _order_cpus
+        cpus = sorted(self.topology)
+        self.assertEqual(_order_cpus('compact', cpus, self.topology),
+                         [0, 4, 1, 5, 2, 6, 3, 7])
+        self.assertEqual(_order_cpus('scatter', cpus, self.topology),
+                         [0, 2, 1, 3, 4, 6, 5, 7])
+
+    def test_parse_cpu_list(self):
+        from numba.np.ufunc.parallel import _parse_cpu_list
+        self.assertEqual(_parse_cpu_list("0,2,4-7"), [0, 2, 4, 5, 6, 7])
+        self.assertEqual(_parse_cpu_list(" 3 "), [3])
+        for text in ("", "a", "1-", "0,,1", "-1"):
+            with self.assertRaises(ValueError) as raises:
+                _parse_cpu_list(text)
+            self.assertIn("Invalid thread affinity", str(raises.exception))
+
+    def test_invalid_affinity(self):
+        from numba.np.ufunc.parallel import _get_affinity_cpus
+        self.assertEqual(_get_affinity_cpus(None), [])
+        self.assertEqual(_get_affinity_cpus("none"), [])
+        with self.assertRaises(ValueError) as raises:
+            _get_affinity_cpus([1 << 20])
+        self.assertIn("is not available to the process",
+                      str(raises.exception))
+        with self.assertRaises(TypeError):
+            _get_affinity_cpus([0.5])
+
+    def run_pinned(self, backend):
+        if len(os.sched_getaffinity(0)) < 2:
+            self.skipTest("needs at least 2 CPUs")
+        runme = """if 1:
+            import os
+            import threading
+            import numpy as np
+            from numba import njit, prange, set_thread_affinity
+            from numba import threading_layer
+
+            @njit(parallel=True)
+            def work(a):
+                for i in prange(a.size):
+                    a[i] += np.sqrt(i)
+
+            def masks():
+                result = {}
+                for tid in os.listdir("/proc/self/task"):
+                    path = "/proc/self/task/%%s/status" %% tid
+                    with open(path) as f:
+                        for line in f:
+                            if line.startswith("Cpus_allowed_list:"):
+                                result[int(tid)] = line.split()[1]
+                return result
+
+            main = os.getpid()
+            initial = masks()[main]
+            cpu = str(max(os.sched_getaffinity(0)))
+            set_thread_affinity([int(cpu)])
+            work(np.zeros(100000))
+            assert threading_layer() == "%s"
+            assert cpu in masks().values(), (cpu, masks())
+            # The thread launching the region is not pinned
+            assert masks()[main] == initial, (initial, masks())
+            set_thread_affinity(None)
+            work(np.zeros(100000))
+            # TBB may not run the loop on all of its threads
+            if threading_layer() == "tbb":
+                assert initial in masks().values(), (initial, masks())
+            else:
+                assert set(masks().values()) == {initial}, (initial, masks())
+
+            # Nor is another Python thread launching a region
+            launched = []
+
+            def launch():
+                work(np.zeros(100000))
+                launched.append(masks()[threading.get_native_id()])
+
+            set_thread_affinity([int(cpu)])
+            t = threading.Thread(target=launch)
+            t.start()
+            t.join()
+            assert launched == [initial], (initial, launched)
+        """ % (backend,)
+        cmdline = [sys.executable, '-c', runme]
+        env = os.environ.copy()
+        env['NUMBA_THREADING_LAYER'] = backend
+        env['NUMBA_NUM_THREADS'] = "4"
+        out, err = self.run_cmd(cmdline, env=env)
+        if self._DEBUG:
+            print(out, err)
+
+    @skip_unless_linux
+    def test_workqueue_pinned(self):
+        self.run_pinned("workqueue")
+
+    @skip_no_omp
+    @skip_unless_linux
+    def test_omp_pinned(self):
+        self.run_pinned("omp")
+
+    @skip_no_tbb
+    @skip_unless_linux
+    def test_tbb_pinned(self):
+        self.run_pinned("tbb")
+
+    def test_thread_affinity_env(self):
+        runme = """if 1:
+            import numpy as np
+            from numba import njit, prange
+
+            @njit(parallel=True)
+            def work(a):
+                for i in prange(a.size):
+                    a[i] += 1
+                return a
+
+            np.testing.assert_equal(work(np.zeros(1000)), np.ones(1000))
+        """
+        cmdline = [sys.executable, '-c', runme]
+        env = os.environ.copy()
+        env['NUMBA_THREADING_LAYER'] = "workqueue"
+        for affinity in ("compact", "scatter", "0"):
+            env['NUMBA_THREAD_AFFINITY'] = affinity
+            self.run_cmd(cmdline, env=env)
+        env['NUMBA_THREAD_AFFINITY'] = "nonsense"
+        with self.assertRaises(AssertionError) as raises:
+            self.run_cmd(cmdline, env=env)
+        self.assertIn("Invalid thread affinity 'nonsense'",
+                      str(raises.exception))
+
+    def test_first_touch_allocator(self):
+        runme = """if 1:
+            import numpy as np
+            from numba import njit, prange
+            from numba.core.runtime import rtsys, _nrt_python
+            from numba.typed import List
+
+            @njit(parallel=True)
+            def work(n):
+                a = np.ones(n)
+                b = np.empty(n)
+                for i in prange(n):
+                    b[i] = a[i] * i
+                return b
+
+            @njit
+            def grow(n):
+                lst = List()
+                for i in range(n):
+                    lst.append(i)
+                return lst[n - 1]
+
+            for n in (10, 1000000):
+                np.testing.assert_equal(work(n), np.arange(n, dtype=float))
+                assert grow(n) == n - 1
+            _nrt_python.memsys_enable_stats()
+            before = rtsys.get_allocation_stats()
+            work(1000000)
+            after = rtsys.get_allocation_stats()
+            assert after.alloc - before.alloc == after.free - before.free
+        """
+        cmdline = [sys.executable, '-c', runme]
+        env = os.environ.copy()
+        env['NUMBA_PARALLEL_FIRST_TOUCH'] = "1"
+        self.run_cmd(cmdline, env=env)
+
+
 # 32bit or windows py27 (not that this runs on windows)
 @skip_parfors_unsupported
 @skip_unless_gnu_omp
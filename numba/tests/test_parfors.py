@@ -4,6 +4,7 @@
 #
 
 
+import ctypes
 import math
 import os
 import re
@@ -12,6 +13,7 @@ import numbers
 import platform
 import sys
 import subprocess
+import textwrap
 import types as pytypes
 import warnings
 from functools import reduce
@@ -30,6 +32,7 @@ from numba import (njit, prange, parallel_chunksize,
 from numba.core import (types, errors, ir, rewrites,
                         typed_passes, inline_closurecall, config, compiler, cpu)
 from numba.typed import Dict, List
+from numba.experimental import structref
 
 from numba.extending import (overload_method, register_model,
                              typeof_impl, unbox, NativeValue, models)
@@ -4682,6 +4685,512 @@ class TestParforChunksizing(TestCase):
         self.assertIn(msg, str(raised.exception))
 
 
+def _ragged_sum(a):
+    # The cost of iteration i grows with i, leaving the threads given the
+    # last iterations by a static schedule with most of the work
+    out = np.empty(a.size)
+    total = 0.
+    for i in prange(a.size):
+        x = 0.
+        for j in range(i):
+            x += a[j] * a[i - j]
+        out[i] = x
+        total += x
+    return total, out
+
+
+@skip_parfors_unsupported
+class TestParforSchedule(TestCase):
+    """
+    Tests the static, dynamic and guided schedules of parallel loops.
+    """
+    _numba_parallel_test_ = False
+
+    def setUp(self):
+        set_parallel_chunksize(0)
+
+    def tearDown(self):
+        set_parallel_chunksize(0)
+
+    def get_schedule(self, kind, num_threads, starts, ends, chunksize=0):
+        """
+        Compute the schedule of the loop nest from *starts* to *ends*
+        (inclusive) with the gufunc scheduler, as a list of (starts, ends)
+        chunks.
+        """
+        from numba.np.ufunc import workqueue as lib
+        from numba.parfors.parfor_lowering import _schedule_kinds
+        c_intp_p = ctypes.POINTER(ctypes.c_ssize_t)
+        set_schedule = ctypes.CFUNCTYPE(
+            ctypes.c_int, ctypes.c_int)(lib.set_parallel_schedule)
+        set_chunksize = ctypes.CFUNCTYPE(
+            ctypes.c_size_t, ctypes.c_size_t)(lib.set_parallel_chunksize)
+        get_sched_size = ctypes.CFUNCTYPE(
+            ctypes.c_size_t, ctypes.c_size_t, ctypes.c_size_t, c_intp_p,
+            c_intp_p)(lib.get_sched_size)
+        do_scheduling = ctypes.CFUNCTYPE(
+            None, ctypes.c_size_t, c_intp_p, c_intp_p, ctypes.c_size_t,
+            c_intp_p, ctypes.c_ssize_t)(lib.do_scheduling_signed)
+
+        ndim = len(starts)
+        starts = (ctypes.c_ssize_t * ndim)(*starts)
+        ends = (ctypes.c_ssize_t * ndim)(*ends)
+        old_kind = set_schedule(_schedule_kinds[kind])
+        old_chunksize = set_chunksize(chunksize)
+        try:
+            n = get_sched_size(num_threads, ndim, starts, ends)
+            sched = (ctypes.c_ssize_t * (2 * ndim * n))()
+            do_scheduling(ndim, starts, ends, n, sched, 0)
+        finally:
+            set_schedule(old_kind)
+            set_chunksize(old_chunksize)
+        sched = list(sched)
+        return [(tuple(sched[2 * ndim * i:2 * ndim * i + ndim]),
+                 tuple(sched[2 * ndim * i + ndim:2 * ndim * (i + 1)]))
+                for i in range(n)]
+
+    def check_coverage(self, chunks, shape):
+        counts = np.zeros(shape, dtype=np.intp)
+        for starts, ends in chunks:
+            counts[tuple(slice(s, e + 1) for s, e in zip(starts, ends))] += 1
+        np.testing.assert_equal(counts, 1)
+
+    def chunk_sizes(self, chunks):
+        return [int(np.prod([e - s + 1 for s, e in zip(starts, ends)]))
+                for starts, ends in chunks if starts <= ends]
+
+    def test_static_schedule(self):
+        chunks = self.get_schedule("static", 4, (0,), (999,))
+        self.assertEqual(self.chunk_sizes(chunks), [250] * 4)
+
+    def test_dynamic_schedule(self):
+        # Many more chunks than threads by default
+        chunks = self.get_schedule("dynamic", 4, (0,), (999,))
+        self.assertEqual(len(chunks), 64)
+        self.check_coverage(chunks, (1000,))
+        # Chunks of chunksize iterations
+        chunks = self.get_schedule("dynamic", 4, (0,), (999,), chunksize=30)
+        self.assertEqual(len(chunks), 34)
+        self.check_coverage(chunks, (1000,))
+        self.assertLessEqual(max(self.chunk_sizes(chunks)), 30)
+        # No more chunks than iterations, but at least one per thread
+        chunks = self.get_schedule("dynamic", 4, (0,), (9,))
+        self.assertEqual(len(chunks), 10)
+        self.check_coverage(chunks, (10,))
+        chunks = self.get_schedule("dynamic", 4, (0,), (1,))
+        self.assertEqual(len(chunks), 4)
+        self.check_coverage(chunks, (2,))
+        chunks = self.get_schedule("dynamic", 4, (0, 0), (36, 52))
+        self.check_coverage(chunks, (37, 53))
+
+    def test_guided_schedule(self):
+        for n, chunksize in [(1000, 0), (1000, 7), (997, 0), (5, 0),
+                             (100000, 0)]:
+            chunks = self.get_schedule("guided", 4, (0,), (n - 1,),
+                                       chunksize=chunksize)
+            self.check_coverage(chunks, (n,))
+            sizes = self.chunk_sizes(chunks)
+            # Decreasing sizes from half of an even share
+            self.assertLessEqual(sizes[0], -(-n // 8))
+            self.assertEqual(sizes[:-1], sorted(sizes[:-1], reverse=True))
+            self.assertGreaterEqual(min(sizes[:-1] or [1]),
+                                    max(chunksize, 1))
+            self.assertGreaterEqual(len(chunks), 4)
+        # Only the longest dimension is split
+        chunks = self.get_schedule("guided", 4, (0, 0), (36, 52))
+        self.check_coverage(chunks, (37, 53))
+        for starts, ends in chunks:
+            self.assertEqual((starts[0], ends[0]), (0, 36))
+        # Nothing to do
+        chunks = self.get_schedule("guided", 4, (0,), (-1,))
+        self.assertEqual(self.chunk_sizes(chunks), [])
+
+    def test_prange_schedule(self):
+        a = np.random.ranf(300)
+        expected = _ragged_sum(a)
+        for schedule in ("static", "dynamic", "guided"):
+            ns = {"np": np, "prange": prange}
+            exec(textwrap.dedent("""
+                def ragged_sum(a):
+                    out = np.empty(a.size)
+                    total = 0.
+                    for i in prange(a.size, schedule=%r):
+                        x = 0.
+                        for j in range(i):
+                            x += a[j] * a[i - j]
+                        out[i] = x
+                        total += x
+                    return total, out
+                """ % (schedule,)), ns)
+            for parallel in (True, False):
+                cfunc = njit(parallel=parallel)(ns["ragged_sum"])
+                for chunksize in (0, 7):
+                    with parallel_chunksize(chunksize):
+                        total, out = cfunc(a)
+                    self.assertPreciseEqual(out, expected[1])
+                    np.testing.assert_allclose(total, expected[0])
+            # The plain Python function runs too
+            total, out = ns["ragged_sum"](a)
+            self.assertPreciseEqual(out, expected[1])
+
+    def test_parallel_option(self):
+        m = np.random.ranf((37, 53))
+
+        def array_expr(m):
+            return np.sin(m) + 1
+
+        def loop_nest(m):
+            out = np.empty_like(m)
+            for i in prange(m.shape[0]):
+                for j in prange(m.shape[1]):
+                    out[i, j] = m[i, j] * (i + j)
+            return out
+
+        for schedule in ("static", "dynamic", "guided"):
+            for pyfunc in (array_expr, loop_nest):
+                cfunc = njit(parallel={"schedule": schedule})(pyfunc)
+                np.testing.assert_allclose(cfunc(m), pyfunc(m))
+
+    def test_different_schedules(self):
+        # Loops with different schedules aren't fused
+        @njit(parallel=True)
+        def two_loops(n):
+            a = np.empty(n)
+            for i in prange(n, schedule="dynamic"):
+                a[i] = i
+            b = np.empty(n)
+            for i in prange(n):
+                b[i] = a[i] * 2
+            return b
+
+        np.testing.assert_equal(two_loops(100), np.arange(100.) * 2)
+        diagnostics = two_loops.get_metadata(
+            two_loops.signatures[0])["parfor_diagnostics"]
+        self.assertEqual(dict(diagnostics.fusion_info), {})
+        self.assertIn("- fusion failed: schedule mismatch",
+                      [report.message
+                       for report in diagnostics.fusion_reports])
+
+    def test_invalid_schedule(self):
+        with self.assertRaises(ValueError) as raises:
+            njit(parallel={"schedule": "random"})(lambda: None)()
+        self.assertIn("Unknown parallel schedule 'random'",
+                      str(raises.exception))
+
+        @njit(parallel=True)
+        def unknown(n):
+            s = 0
+            for i in prange(n, schedule="random"):
+                s += i
+            return s
+
+        with self.assertRaises(errors.UnsupportedRewriteError) as raises:
+            unknown(10)
+        self.assertIn("The schedule of prange must be one of",
+                      str(raises.exception))
+
+        @njit(parallel=True)
+        def not_constant(n, schedule):
+            s = 0
+            for i in prange(n, schedule=schedule):
+                s += i
+            return s
+
+        with self.assertRaises(errors.TypingError) as raises:
+            not_constant(10, "dynamic")
+        self.assertIn('"schedule" must be a string literal',
+                      str(raises.exception))
+
+
+@skip_parfors_unsupported
+class TestParforLaunch(TestCase):
+    """
+    Tests the fast paths of the launch of parallel regions.
+    """
+    _numba_parallel_test_ = False
+
+    _envvars = {"NUMBA_NUM_THREADS": "4",
+                "NUMBA_PARALLEL_SERIAL_THRESHOLD": "1000"}
+
+    @TestCase.run_test_in_subprocess(envvars=_envvars)
+    def test_serial_below_threshold(self):
+        from numba import get_thread_id, threading_layer
+
+        @njit(parallel=True)
+        def thread_ids(n):
+            out = np.empty(n, np.int64)
+            for i in prange(n):
+                out[i] = get_thread_id()
+            return out
+
+        @njit(parallel=True)
+        def nested_loop(n):
+            out = np.zeros(n, np.int64)
+            for i in prange(n):
+                for j in range(2):
+                    out[i] += get_thread_id()
+            return out
+
+        self.assertEqual(set(thread_ids(10)), {0})
+        # The body with a loop has no cost estimate
+        if threading_layer() != "tbb":
+            self.assertGreater(len(set(thread_ids(100000))), 1)
+            self.assertGreater(len(set(nested_loop(10))), 1)
+
+    @TestCase.run_test_in_subprocess(envvars=_envvars)
+    def test_serial_reductions(self):
+        @njit(parallel=True)
+        def reductions(a):
+            s = 0.
+            m = 1.
+            for i in prange(a.size):
+                s += a[i]
+                m *= a[i]
+            return s, m
+
+        @njit(parallel=True)
+        def dynamic_sum(a):
+            s = 0.
+            for i in prange(a.size, schedule="dynamic"):
+                s += a[i]
+            return s
+
+        for n in (0, 1, 10, 100000):
+            a = np.ones(n)
+            self.assertEqual(reductions(a), (float(n), 1.))
+            self.assertEqual(dynamic_sum(a), float(n))
+        with parallel_chunksize(2):
+            self.assertEqual(dynamic_sum(np.ones(10)), 10.)
+            self.assertEqual(get_parallel_chunksize(), 2)
+
+    def test_schedule_buffer_reuse(self):
+        from numba.np.ufunc import workqueue as lib
+        allocate = ctypes.CFUNCTYPE(ctypes.c_void_p,
+                                    ctypes.c_size_t)(lib.allocate_sched)
+        deallocate = ctypes.CFUNCTYPE(None,
+                                      ctypes.c_void_p)(lib.deallocate_sched)
+        first = allocate(8)
+        # A nested region gets a buffer of its own
+        nested = allocate(8)
+        self.assertNotEqual(first, nested)
+        deallocate(nested)
+        deallocate(first)
+        # The buffer is reused, or grown
+        self.assertEqual(allocate(4), first)
+        deallocate(first)
+        grown = allocate(1024)
+        self.assertTrue(grown)
+        deallocate(grown)
+        self.assertEqual(allocate(16), grown)
+        deallocate(grown)
+
+
+_int_list_type = types.ListType(types.int64)
+
+
+@njit
+def _new_counts():
+    return Dict.empty(types.int64, types.int64)
+
+
+@njit
+def _merge_counts(a, b):
+    for k, v in b.items():
+        a[k] = a.get(k, 0) + v
+    return a
+
+
+def _count_keys(keys):
+    counts = numba.reduction(_new_counts, _merge_counts)
+    for i in prange(keys.size):
+        local = counts.local()
+        local[keys[i]] = local.get(keys[i], 0) + 1
+    return counts.result()
+
+
+@njit
+def _new_groups():
+    return Dict.empty(types.int64, _int_list_type)
+
+
+@njit
+def _merge_groups(a, b):
+    for k, v in b.items():
+        if k in a:
+            a[k].extend(v)
+        else:
+            a[k] = v
+    return a
+
+
+@njit
+def _new_bins():
+    return np.zeros(10, np.int64)
+
+
+@njit
+def _add_bins(a, b):
+    a += b
+    return a
+
+
+@njit
+def _no_min():
+    return (np.inf, np.int64(-1))
+
+
+@njit
+def _min_with_index(a, b):
+    return a if a[0] <= b[0] else b
+
+
+@structref.register
+class _StatsType(types.StructRef):
+    pass
+
+
+class _Stats(structref.StructRefProxy):
+    pass
+
+
+structref.define_proxy(_Stats, _StatsType, ["count", "total"])
+
+
+@njit
+def _new_stats():
+    return _Stats(0, 0.)
+
+
+@njit
+def _merge_stats(a, b):
+    a.count += b.count
+    a.total += b.total
+    return a
+
+
+@skip_parfors_unsupported
+class TestParforReductionObject(TestCase):
+    """
+    Tests numba.reduction, reductions over user-defined operators in prange
+    loops.
+    """
+    _numba_parallel_test_ = False
+
+    _envvars = {"NUMBA_NUM_THREADS": "4"}
+
+    @TestCase.run_test_in_subprocess(envvars=_envvars)
+    def test_typed_dict(self):
+        cfunc = njit(parallel=True)(_count_keys)
+        keys = np.random.randint(0, 10, 10000)
+        expected = dict(zip(*np.unique(keys, return_counts=True)))
+        self.assertEqual(dict(cfunc(keys)), expected)
+        self.assertEqual(dict(cfunc(keys[:0])), {})
+
+    @TestCase.run_test_in_subprocess(envvars=_envvars)
+    def test_typed_list(self):
+        @njit(parallel=True)
+        def group_by(keys, values):
+            groups = numba.reduction(_new_groups, _merge_groups)
+            for i in prange(keys.size):
+                local = groups.local()
+                k = keys[i]
+                if k not in local:
+                    local[k] = List.empty_list(types.int64)
+                local[k].append(values[i])
+            return groups.result()
+
+        keys = np.random.randint(0, 5, 1000)
+        values = np.arange(1000)
+        groups = group_by(keys, values)
+        self.assertEqual(sorted(groups), list(range(5)))
+        for k, v in groups.items():
+            self.assertEqual(sorted(v), list(values[keys == k]))
+
+    @TestCase.run_test_in_subprocess(envvars=_envvars)
+    def test_accumulator_per_thread(self):
+        from numba import threading_layer
+
+        @njit
+        def new_ids():
+            return List.empty_list(types.int64)
+
+        @njit
+        def concat(a, b):
+            a.extend(b)
+            return a
+
+        @njit(parallel=True)
+        def thread_ids(n):
+            ids = numba.reduction(new_ids, concat)
+            for i in prange(n):
+                ids.local().append(numba.get_thread_id())
+            return ids.result()
+
+        ids = thread_ids(100000)
+        self.assertEqual(len(ids), 100000)
+        # Each thread appends to its own list, the lists are concatenated
+        # in the order of the threads
+        self.assertEqual(list(ids), sorted(ids))
+        if threading_layer() != "tbb":
+            self.assertGreater(len(set(ids)), 1)
+
+    @TestCase.run_test_in_subprocess(envvars=_envvars)
+    def test_array(self):
+        @njit(parallel=True)
+        def histogram(x):
+            bins = numba.reduction(_new_bins, _add_bins)
+            for i in prange(x.size):
+                bins.local()[x[i]] += 1
+            return bins.result()
+
+        x = np.random.randint(0, 10, 10000)
+        np.testing.assert_equal(histogram(x), np.bincount(x, minlength=10))
+
+    @TestCase.run_test_in_subprocess(envvars=_envvars)
+    def test_structref(self):
+        @njit(parallel=True)
+        def stats(x):
+            acc = numba.reduction(_new_stats, _merge_stats)
+            for i in prange(x.size):
+                local = acc.local()
+                local.count += 1
+                local.total += x[i]
+            res = acc.result()
+            return res.count, res.total
+
+        x = np.random.ranf(10000)
+        count, total = stats(x)
+        self.assertEqual(count, x.size)
+        self.assertPreciseEqual(total, x.sum(), prec="double", ulps=1000)
+
+    @TestCase.run_test_in_subprocess(envvars=_envvars)
+    def test_custom_combine(self):
+        @njit(parallel=True)
+        def argmin(x):
+            best = numba.reduction(_no_min, _min_with_index)
+            for i in prange(x.size):
+                best.update((x[i], np.int64(i)))
+            return best.result()
+
+        x = np.random.ranf(10000)
+        self.assertEqual(argmin(x), (x.min(), x.argmin()))
+        self.assertEqual(argmin(x[:0]), (np.inf, -1))
+
+    def test_interpreter(self):
+        keys = np.array([1, 2, 1])
+        self.assertEqual(dict(_count_keys(keys)), {1: 2, 2: 1})
+
+    def test_not_a_function(self):
+        @njit(parallel=True)
+        def func():
+            return numba.reduction(0, _add_bins).result()
+
+        with self.assertRaises(errors.TypingError) as raises:
+            func()
+        self.assertIn("The init function of a reduction must be a jitted "
+                      "function", str(raises.exception))
+
+
 @skip_parfors_unsupported
 @x86_only
 class TestParforsVectorizer(TestPrangeBase):
@@ -0,0 +1,115 @@
+import os
+import struct
+import subprocess
+import sys
+import unittest
+
+from numba.tests.support import TestCase, temp_directory
+
+
+_usecase = """if 1:
+    import os
+    import numpy as np
+    from numba import njit
+
+    @njit
+    def kernel(a):
+        s = 0.
+        for i in range(a.size):
+            s += a[i] * 2
+        return s
+
+    kernel(np.arange(3.))
+    cres = kernel.overloads[kernel.signatures[0]]
+    address = cres.library.get_pointer_to_function(cres.fndesc.llvm_func_name)
+    print(os.getpid(), address, kernel.__code__.co_firstlineno + 4)
+    """
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "needs Linux")
+class TestPerfMap(TestCase):
+
+    _numba_parallel_test_ = False
+
+    def run_usecase(self, perf_map):
+        path = os.path.join(temp_directory("test_perf_map"), "usecase.py")
+        with open(path, "w") as f:
+            f.write(_usecase)
+        env = os.environ.copy()
+        env["NUMBA_PERF_MAP"] = str(perf_map)
+        env["NUMBA_SAMPLING_PROFILER"] = "1"
+        res = subprocess.run([sys.executable, path], env=env,
+                             capture_output=True, timeout=60)
+        self.assertEqual(res.returncode, 0, msg=res.stderr.decode())
+        pid, address, line = map(int, res.stdout.split())
+        files = ["/tmp/perf-%d.map" % (pid,), "/tmp/jit-%d.dump" % (pid,)]
+        for filename in files:
+            self.addCleanup(lambda f=filename: os.path.exists(f)
+                            and os.unlink(f))
+        return path, pid, address, line
+
+    def read_map(self, pid):
+        entries = {}
+        with open("/tmp/perf-%d.map" % (pid,)) as f:
+            for entry in f:
+                start, size, name = entry.rstrip("\n").split(" ", 2)
+                entries[int(start, 16)] = (int(size, 16), name)
+        return entries
+
+    def test_perf_map(self):
+        _, pid, address, _ = self.run_usecase(1)
+        entries = self.read_map(pid)
+        size, name = entries[address]
+        self.assertEqual(name, "__main__.kernel")
+        self.assertGreater(size, 0)
+        self.assertIn("cpython.__main__.kernel",
+                      [name for _, name in entries.values()])
+        self.assertFalse(os.path.exists("/tmp/jit-%d.dump" % (pid,)))
+
+    def test_jitdump(self):
+        path, pid, address, line = self.run_usecase(2)
+        size, _ = self.read_map(pid)[address]
+        with open("/tmp/jit-%d.dump" % (pid,), "rb") as f:
+            data = f.read()
+        magic, version, header_size, _, _, dump_pid, _, _ = \
+            struct.unpack_from("<IIIIIIQQ", data)
+        self.assertEqual((magic, version, dump_pid), (0x4A695444, 1, pid))
+
+        pos = header_size
+        debug_info = {}
+        loads = {}
+        while pos < len(data):
+            record_id, total_size, _ = struct.unpack_from("<IIQ", data, pos)
+            body = data[pos + 16:pos + total_size]
+            if record_id == 2:
+                code_addr, count = struct.unpack_from("<QQ", body)
+                rows = []
+                entry = 16
+                for _ in range(count):
+                    addr, lineno, _ = struct.unpack_from("<QII", body, entry)
+                    end = body.index(b"\0", entry + 16)
+                    rows.append((addr, body[entry + 16:end].decode(),
+                                 lineno))
+                    entry = end + 1
+                self.assertNotIn(code_addr, loads)
+                debug_info[code_addr] = rows
+            elif record_id == 0:
+                _, _, _, code_addr, code_size, _ = \
+                    struct.unpack_from("<IIQQQQ", body)
+                end = body.index(b"\0", 40)
+                loads[code_addr] = (code_size, body[40:end].decode(),
+                                    body[end + 1:])
+            pos += total_size
+
+        code_size, name, code = loads[address]
+        self.assertEqual((code_size, name), (size, "__main__.kernel"))
+        self.assertEqual(len(code), size)
+        rows = debug_info[address]
+        self.assertIn((path, line), [(f, lineno) for _, f, lineno in rows])
+        for addr, _, _ in rows:
+            self.assertGreaterEqual(addr, address)
+            self.assertLess(addr, address + size)
+
+
+if __name__ == '__main__':
+    unittest.main()
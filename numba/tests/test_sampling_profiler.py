@@ -0,0 +1,143 @@
+import os
+import platform
+import subprocess
+import sys
+import unittest
+
+from numba.tests.support import TestCase, temp_directory
+
+
+_supported = (sys.platform.startswith("linux")
+              and platform.machine() in ("x86_64", "aarch64"))
+
+needs_support = unittest.skipUnless(_supported, "needs Linux on x86-64 or "
+                                                "AArch64")
+
+
+_usecase = """if 1:
+    import numpy as np
+    from numba import njit, prange
+    from numba.core.itanium_mangler import demangle_identifier
+    from numba.misc import codemap
+    from numba.misc.sampling import SamplingProfiler
+
+    def hot_loop(a, n):
+        s = 0.
+        for i in range(a.size):
+            x = a[i]
+            for j in range(n):
+                x = x * 0.999 + a[(i * 7 + j) % a.size]
+            s += x
+        return s
+
+    def hot_prange(a, n):
+        s = 0.
+        for i in prange(a.size):
+            x = a[i]
+            for j in range(n):
+                x = x * 0.999 + a[(i * 7 + j) % a.size]
+            s += x
+        return s
+
+    hot_line = hot_loop.__code__.co_firstlineno + 5
+    prange_line = hot_prange.__code__.co_firstlineno + 5
+    """
+
+
+@needs_support
+class TestSamplingProfiler(TestCase):
+
+    _numba_parallel_test_ = False
+
+    def run_code(self, code, enabled=True):
+        # Run from a file, for the functions to have a source file
+        path = os.path.join(temp_directory("test_sampling_profiler"),
+                            "%s.py" % (self.id().split(".")[-1],))
+        with open(path, "w") as f:
+            f.write(_usecase + code)
+        env = os.environ.copy()
+        env["NUMBA_SAMPLING_PROFILER"] = "1" if enabled else "0"
+        res = subprocess.run([sys.executable, path], env=env,
+                             capture_output=True, timeout=120)
+        self.assertEqual(res.returncode, 0, msg=res.stderr.decode())
+        return res.stdout.decode().split()
+
+    def test_code_map(self):
+        # The line table of a compiled function is recorded
+        code = """if 1:
+            cfunc = njit(hot_loop)
+            a = np.ones(10)
+            cfunc(a, 2)
+            [func] = [f for f in codemap.get_code_map().functions()
+                      if demangle_identifier(f.name) == "__main__.hot_loop"]
+            lines = {line for _, filename, line in func.lines
+                     if filename == __file__}
+            print(hot_line in lines)
+            print(max(lines) < hot_line + 3)
+            print(func.size > 0)
+            func2, loc = codemap.get_code_map().lookup(func.address + 1)
+            print(func2 == func, loc is not None)
+            print(codemap.get_code_map().lookup(0) == (None, None))
+            # Line tables don't turn on bounds checking
+            cres = list(cfunc.overloads.values())[0]
+            print(cres.target_context.enable_boundscheck)
+            """
+        self.assertEqual(self.run_code(code),
+                         ["True"] * 6 + ["False"])
+
+    def test_disabled(self):
+        code = """if 1:
+            print(codemap.get_code_map() is None)
+            try:
+                SamplingProfiler().start()
+            except RuntimeError as e:
+                print("NUMBA_SAMPLING_PROFILER" in str(e))
+            """
+        self.assertEqual(self.run_code(code, enabled=False), ["True", "True"])
+
+    def test_max_samples(self):
+        # The buffer is reused, or replaced by a larger one, when the
+        # maximum number of samples changes between runs
+        code = """if 1:
+            cfunc = njit(hot_loop)
+            a = np.random.rand(100000)
+            cfunc(a, 2)
+            for max_samples in (20, 1000, 10):
+                with SamplingProfiler(interval=0.0005,
+                                      max_samples=max_samples) as prof:
+                    for _ in range(20):
+                        cfunc(a, 100)
+                kept = prof.samples - prof.dropped
+                print(kept == min(prof.samples, max_samples))
+            """
+        self.assertEqual(self.run_code(code), ["True"] * 3)
+
+    def check_hot_line(self, func, line):
+        code = """if 1:
+            cfunc = njit(parallel=%s)(%s)
+            a = np.random.rand(100000)
+            cfunc(a, 2)
+            with SamplingProfiler(interval=0.0005) as prof:
+                for _ in range(20):
+                    cfunc(a, 100)
+            print(prof.samples > 0, prof.dropped)
+            (filename, line), count = next(iter(prof.lines().items()))
+            print(filename == __file__, line == %s)
+            print(count > 0.5 * prof.samples)
+            print(prof.jit_samples == sum(prof.functions().values()))
+            print("%s" in prof.report())
+            """ % (func.startswith("hot_prange"), func, line,
+                   "x = x * 0.999")
+        self.assertEqual(self.run_code(code),
+                         ["True", "0", "True", "True", "True", "True",
+                          "True"])
+
+    def test_nopython(self):
+        self.check_hot_line("hot_loop", "hot_line")
+
+    def test_parfor(self):
+        self.check_hot_line("hot_prange", "prange_line")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import os, sys, subprocess
 import dis
 import itertools
+from collections import defaultdict
+from unittest import mock
 
 import numpy as np
 
@@ -933,6 +935,72 @@ class TestPartialTypingErrors(unittest.TestCase):
                         "Cannot unify" in typing_errs[0].msg)
 
 
+def _make_large_function(nstmts):
+    """
+    Make a function of about *nstmts* statements, mixing straight-line
+    arithmetic and small loops.
+    """
+    lines = ["def large_function(a, x):",
+             "    acc = 0",
+             "    v0 = x"]
+    for i in range(1, nstmts):
+        lines.append("    v%d = v%d * 1.5 + a[%d %% a.size]" % (i, i - 1, i))
+        if i % 10 == 0:
+            lines.append("    for j in range(3):")
+            lines.append("        acc += v%d + j" % i)
+    lines.append("    return acc + v%d" % (nstmts - 1))
+    ns = {}
+    exec("\n".join(lines), ns)
+    return ns['large_function']
+
+
+class TestConstraintPropagation(TestCase):
+    """
+    Check the worklist propagation of the constraint network only executes
+    again the constraints whose type variables changed.
+    """
+
+    def count_executions(self, func, arg_types):
+        counts = defaultdict(int)
+        orig_execute = typeinfer.ConstraintNetwork._execute
+
+        def execute(network, index, *args):
+            counts[index] += 1
+            return orig_execute(network, index, *args)
+
+        with mock.patch.object(typeinfer.ConstraintNetwork, '_execute',
+                               execute):
+            errs = get_func_typing_errs(func, arg_types)
+        self.assertFalse(errs)
+        return counts
+
+    def test_straight_line(self):
+        func = _make_large_function(30)
+        counts = self.count_executions(func, (types.float64[::1],
+                                              types.float64))
+        # Only the constraints depending on the loop-carried `acc` variable
+        # are executed several times.
+        once = [index for index, count in counts.items() if count == 1]
+        self.assertGreater(len(once), 0.9 * len(counts))
+
+    def test_refinement(self):
+        # Types flowing backwards (refinement) and around loops are still
+        # propagated
+        @njit
+        def foo(n):
+            lst = []
+            acc = 0
+            for i in range(n):
+                lst.append(i)
+                acc = acc + 0.5
+            return lst, acc
+
+        self.assertEqual(foo(3), ([0, 1, 2], 1.5))
+        [sig] = foo.signatures
+        self.assertEqual(foo.overloads[sig].signature.return_type,
+                         types.Tuple((types.List(types.intp),
+                                      types.float64)))
+
 
 class TestTypeInferFailCache(unittest.TestCase):
     @staticmethod
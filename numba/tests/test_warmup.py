@@ -0,0 +1,141 @@
+import os
+import sys
+import uuid
+import warnings
+
+from numba.core import types
+from numba.core.errors import NumbaWarning
+from numba.core.warmup import (load_warmup_manifest, read_manifest,
+                               record_warmup_manifest)
+from numba.tests.support import (TestCase, import_dynamic, override_config,
+                                 run_in_subprocess, temp_directory)
+import unittest
+
+
+_module_source = """if 1:
+    from numba import njit
+
+    @njit(cache=True)
+    def add(x, y):
+        return x + y
+
+    @njit
+    def neg(x):
+        return -x
+
+    def make_closure():
+        @njit
+        def inner(x):
+            return x
+        return inner
+    """
+
+
+class TestWarmupManifest(TestCase):
+
+    def setUp(self):
+        self.tempdir = temp_directory('test_warmup')
+        self.modname = "warmup_usecase_%s" % uuid.uuid4().hex
+        with open(os.path.join(self.tempdir, self.modname + ".py"), "w") as f:
+            f.write(_module_source)
+        self.manifest = os.path.join(self.tempdir,
+                                     self.modname + ".manifest")
+        sys.path.insert(0, self.tempdir)
+        self.cache_config = override_config('CACHE_DIR', self.tempdir)
+        self.cache_config.__enter__()
+
+    def tearDown(self):
+        self.cache_config.__exit__(None, None, None)
+        sys.path.remove(self.tempdir)
+        sys.modules.pop(self.modname, None)
+
+    def import_module(self):
+        # Import a fresh version of the module, with fresh dispatchers
+        sys.modules.pop(self.modname, None)
+        return import_dynamic(self.modname)
+
+    def test_record_and_load(self):
+        mod = self.import_module()
+        with record_warmup_manifest(self.manifest):
+            mod.add(1, 2)
+            mod.add(1.5, 2.5)
+            mod.neg(1)
+            mod.make_closure()(1)
+        entries = read_manifest(self.manifest)
+        self.assertEqual([entry[1] for entry in entries], ['add', 'neg'])
+        [add_entry, neg_entry] = entries
+        self.assertEqual(add_entry[0], self.modname)
+        self.assertEqual(add_entry[2], mod.add.targetoptions)
+        self.assertEqual(add_entry[3], [(types.int64, types.int64),
+                                        (types.float64, types.float64)])
+        self.assertEqual(neg_entry[3], [(types.int64,)])
+
+        mod = self.import_module()
+        futures = load_warmup_manifest(self.manifest, max_workers=2)
+        self.assertEqual(len(futures), 3)
+        self.assertEqual(set(mod.add.signatures),
+                         {(types.int64, types.int64),
+                          (types.float64, types.float64)})
+        self.assertEqual(mod.neg.signatures, [(types.int64,)])
+        # add was loaded from the cache
+        self.assertEqual(sum(mod.add.stats.cache_hits.values()), 2)
+
+    def test_record_cache_load(self):
+        # Functions loaded from the cache are recorded as well
+        mod = self.import_module()
+        mod.add(1, 2)
+        mod = self.import_module()
+        with record_warmup_manifest(self.manifest):
+            mod.add(1, 2)
+        self.assertEqual(sum(mod.add.stats.cache_hits.values()), 1)
+        [entry] = read_manifest(self.manifest)
+        self.assertEqual(entry[1], 'add')
+        self.assertEqual(entry[3], [(types.int64, types.int64)])
+
+    def test_merge(self):
+        mod = self.import_module()
+        with record_warmup_manifest(self.manifest):
+            mod.add(1, 2)
+        mod = self.import_module()
+        with record_warmup_manifest(self.manifest):
+            mod.add(1j, 2j)
+            mod.neg(1)
+        entries = read_manifest(self.manifest)
+        self.assertEqual([entry[1] for entry in entries], ['add', 'neg'])
+        self.assertEqual(entries[0][3], [(types.int64, types.int64),
+                                         (types.complex128, types.complex128)])
+
+    def test_load_missing_function(self):
+        mod = self.import_module()
+        with record_warmup_manifest(self.manifest):
+            mod.neg(1)
+        # The function is removed
+        with open(os.path.join(self.tempdir, self.modname + ".py"), "a") as f:
+            f.write("\ndel neg\n")
+        self.import_module()
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always', NumbaWarning)
+            futures = load_warmup_manifest(self.manifest)
+        self.assertEqual(futures, [])
+        self.assertEqual(len(w), 1)
+        self.assertIn("%s.neg" % self.modname, str(w[0].message))
+        self.assertIn("not found", str(w[0].message))
+
+    def test_environment_variable(self):
+        code = """if 1:
+            import sys
+            sys.path.insert(0, %r)
+            import %s as mod
+            mod.neg(1.0)
+            """ % (self.tempdir, self.modname)
+        env = os.environ.copy()
+        env['NUMBA_WARMUP_RECORD'] = self.manifest
+        env['NUMBA_CACHE_DIR'] = self.tempdir
+        run_in_subprocess(code, env=env)
+        [entry] = read_manifest(self.manifest)
+        self.assertEqual(entry[:2], (self.modname, 'neg'))
+        self.assertEqual(entry[3], [(types.float64,)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -295,8 +295,10 @@ def get_ext_modules():
                 sources=[
                     'numba/np/ufunc/tbbpool.cpp',
                     'numba/np/ufunc/gufunc_scheduler.cpp',
+                    'numba/np/ufunc/affinity.cpp',
                 ],
-                depends=['numba/np/ufunc/workqueue.h'],
+                depends=['numba/np/ufunc/workqueue.h',
+                         'numba/np/ufunc/affinity.h'],
                 include_dirs=[os.path.join(tbb_root, 'include')],
                 extra_compile_args=cpp11flags,
                 extra_link_args=extra_link_args,
@@ -325,8 +327,10 @@ def get_ext_modules():
             sources=[
                 'numba/np/ufunc/omppool.cpp',
                 'numba/np/ufunc/gufunc_scheduler.cpp',
+                'numba/np/ufunc/affinity.cpp',
             ],
-            depends=['numba/np/ufunc/workqueue.h'],
+            depends=['numba/np/ufunc/workqueue.h',
+                     'numba/np/ufunc/affinity.h'],
             extra_compile_args=ompcompileflags + cpp11flags,
             extra_link_args=omplinkflags,
         )
@@ -340,11 +344,17 @@ def get_ext_modules():
     ext_np_ufunc_workqueue_backend = Extension(
         name='numba.np.ufunc.workqueue',
         sources=['numba/np/ufunc/workqueue.c',
-                 'numba/np/ufunc/gufunc_scheduler.cpp'],
-        depends=['numba/np/ufunc/workqueue.h'],
+                 'numba/np/ufunc/gufunc_scheduler.cpp',
+                 'numba/np/ufunc/affinity.cpp'],
+        depends=['numba/np/ufunc/workqueue.h',
+                 'numba/np/ufunc/affinity.h'],
         extra_link_args=extra_link_args)
     ext_np_ufunc_backends.append(ext_np_ufunc_workqueue_backend)
 
+    ext_sampler = Extension(name='numba.misc._sampler',
+                            sources=['numba/misc/_sampler.c'],
+                            depends=['numba/_pymodule.h'])
+
     ext_mviewbuf = Extension(name='numba.mviewbuf',
                              extra_link_args=install_name_tool_fixer,
                              sources=['numba/mviewbuf.c'])
@@ -370,7 +380,7 @@ def get_ext_modules():
     ext_modules = [ext_dynfunc, ext_dispatcher, ext_helperlib,
                    ext_typeconv, ext_np_ufunc, ext_npyufunc_num_threads,
                    ext_mviewbuf, ext_nrt_python, ext_jitclass_box,
-                   ext_cuda_extras, ext_devicearray]
+                   ext_cuda_extras, ext_devicearray, ext_sampler]
 
     ext_modules += ext_np_ufunc_backends
 